@@ -0,0 +1 @@
+"""Scraper unit tests."""
\ No newline at end of file
@@ -0,0 +1,206 @@
+"""WebP chart scraper downloads against a local stub chart server."""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pytest
+
+# The scraper uses flat imports from its own directory
+SCRAPING_DIR = Path(__file__).resolve().parents[3] / 'api' / 'scraper' / 'png-charts' / 'it_jobs_watch' / 'scripts' / 'scraping'
+sys.path.insert(0, str(SCRAPING_DIR))
+
+from async_downloader import AsyncDownloadEngine
+from webp_scraper import WebPScraper
+from http_cache import HTTPCache
+
+
+ETAG = '"chart-v1"'
+WEBP_BODY = b'RIFF\x24\x00\x00\x00WEBPVP8 ' + bytes(64)
+
+
+class StubChartServer:
+    """Threaded HTTP server standing in for the ITJobsWatch chart host."""
+    
+    def __init__(self):
+        """Start serving on a free localhost port."""
+        self.delay = 0.0
+        self.failures: Dict[str, int] = {}
+        self.requests: List[Tuple[str, float, Dict[str, str]]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), StubChartHandler)
+        self.httpd.stub = self
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+    
+    def enter(self, path: str, headers: Dict[str, str]) -> None:
+        """Count a request as in flight."""
+        with self._lock:
+            self.requests.append((path, time.monotonic(), headers))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+    
+    def leave(self) -> None:
+        """Count a request as answered."""
+        with self._lock:
+            self.in_flight -= 1
+    
+    def take_failure(self, path: str) -> bool:
+        """Whether this request should fail with a 503."""
+        with self._lock:
+            if self.failures.get(path, 0) > 0:
+                self.failures[path] -= 1
+                return True
+            return False
+    
+    def requests_for(self, path: str) -> List[Tuple[str, float, Dict[str, str]]]:
+        """Requests received for one path, in arrival order."""
+        return [request for request in self.requests if request[0] == path]
+    
+    def close(self) -> None:
+        """Stop the server."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class StubChartHandler(BaseHTTPRequestHandler):
+    """Serves a WebP body with an ETag, 304s, and scripted 503s."""
+    
+    def do_GET(self):
+        stub = self.server.stub
+        stub.enter(self.path, dict(self.headers))
+        time.sleep(stub.delay)
+        stub.leave()
+        
+        if stub.take_failure(self.path):
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        elif self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.send_header('ETag', ETAG)
+            self.end_headers()
+        else:
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/webp')
+            self.send_header('Content-Length', str(len(WEBP_BODY)))
+            self.send_header('ETag', ETAG)
+            self.end_headers()
+            self.wfile.write(WEBP_BODY)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    stub = StubChartServer()
+    yield stub
+    stub.close()
+
+
+def chart(server: StubChartServer, skill: str) -> Tuple[str, str, Dict]:
+    """A (url, filename, metadata) entry for a chart on the stub server."""
+    url = f"{server.url}/charts/{skill}.webp"
+    metadata = {
+        'skill': skill,
+        'location': 'uk/england/london',
+        'chart_type': 'demand-trend',
+        'job_type': 'permanent',
+        'time_period': 'm2x',
+        'url': url
+    }
+    return url, f"{skill}.webp", metadata
+
+
+def test_downloads_respect_concurrency_cap(server, tmp_path):
+    server.delay = 0.2
+    charts = [chart(server, f"skill-{i}") for i in range(9)]
+    
+    scraper = WebPScraper(output_dir=str(tmp_path), concurrency=3, rps=1000)
+    failed = scraper._download_all(charts)
+    
+    assert failed == 0
+    assert 1 < server.max_in_flight <= 3
+    assert scraper.stats['downloaded'] == 9
+    
+    # Manifest lines written from worker threads stay whole, one per chart
+    lines = (tmp_path / 'manifest.jsonl').read_text().splitlines()
+    assert sorted(json.loads(line)['skill'] for line in lines) == sorted(f"skill-{i}" for i in range(9))
+    assert len(scraper.manifest) == 9
+
+
+def test_503_is_retried_with_backoff(server, tmp_path):
+    url, filename, metadata = chart(server, 'python')
+    path = f"/charts/{filename}"
+    server.failures[path] = 2
+    
+    scraper = WebPScraper(output_dir=str(tmp_path), rps=1000)
+    engine = AsyncDownloadEngine(scraper._fetch_chart, concurrency=1, rps=1000,
+                                 max_attempts=4, backoff_base=0.1)
+    
+    outcomes = engine.run([(url, filename, metadata)])
+    
+    assert outcomes == ['downloaded']
+    assert [timing['outcome'] for timing in engine.timings] == ['retry', 'retry', 'downloaded']
+    assert (tmp_path / 'london-demand-trend' / 'charts' / filename).read_bytes() == WEBP_BODY
+    assert len(server.requests_for(path)) == 3
+
+
+def test_backoff_delay_grows_per_attempt(server, tmp_path, monkeypatch):
+    url, filename, metadata = chart(server, 'java')
+    path = f"/charts/{filename}"
+    server.failures[path] = 2
+    
+    # Take the top of each jitter window so the delays are deterministic
+    monkeypatch.setattr('async_downloader.random.uniform', lambda low, high: high)
+    
+    scraper = WebPScraper(output_dir=str(tmp_path), rps=1000)
+    engine = AsyncDownloadEngine(scraper._fetch_chart, concurrency=1, rps=1000,
+                                 max_attempts=4, backoff_base=0.1)
+    engine.run([(url, filename, metadata)])
+    
+    arrivals = [arrived for _, arrived, _ in server.requests_for(path)]
+    gaps = [later - earlier for earlier, later in zip(arrivals, arrivals[1:])]
+    assert gaps[0] >= 0.1
+    assert gaps[1] >= 0.2
+
+
+def test_503_gives_up_after_max_attempts(server, tmp_path):
+    url, filename, metadata = chart(server, 'rlhf')
+    server.failures[f"/charts/{filename}"] = 10
+    
+    scraper = WebPScraper(output_dir=str(tmp_path), rps=1000)
+    engine = AsyncDownloadEngine(scraper._fetch_chart, concurrency=1, rps=1000,
+                                 max_attempts=3, backoff_base=0.01)
+    
+    assert engine.run([(url, filename, metadata)]) == ['failed']
+    assert len(server.requests_for(f"/charts/{filename}")) == 3
+
+
+def test_refresh_revalidates_with_304(server, tmp_path):
+    cache = HTTPCache(str(tmp_path / 'cache'))
+    charts = [chart(server, 'typescript')]
+    path = f"/charts/{charts[0][1]}"
+    
+    first = WebPScraper(output_dir=str(tmp_path / 'out'), cache=cache, rps=1000)
+    assert first._download_all(charts) == 0
+    assert first.stats['downloaded'] == 1
+    
+    refreshed = WebPScraper(output_dir=str(tmp_path / 'out'), cache=cache, refresh=True, rps=1000)
+    assert refreshed._download_all(charts) == 0
+    
+    _, _, headers = server.requests_for(path)[-1]
+    assert headers.get('If-None-Match') == ETAG
+    assert refreshed.stats['revalidated'] == 1
+    assert refreshed.stats['downloaded'] == 0
+    assert cache.stats['hits'] == 1
+    cache.close()
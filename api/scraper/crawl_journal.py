@@ -0,0 +1,190 @@
+"""
+Append-only crawl journal shared by the ITJobsWatch scrapers.
+
+Every planned URL and every fetch outcome is appended to a JSONL file.
+Replaying the file gives the latest state of each URL, so a crawl that
+died halfway can be resumed by re-requesting only the URLs that are still
+pending or failed. Lines are flushed to the OS on every write but fsynced
+in batches, so journaling costs far less than the requests it records.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+
+# URL states recorded in the journal
+STATUS_PENDING = 'pending'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+DEFAULT_FSYNC_EVERY = 50        # Records between fsyncs
+DEFAULT_FSYNC_INTERVAL = 2.0    # Seconds between fsyncs, whichever comes first
+
+
+class CrawlJournal:
+    """Thread-safe JSONL journal of planned URLs and their fetch outcomes."""
+    
+    def __init__(
+        self,
+        path: str,
+        resume: bool = False,
+        fsync_every: int = DEFAULT_FSYNC_EVERY,
+        fsync_interval: float = DEFAULT_FSYNC_INTERVAL
+    ):
+        """
+        Open a journal file.
+        
+        Args:
+            path: Journal file path
+            resume: Replay an existing journal instead of starting a new one
+            fsync_every: Number of records written between fsyncs
+            fsync_interval: Maximum seconds between fsyncs
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fsync_every = max(1, fsync_every)
+        self.fsync_interval = fsync_interval
+        
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if resume and self.path.exists():
+            self._replay()
+        
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+    
+    def _replay(self) -> None:
+        """Rebuild the latest state of every URL from the journal file."""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Tolerate a torn final line after a crash
+                
+                entry = self.entries.setdefault(record['url'], {'attempts': 0})
+                entry.update({k: v for k, v in record.items() if k != 'attempts'})
+                entry['attempts'] += record.get('attempts', 0)
+                if 'error' not in record:
+                    entry.pop('error', None)
+    
+    def _append(self, record: Dict[str, Any]) -> None:
+        """Write one record, fsyncing once enough records or time have accumulated."""
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+        self._unsynced += 1
+        
+        if (self._unsynced >= self.fsync_every
+                or time.monotonic() - self._last_sync >= self.fsync_interval):
+            self._sync()
+    
+    def _sync(self) -> None:
+        """Force buffered records to disk."""
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+    
+    def plan(self, urls: Iterable[str]) -> None:
+        """
+        Record URLs the crawl intends to fetch.
+        
+        URLs already in the journal keep their current state.
+        
+        Args:
+            urls: Planned URLs
+        """
+        with self._lock:
+            for url in urls:
+                if url in self.entries:
+                    continue
+                self.entries[url] = {'url': url, 'status': STATUS_PENDING, 'attempts': 0}
+                self._append({'url': url, 'status': STATUS_PENDING, 'ts': time.time()})
+    
+    def record(
+        self,
+        url: str,
+        status: str,
+        attempts: int = 1,
+        num_bytes: int = 0,
+        latency_ms: float = 0.0,
+        error: Optional[str] = None,
+        payload: Optional[Any] = None
+    ) -> None:
+        """
+        Record the outcome of fetching a URL.
+        
+        Args:
+            url: Fetched URL
+            status: STATUS_DONE or STATUS_FAILED
+            attempts: Requests made for this outcome
+            num_bytes: Response body size
+            latency_ms: Request latency in milliseconds
+            error: Error message for failures
+            payload: Optional JSON-serializable result to replay on resume
+        """
+        record = {
+            'url': url,
+            'status': status,
+            'attempts': attempts,
+            'bytes': num_bytes,
+            'latency_ms': round(latency_ms, 2),
+            'ts': time.time()
+        }
+        if error is not None:
+            record['error'] = error
+        if payload is not None:
+            record['payload'] = payload
+        
+        with self._lock:
+            entry = self.entries.setdefault(url, {'attempts': 0})
+            entry.update({k: v for k, v in record.items() if k != 'attempts'})
+            entry['attempts'] += attempts
+            if error is None:
+                entry.pop('error', None)
+            self._append(record)
+    
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Latest journal entry for a URL, or None."""
+        return self.entries.get(url)
+    
+    def is_done(self, url: str) -> bool:
+        """Whether a URL has been fetched successfully."""
+        entry = self.entries.get(url)
+        return entry is not None and entry['status'] == STATUS_DONE
+    
+    def pending(self, urls: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        URLs that still need fetching (pending or failed).
+        
+        Args:
+            urls: URLs to check (default: every URL in the journal)
+        
+        Returns:
+            URLs not yet done, in the given order
+        """
+        if urls is None:
+            urls = list(self.entries)
+        return [url for url in urls if not self.is_done(url)]
+    
+    def counts(self) -> Dict[str, int]:
+        """Number of URLs in each state."""
+        counts = {STATUS_PENDING: 0, STATUS_DONE: 0, STATUS_FAILED: 0}
+        for entry in self.entries.values():
+            counts[entry['status']] = counts.get(entry['status'], 0) + 1
+        return counts
+    
+    def close(self) -> None:
+        """Fsync outstanding records and close the file."""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._sync()
+            self._file.close()
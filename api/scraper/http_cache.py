@@ -0,0 +1,354 @@
+"""
+On-disk HTTP cache with conditional revalidation, shared by the ITJobsWatch scrapers.
+
+Bodies are stored as files named by the SHA-256 of their URL; validators
+(ETag / Last-Modified), headers and access times live in a small SQLite
+index. Mounting CachingHTTPAdapter on a requests.Session makes every GET
+send If-None-Match / If-Modified-Since for URLs already in the cache and
+turns a 304 Not Modified into a normal 200 response built from the stored
+body.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+# Shared by both scrapers so a single cache serves table pages and chart images
+DEFAULT_CACHE_DIR = "data/scraped/itjobswatch/http-cache"
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60  # Entries older than a week are refetched in full
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024   # Evict least recently used bodies beyond 512 MB
+
+# Response headers worth replaying from the cache (bodies are stored decoded,
+# so transfer headers such as Content-Encoding/Content-Length are dropped)
+CACHED_HEADERS = ('content-type', 'etag', 'last-modified', 'date', 'cache-control')
+
+
+class HTTPCache:
+    """Thread-safe on-disk store of response bodies and their validators."""
+    
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+        max_bytes: Optional[int] = DEFAULT_MAX_BYTES
+    ):
+        """
+        Open (or create) a cache directory.
+        
+        Args:
+            cache_dir: Directory holding the index and body files
+            ttl_seconds: Maximum age of an entry before it is ignored (None = forever)
+            max_bytes: Maximum total body size before LRU eviction (None = unlimited)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.body_dir = self.cache_dir / 'bodies'
+        self.body_dir.mkdir(parents=True, exist_ok=True)
+        
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.cache_dir / 'index.sqlite'),
+            timeout=30,
+            check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                headers TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON entries (accessed_at)")
+        self._conn.commit()
+        
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+    
+    @staticmethod
+    def _key(url: str) -> str:
+        """Cache key for a URL."""
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+    
+    def _body_path(self, key: str) -> Path:
+        """Path of the body file for a key (sharded to keep directories small)."""
+        return self.body_dir / key[:2] / key
+    
+    def lookup(self, url: str) -> Optional[Dict]:
+        """
+        Find a usable cache entry for a URL.
+        
+        Args:
+            url: Request URL
+        
+        Returns:
+            Dictionary with 'etag', 'last_modified' and 'headers', or None if
+            the URL is not cached or the entry has expired
+        """
+        key = self._key(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, headers, stored_at FROM entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+        
+        if row is None:
+            return None
+        
+        etag, last_modified, headers, stored_at = row
+        if self.ttl_seconds is not None and time.time() - stored_at > self.ttl_seconds:
+            self.delete(url)
+            return None
+        
+        if not self._body_path(key).exists():
+            self.delete(url)
+            return None
+        
+        return {
+            'etag': etag,
+            'last_modified': last_modified,
+            'headers': json.loads(headers)
+        }
+    
+    def read_body(self, url: str) -> Optional[bytes]:
+        """
+        Read a cached body and mark the entry as recently used.
+        
+        Args:
+            url: Request URL
+        
+        Returns:
+            Cached body bytes, or None if missing
+        """
+        key = self._key(url)
+        try:
+            body = self._body_path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+        
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                (time.time(), key)
+            )
+            self._conn.commit()
+        
+        return body
+    
+    def store(self, url: str, response: requests.Response) -> None:
+        """
+        Store a 200 response that carries an ETag or Last-Modified validator.
+        
+        Args:
+            url: Request URL
+            response: Response whose content has been read
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return  # Nothing to revalidate with
+        
+        key = self._key(url)
+        body = response.content
+        headers = {
+            name: response.headers[name]
+            for name in CACHED_HEADERS
+            if name in response.headers
+        }
+        
+        # Write the body atomically so a crash never leaves a truncated file
+        body_path = self._body_path(key)
+        body_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = body_path.with_suffix('.tmp')
+        tmp_path.write_bytes(body)
+        os.replace(tmp_path, body_path)
+        
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO entries
+                    (key, url, etag, last_modified, headers, size, stored_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, url, etag, last_modified, json.dumps(headers), len(body), now, now)
+            )
+            self._conn.commit()
+            self.stats['stores'] += 1
+        
+        if self.max_bytes is not None:
+            self._evict_to_size(self.max_bytes)
+    
+    def touch(self, url: str) -> None:
+        """Reset an entry's age after a successful revalidation."""
+        with self._lock:
+            now = time.time()
+            self._conn.execute(
+                "UPDATE entries SET stored_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, self._key(url))
+            )
+            self._conn.commit()
+    
+    def delete(self, url: str) -> None:
+        """Remove a URL from the cache."""
+        key = self._key(url)
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+        self._body_path(key).unlink(missing_ok=True)
+    
+    def total_bytes(self) -> int:
+        """Total size of all cached bodies."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+    
+    def evict(self) -> int:
+        """
+        Drop expired entries, then least recently used entries over the size limit.
+        
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        
+        if self.ttl_seconds is not None:
+            cutoff = time.time() - self.ttl_seconds
+            with self._lock:
+                keys = [row[0] for row in self._conn.execute(
+                    "SELECT key FROM entries WHERE stored_at < ?", (cutoff,)
+                )]
+                self._conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k in keys])
+                self._conn.commit()
+                self.stats['evictions'] += len(keys)
+            for key in keys:
+                self._body_path(key).unlink(missing_ok=True)
+            removed += len(keys)
+        
+        if self.max_bytes is not None:
+            removed += self._evict_to_size(self.max_bytes)
+        
+        return removed
+    
+    def _evict_to_size(self, max_bytes: int) -> int:
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        with self._lock:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= max_bytes:
+                return 0
+            
+            victims = []
+            for key, size in self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at ASC"
+            ):
+                if total <= max_bytes:
+                    break
+                victims.append(key)
+                total -= size
+            
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k in victims])
+            self._conn.commit()
+            self.stats['evictions'] += len(victims)
+        
+        for key in victims:
+            self._body_path(key).unlink(missing_ok=True)
+        
+        return len(victims)
+    
+    def close(self) -> None:
+        """Close the index database."""
+        with self._lock:
+            self._conn.close()
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that revalidates GET requests against an HTTPCache."""
+    
+    def __init__(self, cache: HTTPCache, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache = cache
+    
+    def send(self, request, **kwargs):
+        """Send a request, adding conditional headers and answering 304s from the cache."""
+        if request.method != 'GET':
+            return super().send(request, **kwargs)
+        
+        entry = self.cache.lookup(request.url)
+        if entry:
+            if entry['etag']:
+                request.headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                request.headers['If-Modified-Since'] = entry['last_modified']
+        
+        response = super().send(request, **kwargs)
+        response.from_cache = False
+        
+        if response.status_code == 304 and entry:
+            body = self.cache.read_body(request.url)
+            if body is not None:
+                self.cache.touch(request.url)
+                with self.cache._lock:
+                    self.cache.stats['hits'] += 1
+                return self._build_cached_response(request, response, entry, body)
+        
+        with self.cache._lock:
+            self.cache.stats['misses'] += 1
+        
+        if response.status_code == 200 and not kwargs.get('stream'):
+            self.cache.store(request.url, response)
+        
+        return response
+    
+    def _build_cached_response(self, request, not_modified, entry: Dict, body: bytes):
+        """Turn a 304 into a 200 response carrying the cached body."""
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        
+        # Stored headers, refreshed by any validators the 304 carried
+        headers = CaseInsensitiveDict(entry['headers'])
+        for name in CACHED_HEADERS:
+            if name in not_modified.headers:
+                headers[name] = not_modified.headers[name]
+        response.headers = headers
+        response.encoding = get_encoding_from_headers(headers)
+        
+        response._content = body
+        response._content_consumed = True
+        response.from_cache = True
+        not_modified.close()
+        
+        return response
+
+
+def mount_cache(session: requests.Session, cache: HTTPCache, **adapter_kwargs) -> None:
+    """
+    Mount a CachingHTTPAdapter on a session for http:// and https://.
+    
+    Args:
+        session: Session to configure
+        cache: Cache to revalidate against
+        **adapter_kwargs: Passed to HTTPAdapter (max_retries, pool sizes, ...)
+    """
+    adapter = CachingHTTPAdapter(cache, **adapter_kwargs)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
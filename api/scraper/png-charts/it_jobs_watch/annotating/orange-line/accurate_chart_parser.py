@@ -11,7 +11,12 @@ from pathlib import Path
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
-from api.it_jobs_watch.chart_parser import ITJobsWatchChartParser
+try:
+    from api.it_jobs_watch.chart_parser import ITJobsWatchChartParser
+except ImportError:
+    # Base parser in this checkout lives in it_jobs_watch/scripts
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'scripts'))
+    from chart_parser import ITJobsWatchChartParser
 
 
 class AccurateChartParser(ITJobsWatchChartParser):
@@ -29,11 +34,11 @@ class AccurateChartParser(ITJobsWatchChartParser):
             'right_percent': 0.95   # Minimal right crop (was 0.90)
         }
         
-        print("Using corrected cropping settings:")
-        print(f"  Top: {self.chart_crop['top_percent']*100:.1f}% (was 15%)")
-        print(f"  Bottom: {self.chart_crop['bottom_percent']*100:.1f}% (was 80%)")
-        print(f"  Left: {self.chart_crop['left_percent']*100:.1f}% (was 12%)")
-        print(f"  Right: {self.chart_crop['right_percent']*100:.1f}% (was 90%)")
+        self.trace.log("Using corrected cropping settings:", level='debug')
+        self.trace.log(f"  Top: {self.chart_crop['top_percent']*100:.1f}% (was 15%)", level='debug')
+        self.trace.log(f"  Bottom: {self.chart_crop['bottom_percent']*100:.1f}% (was 80%)", level='debug')
+        self.trace.log(f"  Left: {self.chart_crop['left_percent']*100:.1f}% (was 12%)", level='debug')
+        self.trace.log(f"  Right: {self.chart_crop['right_percent']*100:.1f}% (was 90%)", level='debug')
     
     def extract_chart_area(self, image):
         """Extract chart area with corrected cropping settings."""
@@ -48,10 +53,10 @@ class AccurateChartParser(ITJobsWatchChartParser):
         # Extract chart area
         chart_area = image[top:bottom, left:right]
         
-        print(f"Chart area extracted with corrected cropping:")
-        print(f"  Original image: {image.shape}")
-        print(f"  Cropped area: {chart_area.shape}")
-        print(f"  Crop coordinates: top={top}, bottom={bottom}, left={left}, right={right}")
+        self.trace.log(f"Chart area extracted with corrected cropping:", level='debug')
+        self.trace.log(f"  Original image: {image.shape}", level='debug')
+        self.trace.log(f"  Cropped area: {chart_area.shape}", level='debug')
+        self.trace.log(f"  Crop coordinates: top={top}, bottom={bottom}, left={left}, right={right}", level='debug')
         
         return chart_area
     
@@ -61,15 +66,14 @@ class AccurateChartParser(ITJobsWatchChartParser):
         os.makedirs(debug_dir, exist_ok=True)
         
         # Save chart area with corrected cropping
-        import cv2
-        cv2.imwrite(os.path.join(debug_dir, f"{technology}_corrected_chart_area.png"), chart_area)
+        self.trace.artifact(os.path.join(debug_dir, f"{technology}_corrected_chart_area.png"), chart_area)
         
         # Save orange mask with corrected cropping
-        cv2.imwrite(os.path.join(debug_dir, f"{technology}_corrected_orange_mask.png"), orange_mask)
+        self.trace.artifact(os.path.join(debug_dir, f"{technology}_corrected_orange_mask.png"), orange_mask)
         
-        print(f"Corrected debug images saved to {debug_dir}")
-        print(f"  - {technology}_corrected_chart_area.png")
-        print(f"  - {technology}_corrected_orange_mask.png")
+        self.trace.log(f"Corrected debug images saved to {debug_dir}", level='debug')
+        self.trace.log(f"  - {technology}_corrected_chart_area.png", level='debug')
+        self.trace.log(f"  - {technology}_corrected_orange_mask.png", level='debug')
     
     def map_pixels_to_data(self, pixel_points, grid_lines, chart_area, technology):
         """Map pixels to data with grid-aware coordinate system."""
@@ -87,14 +91,14 @@ class AccurateChartParser(ITJobsWatchChartParser):
             y_bottom = max(horizontal_lines)  # Bottom line (0%)
             y_top = min(horizontal_lines)     # Top line (12%)
             
-            print(f"Using {len(horizontal_lines)} grid lines for Y-axis mapping:")
-            print(f"  Bottom (0%): y={y_bottom}")
-            print(f"  Top (12%): y={y_top}")
+            self.trace.log(f"Using {len(horizontal_lines)} grid lines for Y-axis mapping:", level='debug')
+            self.trace.log(f"  Bottom (0%): y={y_bottom}", level='debug')
+            self.trace.log(f"  Top (12%): y={y_top}", level='debug')
         else:
             # Fallback to chart boundaries
             y_bottom = height - 1
             y_top = 0
-            print("Warning: Using chart boundaries for Y-axis (no grid lines detected)")
+            self.trace.log("Warning: Using chart boundaries for Y-axis (no grid lines detected)", level='info')
         
         # Percentage range: 0% to 12% based on the 12 horizontal grid lines
         percent_range = (0.0, 12.0)
@@ -122,7 +126,7 @@ class AccurateChartParser(ITJobsWatchChartParser):
                       if year_range[0] <= year <= year_range[1]]
         data_points.sort(key=lambda p: p[0])
         
-        print(f"Mapped {len(data_points)} points using corrected coordinates")
-        print(f"Y-axis range: {percent_range[0]}% to {percent_range[1]}%")
+        self.trace.log(f"Mapped {len(data_points)} points using corrected coordinates", level='debug')
+        self.trace.log(f"Y-axis range: {percent_range[0]}% to {percent_range[1]}%", level='debug')
         
         return data_points
\ No newline at end of file
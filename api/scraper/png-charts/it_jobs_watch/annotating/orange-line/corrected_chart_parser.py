@@ -10,7 +10,12 @@ from pathlib import Path
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
-from api.it_jobs_watch.chart_parser import ITJobsWatchChartParser
+try:
+    from api.it_jobs_watch.chart_parser import ITJobsWatchChartParser
+except ImportError:
+    # Base parser in this checkout lives in it_jobs_watch/scripts
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'scripts'))
+    from chart_parser import ITJobsWatchChartParser
 
 
 class CorrectedChartParser(ITJobsWatchChartParser):
@@ -41,7 +46,7 @@ class CorrectedChartParser(ITJobsWatchChartParser):
             if year in self.calibration_points:
                 # Use exact expected value for calibration points
                 corrected_pct = self.calibration_points[year]
-                print(f"Direct calibration: {year}: {raw_pct:.2f}% -> {corrected_pct:.1f}%")
+                self.trace.log(f"Direct calibration: {year}: {raw_pct:.2f}% -> {corrected_pct:.1f}%", level='trace')
             else:
                 # For non-calibration points, use interpolation/scaling
                 # Find nearest calibration points for interpolation
@@ -83,10 +88,10 @@ class CorrectedChartParser(ITJobsWatchChartParser):
         
         return corrected_data
     
-    def extract_technology_data(self, technology: str):
+    def extract_data_from_image(self, image, technology, chart_type='', time_period=''):
         """Extract and apply calibration correction to technology data."""
         # Get raw data using parent method
-        raw_data = super().extract_technology_data(technology)
+        raw_data = super().extract_data_from_image(image, technology, chart_type, time_period)
         
         if not raw_data:
             return raw_data
@@ -94,11 +99,11 @@ class CorrectedChartParser(ITJobsWatchChartParser):
         # Apply calibration correction
         corrected_data = self.apply_calibration(raw_data)
         
-        print("\nCalibration applied - comparison:")
-        print("Year | Raw%  | Corrected%")
-        print("-" * 25)
+        self.trace.log("\nCalibration applied - comparison:", level='debug')
+        self.trace.log("Year | Raw%  | Corrected%", level='debug')
+        self.trace.log("-" * 25, level='debug')
         for i, (year, raw_pct) in enumerate(raw_data):
             corrected_pct = corrected_data[i][1] if i < len(corrected_data) else raw_pct
-            print(f"{year} | {raw_pct:5.2f} | {corrected_pct:8.2f}")
+            self.trace.log(f"{year} | {raw_pct:5.2f} | {corrected_pct:8.2f}", level='trace')
         
         return corrected_data
\ No newline at end of file
@@ -28,102 +28,78 @@ class EnhancedOCRChartParser(OCRFriendlyChartParser):
             'upper': np.array([180, 50, 250])  # Lighter grey upper bound (was 220)
         }
         
-        print("Enhanced OCR parser with light grey mask detection initialized")
+        self.trace.log("Enhanced OCR parser with light grey mask detection initialized", level='debug')
     
     def extract_light_grey_horizontal_mask(self, chart_area):
         """Extract horizontal light grey grid lines for percentage mapping."""
-        # Convert to HSV for better color filtering
-        hsv = cv2.cvtColor(chart_area, cv2.COLOR_BGR2HSV)
-        
-        # Try multiple grey ranges to capture grid lines
-        grey_ranges = [
-            {'lower': np.array([0, 0, 100]), 'upper': np.array([180, 60, 255])},   # Very permissive
-            {'lower': np.array([0, 0, 120]), 'upper': np.array([180, 50, 250])},   # Current range
-            {'lower': np.array([0, 0, 140]), 'upper': np.array([180, 40, 230])},   # Stricter
-        ]
-        
-        best_mask = None
-        best_pixel_count = 0
-        
-        for i, range_def in enumerate(grey_ranges):
-            # Create mask for this grey range
-            mask = cv2.inRange(hsv, range_def['lower'], range_def['upper'])
-            pixel_count = np.sum(mask > 0)
-            
-            print(f"  Grey range {i+1}: {pixel_count} pixels detected")
-            
-            if pixel_count > best_pixel_count:
-                best_pixel_count = pixel_count
-                best_mask = mask
+        # Try multiple grey ranges to capture grid lines (counted in the shared HSV pass)
+        for i, pixel_count in enumerate(self.range_pixel_counts(chart_area, 'light_grey')):
+            self.trace.log(f"  Grey range {i+1}: {pixel_count} pixels detected", level='debug')
         
+        best_mask = self.best_light_grey_mask(chart_area)
         if best_mask is None:
-            print("  No grey pixels detected in any range")
+            self.trace.log("  No grey pixels detected in any range", level='debug')
             return np.zeros_like(chart_area[:,:,0])
         
-        # Focus on horizontal structures only
-        # Use morphological operations to isolate horizontal lines
-        horizontal_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (25, 1))
-        horizontal_mask = cv2.morphologyEx(best_mask, cv2.MORPH_OPEN, horizontal_kernel)
+        def build():
+            # Focus on horizontal structures only
+            # Use morphological operations to isolate horizontal lines
+            horizontal_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (25, 1))
+            horizontal_mask = cv2.morphologyEx(best_mask, cv2.MORPH_OPEN, horizontal_kernel)
+            
+            # Clean up the mask
+            return cv2.morphologyEx(horizontal_mask, cv2.MORPH_CLOSE, np.ones((3,3), np.uint8))
         
-        # Clean up the mask
-        horizontal_mask = cv2.morphologyEx(horizontal_mask, cv2.MORPH_CLOSE, np.ones((3,3), np.uint8))
+        horizontal_mask = self.cached_mask(chart_area, 'light_grey_horizontal', build)
         
-        print(f"Extracted light grey horizontal mask: {np.sum(horizontal_mask > 0)} pixels (after morphology)")
+        self.trace.log(f"Extracted light grey horizontal mask: {np.sum(horizontal_mask > 0)} pixels (after morphology)", level='debug')
         
         return horizontal_mask
     
     def extract_light_grey_vertical_mask(self, chart_area):
         """Extract vertical light grey grid lines for year mapping."""
-        # Convert to HSV for better color filtering
-        hsv = cv2.cvtColor(chart_area, cv2.COLOR_BGR2HSV)
-        
-        # Try multiple grey ranges to capture grid lines
-        grey_ranges = [
-            {'lower': np.array([0, 0, 100]), 'upper': np.array([180, 60, 255])},   # Very permissive
-            {'lower': np.array([0, 0, 120]), 'upper': np.array([180, 50, 250])},   # Current range
-            {'lower': np.array([0, 0, 140]), 'upper': np.array([180, 40, 230])},   # Stricter
-        ]
-        
-        best_mask = None
-        best_pixel_count = 0
-        
-        for i, range_def in enumerate(grey_ranges):
-            # Create mask for this grey range
-            mask = cv2.inRange(hsv, range_def['lower'], range_def['upper'])
-            pixel_count = np.sum(mask > 0)
-            
-            if pixel_count > best_pixel_count:
-                best_pixel_count = pixel_count
-                best_mask = mask
-        
+        best_mask = self.best_light_grey_mask(chart_area)
         if best_mask is None:
             return np.zeros_like(chart_area[:,:,0])
         
-        # Focus on vertical structures only
-        # Use morphological operations to isolate vertical lines
-        vertical_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, 25))
-        vertical_mask = cv2.morphologyEx(best_mask, cv2.MORPH_OPEN, vertical_kernel)
+        def build():
+            # Focus on vertical structures only
+            # Use morphological operations to isolate vertical lines
+            vertical_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, 25))
+            vertical_mask = cv2.morphologyEx(best_mask, cv2.MORPH_OPEN, vertical_kernel)
+            
+            # Clean up the mask
+            return cv2.morphologyEx(vertical_mask, cv2.MORPH_CLOSE, np.ones((3,3), np.uint8))
         
-        # Clean up the mask
-        vertical_mask = cv2.morphologyEx(vertical_mask, cv2.MORPH_CLOSE, np.ones((3,3), np.uint8))
+        vertical_mask = self.cached_mask(chart_area, 'light_grey_vertical', build)
         
-        print(f"Extracted light grey vertical mask: {np.sum(vertical_mask > 0)} pixels (after morphology)")
+        self.trace.log(f"Extracted light grey vertical mask: {np.sum(vertical_mask > 0)} pixels (after morphology)", level='debug')
         
         return vertical_mask
     
+    def best_light_grey_mask(self, chart_area):
+        """Raw mask of the grey range with the most pixels, shared by both orientations."""
+        def build():
+            counts = self.range_pixel_counts(chart_area, 'light_grey')
+            if max(counts) == 0:
+                return None
+            
+            # First range with the highest count, as the sequential search picked
+            best_index = counts.index(max(counts))
+            return self.range_masks(chart_area, 'light_grey')[best_index]
+        
+        return self.cached_mask(chart_area, 'light_grey', build)
+    
     def detect_grid_from_masks(self, horizontal_mask, vertical_mask):
         """Detect grid line positions from light grey masks with intelligent filtering."""
         height, width = horizontal_mask.shape
         
-        # Find horizontal grid lines with stronger filtering
-        horizontal_candidates = []
-        for y in range(height):
-            row = horizontal_mask[y, :]
-            line_coverage = np.sum(row > 0) / width
-            
-            # Require stronger line coverage for horizontal grid lines
-            if line_coverage > 0.6:  # Line covers 60% of width (was 30%)
-                horizontal_candidates.append(y)
+        # Coverage of every row / column at once
+        row_coverage = (horizontal_mask > 0).mean(axis=1)
+        column_coverage = (vertical_mask > 0).mean(axis=0)
+        
+        # Require stronger line coverage for horizontal grid lines
+        horizontal_candidates = np.flatnonzero(row_coverage > 0.6)  # Line covers 60% of width (was 30%)
         
         # Filter horizontal lines to find evenly spaced grid (target: 12 lines for 0-12%)
         if len(horizontal_candidates) > 5:
@@ -132,37 +108,23 @@ class EnhancedOCRChartParser(OCRFriendlyChartParser):
             chart_bottom = int(height * 0.85)
             
             # Filter to lines within the chart area
-            chart_horizontals = [y for y in horizontal_candidates if chart_top <= y <= chart_bottom]
+            chart_horizontals = horizontal_candidates[
+                (horizontal_candidates >= chart_top) & (horizontal_candidates <= chart_bottom)
+            ]
             
             # If we have too many lines, keep the most evenly spaced ones
             if len(chart_horizontals) > 15:
-                # Calculate average spacing and keep lines close to that spacing
-                if len(chart_horizontals) > 1:
-                    spacings = [chart_horizontals[i+1] - chart_horizontals[i] 
-                               for i in range(len(chart_horizontals)-1)]
-                    avg_spacing = np.median(spacings)
-                    
-                    # Keep lines that maintain reasonable spacing
-                    filtered_horizontals = [chart_horizontals[0]]
-                    for line_y in chart_horizontals[1:]:
-                        if (line_y - filtered_horizontals[-1]) >= (avg_spacing * 0.7):
-                            filtered_horizontals.append(line_y)
-                    
-                    chart_horizontals = filtered_horizontals[:13]  # Limit to ~12 grid lines
+                # Keep lines that maintain reasonable spacing relative to the median spacing
+                avg_spacing = np.median(np.diff(chart_horizontals))
+                chart_horizontals = self.thin_positions(chart_horizontals, avg_spacing * 0.7, limit=13)  # Limit to ~12 grid lines
             
-            horizontal_positions = chart_horizontals
+            horizontal_positions = list(map(int, chart_horizontals))
         else:
-            horizontal_positions = horizontal_candidates
+            horizontal_positions = horizontal_candidates.tolist()
         
         # Find vertical grid lines with similar filtering
-        vertical_candidates = []
-        for x in range(width):
-            col = vertical_mask[:, x]
-            line_coverage = np.sum(col > 0) / height
-            
-            # Require good line coverage for vertical grid lines
-            if line_coverage > 0.4:  # Line covers 40% of height
-                vertical_candidates.append(x)
+        # Require good line coverage for vertical grid lines
+        vertical_candidates = np.flatnonzero(column_coverage > 0.4)  # Line covers 40% of height
         
         # Filter vertical lines to reasonable chart boundaries
         if len(vertical_candidates) > 3:
@@ -170,7 +132,9 @@ class EnhancedOCRChartParser(OCRFriendlyChartParser):
             chart_left = int(width * 0.1)
             chart_right = int(width * 0.9)
             
-            chart_verticals = [x for x in vertical_candidates if chart_left <= x <= chart_right]
+            chart_verticals = vertical_candidates[
+                (vertical_candidates >= chart_left) & (vertical_candidates <= chart_right)
+            ]
             
             # Limit to reasonable number of vertical lines
             if len(chart_verticals) > 20:
@@ -178,23 +142,27 @@ class EnhancedOCRChartParser(OCRFriendlyChartParser):
                 step = len(chart_verticals) // 15
                 chart_verticals = chart_verticals[::step][:20]
             
-            vertical_positions = chart_verticals
+            vertical_positions = chart_verticals.tolist()
         else:
-            vertical_positions = vertical_candidates
+            vertical_positions = vertical_candidates.tolist()
         
         grid_lines = {
             'horizontal': horizontal_positions,
             'vertical': vertical_positions
         }
         
-        print(f"Grid lines detected from light grey masks (filtered):")
-        print(f"  Horizontal: {len(grid_lines['horizontal'])} lines (target: ~12)")
-        print(f"  Vertical: {len(grid_lines['vertical'])} lines")
+        self.trace.log(f"Grid lines detected from light grey masks (filtered):", level='debug')
+        self.trace.log(f"  Horizontal: {len(grid_lines['horizontal'])} lines (target: ~12)", level='debug')
+        self.trace.log(f"  Vertical: {len(grid_lines['vertical'])} lines", level='debug')
         
         return grid_lines
     
     def detect_grid_lines(self, chart_area):
-        """Enhanced grid detection using light grey masks."""
+        """Enhanced grid detection using light grey masks (cached per chart area)."""
+        return self.cached_grid_lines(chart_area, 'light_grey_masks', self._detect_mask_grid_lines)
+    
+    def _detect_mask_grid_lines(self, chart_area):
+        """Merge grid lines found in the light grey masks with the parent detection."""
         # Extract light grey masks
         horizontal_mask = self.extract_light_grey_horizontal_mask(chart_area)
         vertical_mask = self.extract_light_grey_vertical_mask(chart_area)
@@ -214,9 +182,9 @@ class EnhancedOCRChartParser(OCRFriendlyChartParser):
             'vertical': sorted(all_vertical)
         }
         
-        print(f"Combined grid detection results:")
-        print(f"  Horizontal: {len(combined_grid['horizontal'])} lines (target: 12 for 0-12%)")
-        print(f"  Vertical: {len(combined_grid['vertical'])} lines")
+        self.trace.log(f"Combined grid detection results:", level='debug')
+        self.trace.log(f"  Horizontal: {len(combined_grid['horizontal'])} lines (target: 12 for 0-12%)", level='debug')
+        self.trace.log(f"  Vertical: {len(combined_grid['vertical'])} lines", level='debug')
         
         return combined_grid
     
@@ -232,19 +200,19 @@ class EnhancedOCRChartParser(OCRFriendlyChartParser):
         os.makedirs(data_dir, exist_ok=True)
         
         # Save basic debug images to masks directory
-        cv2.imwrite(os.path.join(masks_dir, f"{technology}_chart_area.png"), chart_area)
-        cv2.imwrite(os.path.join(masks_dir, f"{technology}_orange_mask.png"), orange_mask)
+        self.trace.artifact(os.path.join(masks_dir, f"{technology}_chart_area.png"), chart_area)
+        self.trace.artifact(os.path.join(masks_dir, f"{technology}_orange_mask.png"), orange_mask)
         
         # Extract and save light grey masks
         horizontal_mask = self.extract_light_grey_horizontal_mask(chart_area)
         vertical_mask = self.extract_light_grey_vertical_mask(chart_area)
         
-        cv2.imwrite(os.path.join(masks_dir, f"{technology}_light_grey_horizontal_mask.png"), horizontal_mask)
-        cv2.imwrite(os.path.join(masks_dir, f"{technology}_light_grey_vertical_mask.png"), vertical_mask)
+        self.trace.artifact(os.path.join(masks_dir, f"{technology}_light_grey_horizontal_mask.png"), horizontal_mask)
+        self.trace.artifact(os.path.join(masks_dir, f"{technology}_light_grey_vertical_mask.png"), vertical_mask)
         
         # Create combined mask visualization
         combined_mask = cv2.bitwise_or(horizontal_mask, vertical_mask)
-        cv2.imwrite(os.path.join(masks_dir, f"{technology}_light_grey_combined_mask.png"), combined_mask)
+        self.trace.artifact(os.path.join(masks_dir, f"{technology}_light_grey_combined_mask.png"), combined_mask)
         
         # Create overlay showing all detected elements
         overlay = chart_area.copy()
@@ -258,19 +226,19 @@ class EnhancedOCRChartParser(OCRFriendlyChartParser):
         # Overlay orange line in green
         overlay[orange_mask > 0] = [0, 255, 0]
         
-        cv2.imwrite(os.path.join(debug_root, f"{technology}_enhanced_overlay.png"), overlay)
+        self.trace.artifact(os.path.join(debug_root, f"{technology}_enhanced_overlay.png"), overlay)
         
-        print(f"Organized debug output saved:")
-        print(f"  debug/masks/:")
-        print(f"    - {technology}_chart_area.png")
-        print(f"    - {technology}_orange_mask.png")
-        print(f"    - {technology}_light_grey_horizontal_mask.png")
-        print(f"    - {technology}_light_grey_vertical_mask.png")
-        print(f"    - {technology}_light_grey_combined_mask.png")
-        print(f"  debug/:")
-        print(f"    - {technology}_enhanced_overlay.png (all elements combined)")
-        print(f"  debug/data/:")
-        print(f"    - (JSON files will be saved here by test script)")
+        self.trace.log(f"Organized debug output saved:", level='debug')
+        self.trace.log(f"  debug/masks/:", level='debug')
+        self.trace.log(f"    - {technology}_chart_area.png", level='debug')
+        self.trace.log(f"    - {technology}_orange_mask.png", level='debug')
+        self.trace.log(f"    - {technology}_light_grey_horizontal_mask.png", level='debug')
+        self.trace.log(f"    - {technology}_light_grey_vertical_mask.png", level='debug')
+        self.trace.log(f"    - {technology}_light_grey_combined_mask.png", level='debug')
+        self.trace.log(f"  debug/:", level='debug')
+        self.trace.log(f"    - {technology}_enhanced_overlay.png (all elements combined)", level='debug')
+        self.trace.log(f"  debug/data/:", level='debug')
+        self.trace.log(f"    - (JSON files will be saved here by test script)", level='debug')
         
         return {
             'masks_dir': masks_dir,
@@ -289,31 +257,31 @@ class EnhancedOCRChartParser(OCRFriendlyChartParser):
         horizontal_lines = sorted(grid_lines.get('horizontal', []))
         vertical_lines = sorted(grid_lines.get('vertical', []))
         
-        print(f"Enhanced coordinate mapping:")
-        print(f"  Chart dimensions: {width} x {height}")
-        print(f"  Available horizontal grid lines: {len(horizontal_lines)}")
-        print(f"  Available vertical grid lines: {len(vertical_lines)}")
+        self.trace.log(f"Enhanced coordinate mapping:", level='debug')
+        self.trace.log(f"  Chart dimensions: {width} x {height}", level='debug')
+        self.trace.log(f"  Available horizontal grid lines: {len(horizontal_lines)}", level='debug')
+        self.trace.log(f"  Available vertical grid lines: {len(vertical_lines)}", level='debug')
         
         # Determine plotting area using grid lines
         if len(horizontal_lines) >= 2:
             y_top = min(horizontal_lines)      # Top (12%)
             y_bottom = max(horizontal_lines)   # Bottom (0%)
-            print(f"  Y-axis from grid: {y_top} (12%) to {y_bottom} (0%)")
+            self.trace.log(f"  Y-axis from grid: {y_top} (12%) to {y_bottom} (0%)", level='debug')
         else:
             # Fallback to estimated plot area
             y_top = int(height * 0.10)
             y_bottom = int(height * 0.85)
-            print(f"  Y-axis estimated: {y_top} to {y_bottom}")
+            self.trace.log(f"  Y-axis estimated: {y_top} to {y_bottom}", level='debug')
         
         if len(vertical_lines) >= 2:
             x_left = min(vertical_lines)       # Left (2005)
             x_right = max(vertical_lines)      # Right (2024)
-            print(f"  X-axis from grid: {x_left} (2005) to {x_right} (2024)")
+            self.trace.log(f"  X-axis from grid: {x_left} (2005) to {x_right} (2024)", level='debug')
         else:
             # Fallback to estimated plot area
             x_left = int(width * 0.08)
             x_right = int(width * 0.92)
-            print(f"  X-axis estimated: {x_left} to {x_right}")
+            self.trace.log(f"  X-axis estimated: {x_left} to {x_right}", level='debug')
         
         # Map pixel coordinates to data values
         data_points = []
@@ -343,6 +311,6 @@ class EnhancedOCRChartParser(OCRFriendlyChartParser):
                       if year_range[0] <= year <= year_range[1]]
         data_points.sort(key=lambda p: p[0])
         
-        print(f"Enhanced mapping completed: {len(data_points)} points")
+        self.trace.log(f"Enhanced mapping completed: {len(data_points)} points", level='debug')
         
         return data_points
\ No newline at end of file
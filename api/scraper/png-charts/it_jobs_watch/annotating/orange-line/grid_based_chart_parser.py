@@ -11,7 +11,12 @@ from pathlib import Path
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
-from api.it_jobs_watch.chart_parser import ITJobsWatchChartParser
+try:
+    from api.it_jobs_watch.chart_parser import ITJobsWatchChartParser
+except ImportError:
+    # Base parser in this checkout lives in it_jobs_watch/scripts
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'scripts'))
+    from chart_parser import ITJobsWatchChartParser
 
 
 class GridBasedChartParser(ITJobsWatchChartParser):
@@ -34,23 +39,23 @@ class GridBasedChartParser(ITJobsWatchChartParser):
             y_bottom = max(horizontal_lines)  # Bottom line (0%)
             y_top = min(horizontal_lines)     # Top line (12%)
             
-            print(f"Using grid lines for Y-axis mapping:")
-            print(f"  Bottom (0%): y={y_bottom}")
-            print(f"  Top (12%): y={y_top}")
-            print(f"  Grid lines detected: {len(horizontal_lines)}")
+            self.trace.log(f"Using grid lines for Y-axis mapping:", level='debug')
+            self.trace.log(f"  Bottom (0%): y={y_bottom}", level='debug')
+            self.trace.log(f"  Top (12%): y={y_top}", level='debug')
+            self.trace.log(f"  Grid lines detected: {len(horizontal_lines)}", level='debug')
             
             # If we have exactly 13 lines (including 0% and 12%), use them for precise mapping
             if len(horizontal_lines) == 13:
-                print("  Perfect grid detection: 13 lines found (0% to 12%)")
+                self.trace.log("  Perfect grid detection: 13 lines found (0% to 12%)", level='debug')
             elif len(horizontal_lines) >= 10:
-                print(f"  Good grid detection: {len(horizontal_lines)} lines found")
+                self.trace.log(f"  Good grid detection: {len(horizontal_lines)} lines found", level='debug')
             else:
-                print(f"  Partial grid detection: {len(horizontal_lines)} lines found")
+                self.trace.log(f"  Partial grid detection: {len(horizontal_lines)} lines found", level='debug')
         else:
             # Fallback to chart area boundaries
             y_bottom = height - 1
             y_top = 0
-            print("Warning: No grid lines detected, using chart area boundaries")
+            self.trace.log("Warning: No grid lines detected, using chart area boundaries", level='info')
         
         # Always use 0-12% range for artificial intelligence charts
         percent_range = (0.0, 12.0)
@@ -79,13 +84,17 @@ class GridBasedChartParser(ITJobsWatchChartParser):
                       if year_range[0] <= year <= year_range[1]]
         data_points.sort(key=lambda p: p[0])
         
-        print(f"Mapped {len(data_points)} pixel points using grid-based coordinate system")
-        print(f"Percentage range: {percent_range[0]:.1f}% to {percent_range[1]:.1f}%")
+        self.trace.log(f"Mapped {len(data_points)} pixel points using grid-based coordinate system", level='debug')
+        self.trace.log(f"Percentage range: {percent_range[0]:.1f}% to {percent_range[1]:.1f}%", level='debug')
         
         return data_points
     
     def detect_grid_lines(self, chart_area):
-        """Enhanced grid line detection focused on horizontal lines for percentage mapping."""
+        """Enhanced grid line detection focused on horizontal lines for percentage mapping (cached per chart area)."""
+        return self.cached_grid_lines(chart_area, 'grid_based', self._detect_percentage_grid_lines)
+    
+    def _detect_percentage_grid_lines(self, chart_area):
+        """Add rows with strong, wide horizontal structure to the base detection."""
         # Get base grid detection
         grid_lines = super().detect_grid_lines(chart_area)
         
@@ -101,24 +110,14 @@ class GridBasedChartParser(ITJobsWatchChartParser):
         
         # Find peaks that might be grid lines
         threshold = np.percentile(row_strengths, 85)  # Top 15% of edge strengths
-        potential_lines = []
         
-        for i, strength in enumerate(row_strengths):
-            if strength > threshold:
-                # Check if this forms a horizontal line across most of the width
-                row_edges = horizontal_edges[i]
-                line_coverage = np.sum(row_edges > threshold * 0.5) / len(row_edges)
-                
-                if line_coverage > 0.3:  # Line covers at least 30% of width
-                    potential_lines.append(i)
+        # Check which rows form a horizontal line across most of the width
+        line_coverage = (horizontal_edges > threshold * 0.5).mean(axis=1)
+        potential_lines = np.flatnonzero((row_strengths > threshold) & (line_coverage > 0.3))
         
         # Merge nearby lines and ensure we have reasonable spacing
-        merged_lines = []
         min_spacing = chart_area.shape[0] // 20  # Minimum spacing between grid lines
-        
-        for line_y in potential_lines:
-            if not merged_lines or (line_y - merged_lines[-1]) > min_spacing:
-                merged_lines.append(line_y)
+        merged_lines = self.thin_positions(potential_lines, min_spacing, strict=True)
         
         # Combine with original detection
         all_horizontal = list(set(grid_lines.get('horizontal', []) + merged_lines))
@@ -135,6 +134,6 @@ class GridBasedChartParser(ITJobsWatchChartParser):
             'vertical': grid_lines.get('vertical', [])
         }
         
-        print(f"Enhanced grid detection: {len(enhanced_grid['horizontal'])} horizontal, {len(enhanced_grid['vertical'])} vertical lines")
+        self.trace.log(f"Enhanced grid detection: {len(enhanced_grid['horizontal'])} horizontal, {len(enhanced_grid['vertical'])} vertical lines", level='debug')
         
         return enhanced_grid
\ No newline at end of file
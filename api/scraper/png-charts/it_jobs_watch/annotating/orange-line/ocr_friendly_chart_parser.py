@@ -11,7 +11,12 @@ from pathlib import Path
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
-from api.it_jobs_watch.chart_parser import ITJobsWatchChartParser
+try:
+    from api.it_jobs_watch.chart_parser import ITJobsWatchChartParser
+except ImportError:
+    # Base parser in this checkout lives in it_jobs_watch/scripts
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'scripts'))
+    from chart_parser import ITJobsWatchChartParser
 
 
 class OCRFriendlyChartParser(ITJobsWatchChartParser):
@@ -29,11 +34,11 @@ class OCRFriendlyChartParser(ITJobsWatchChartParser):
             'right_percent': 0.98   # Minimal right crop - preserve right margin labels
         }
         
-        print("Using OCR-friendly cropping settings (preserves axis labels):")
-        print(f"  Top: {self.chart_crop['top_percent']*100:.1f}% (minimal, preserve top labels)")
-        print(f"  Bottom: {self.chart_crop['bottom_percent']*100:.1f}% (minimal, preserve x-axis)")
-        print(f"  Left: {self.chart_crop['left_percent']*100:.1f}% (minimal, preserve y-axis)")
-        print(f"  Right: {self.chart_crop['right_percent']*100:.1f}% (minimal, preserve right labels)")
+        self.trace.log("Using OCR-friendly cropping settings (preserves axis labels):", level='debug')
+        self.trace.log(f"  Top: {self.chart_crop['top_percent']*100:.1f}% (minimal, preserve top labels)", level='debug')
+        self.trace.log(f"  Bottom: {self.chart_crop['bottom_percent']*100:.1f}% (minimal, preserve x-axis)", level='debug')
+        self.trace.log(f"  Left: {self.chart_crop['left_percent']*100:.1f}% (minimal, preserve y-axis)", level='debug')
+        self.trace.log(f"  Right: {self.chart_crop['right_percent']*100:.1f}% (minimal, preserve right labels)", level='debug')
     
     def extract_chart_area(self, image):
         """Extract chart area with OCR-friendly minimal cropping."""
@@ -48,16 +53,20 @@ class OCRFriendlyChartParser(ITJobsWatchChartParser):
         # Extract chart area
         chart_area = image[top:bottom, left:right]
         
-        print(f"OCR-friendly chart area extracted:")
-        print(f"  Original image: {image.shape}")
-        print(f"  Chart area: {chart_area.shape}")
-        print(f"  Preserved area: {((bottom-top) * (right-left)) / (height * width) * 100:.1f}% of original")
-        print(f"  Crop coordinates: top={top}, bottom={bottom}, left={left}, right={right}")
+        self.trace.log(f"OCR-friendly chart area extracted:", level='debug')
+        self.trace.log(f"  Original image: {image.shape}", level='debug')
+        self.trace.log(f"  Chart area: {chart_area.shape}", level='debug')
+        self.trace.log(f"  Preserved area: {((bottom-top) * (right-left)) / (height * width) * 100:.1f}% of original", level='debug')
+        self.trace.log(f"  Crop coordinates: top={top}, bottom={bottom}, left={left}, right={right}", level='debug')
         
         return chart_area
     
     def detect_grid_lines(self, chart_area):
-        """Enhanced grid line detection for charts with preserved axis labels."""
+        """Enhanced grid line detection for charts with preserved axis labels (cached per chart area)."""
+        return self.cached_grid_lines(chart_area, 'ocr_friendly', self._detect_inner_grid_lines)
+    
+    def _detect_inner_grid_lines(self, chart_area):
+        """Add horizontal grid lines found in the inner plotting area to the base detection."""
         # Call parent method for base detection
         grid_lines = super().detect_grid_lines(chart_area)
         
@@ -75,9 +84,9 @@ class OCRFriendlyChartParser(ITJobsWatchChartParser):
         
         inner_chart = chart_area[inner_top:inner_bottom, inner_left:inner_right]
         
-        print(f"Analyzing inner chart area for grid lines:")
-        print(f"  Inner area: {inner_chart.shape} (within preserved chart)")
-        print(f"  Inner bounds: top={inner_top}, bottom={inner_bottom}, left={inner_left}, right={inner_right}")
+        self.trace.log(f"Analyzing inner chart area for grid lines:", level='debug')
+        self.trace.log(f"  Inner area: {inner_chart.shape} (within preserved chart)", level='debug')
+        self.trace.log(f"  Inner bounds: top={inner_top}, bottom={inner_bottom}, left={inner_left}, right={inner_right}", level='debug')
         
         # Detect horizontal lines in inner area (for percentage grid)
         gray = inner_chart[:, :, 0] if len(inner_chart.shape) == 3 else inner_chart
@@ -86,30 +95,15 @@ class OCRFriendlyChartParser(ITJobsWatchChartParser):
         horizontal_gradient = np.abs(np.diff(gray, axis=0))
         row_strengths = np.mean(horizontal_gradient, axis=1)
         
-        # Find strong horizontal features
+        # Find strong horizontal features (converted back to full chart coordinates)
         threshold = np.percentile(row_strengths, 90)
-        horizontal_candidates = []
-        
-        for i, strength in enumerate(row_strengths):
-            if strength > threshold:
-                # Convert back to full chart coordinates
-                full_chart_y = inner_top + i
-                horizontal_candidates.append(full_chart_y)
-        
-        # Remove duplicates and sort
-        horizontal_candidates = sorted(list(set(horizontal_candidates)))
+        horizontal_candidates = (inner_top + np.flatnonzero(row_strengths > threshold)).tolist()
         
         # Filter to get evenly spaced grid lines (should be ~12 for 0-12% scale)
         if len(horizontal_candidates) > 5:
             # Keep lines that are reasonably spaced
-            filtered_lines = []
             min_spacing = (inner_bottom - inner_top) // 15  # Minimum spacing
-            
-            for line_y in horizontal_candidates:
-                if not filtered_lines or (line_y - filtered_lines[-1]) > min_spacing:
-                    filtered_lines.append(line_y)
-            
-            horizontal_candidates = filtered_lines
+            horizontal_candidates = self.thin_positions(horizontal_candidates, min_spacing, strict=True)
         
         # Combine with original detections, preferring inner area detections
         all_horizontal = list(set(grid_lines.get('horizontal', []) + horizontal_candidates))
@@ -120,9 +114,9 @@ class OCRFriendlyChartParser(ITJobsWatchChartParser):
             'vertical': grid_lines.get('vertical', [])
         }
         
-        print(f"Enhanced grid detection with preserved labels:")
-        print(f"  Horizontal lines: {len(enhanced_grid['horizontal'])} (target: ~12 for 0-12% scale)")
-        print(f"  Vertical lines: {len(enhanced_grid['vertical'])}")
+        self.trace.log(f"Enhanced grid detection with preserved labels:", level='debug')
+        self.trace.log(f"  Horizontal lines: {len(enhanced_grid['horizontal'])} (target: ~12 for 0-12% scale)", level='debug')
+        self.trace.log(f"  Vertical lines: {len(enhanced_grid['vertical'])}", level='debug')
         
         return enhanced_grid
     
@@ -133,10 +127,10 @@ class OCRFriendlyChartParser(ITJobsWatchChartParser):
         
         # Save chart area with OCR-friendly cropping
         import cv2
-        cv2.imwrite(os.path.join(debug_dir, f"{technology}_ocr_friendly_chart_area.png"), chart_area)
+        self.trace.artifact(os.path.join(debug_dir, f"{technology}_ocr_friendly_chart_area.png"), chart_area)
         
         # Save orange mask
-        cv2.imwrite(os.path.join(debug_dir, f"{technology}_ocr_friendly_orange_mask.png"), orange_mask)
+        self.trace.artifact(os.path.join(debug_dir, f"{technology}_ocr_friendly_orange_mask.png"), orange_mask)
         
         # Create a version with grid overlay for analysis
         chart_with_grid = chart_area.copy()
@@ -154,12 +148,12 @@ class OCRFriendlyChartParser(ITJobsWatchChartParser):
             if 0 <= x < chart_area.shape[1]:
                 cv2.line(chart_with_grid, (x, 0), (x, chart_area.shape[0]), (0, 255, 0), 1)
         
-        cv2.imwrite(os.path.join(debug_dir, f"{technology}_ocr_grid_overlay.png"), chart_with_grid)
+        self.trace.artifact(os.path.join(debug_dir, f"{technology}_ocr_grid_overlay.png"), chart_with_grid)
         
-        print(f"OCR-friendly debug images saved to {debug_dir}:")
-        print(f"  - {technology}_ocr_friendly_chart_area.png (preserves axis labels)")
-        print(f"  - {technology}_ocr_friendly_orange_mask.png")
-        print(f"  - {technology}_ocr_grid_overlay.png (with detected grid lines)")
+        self.trace.log(f"OCR-friendly debug images saved to {debug_dir}:", level='debug')
+        self.trace.log(f"  - {technology}_ocr_friendly_chart_area.png (preserves axis labels)", level='debug')
+        self.trace.log(f"  - {technology}_ocr_friendly_orange_mask.png", level='debug')
+        self.trace.log(f"  - {technology}_ocr_grid_overlay.png (with detected grid lines)", level='debug')
     
     def map_pixels_to_data(self, pixel_points, grid_lines, chart_area, technology):
         """Map pixels to data using preserved axis labels for coordinate reference."""
@@ -176,9 +170,9 @@ class OCRFriendlyChartParser(ITJobsWatchChartParser):
         plot_top = int(height * 0.10)    # After title
         plot_bottom = int(height * 0.85) # Before x-axis labels
         
-        print(f"Estimated plotting area within preserved chart:")
-        print(f"  Plot bounds: left={plot_left}, right={plot_right}, top={plot_top}, bottom={plot_bottom}")
-        print(f"  Plot dimensions: {plot_right-plot_left} x {plot_bottom-plot_top}")
+        self.trace.log(f"Estimated plotting area within preserved chart:", level='debug')
+        self.trace.log(f"  Plot bounds: left={plot_left}, right={plot_right}, top={plot_top}, bottom={plot_bottom}", level='debug')
+        self.trace.log(f"  Plot dimensions: {plot_right-plot_left} x {plot_bottom-plot_top}", level='debug')
         
         # Use detected horizontal grid lines for Y-axis mapping
         horizontal_lines = sorted(grid_lines.get('horizontal', []))
@@ -190,19 +184,19 @@ class OCRFriendlyChartParser(ITJobsWatchChartParser):
             if len(plot_horizontals) >= 2:
                 y_bottom = max(plot_horizontals)  # Bottom line (0%)
                 y_top = min(plot_horizontals)     # Top line (12%)
-                print(f"Using {len(plot_horizontals)} grid lines in plot area:")
-                print(f"  Bottom (0%): y={y_bottom}")
-                print(f"  Top (12%): y={y_top}")
+                self.trace.log(f"Using {len(plot_horizontals)} grid lines in plot area:", level='debug')
+                self.trace.log(f"  Bottom (0%): y={y_bottom}", level='debug')
+                self.trace.log(f"  Top (12%): y={y_top}", level='debug')
             else:
                 # Fallback to plot boundaries
                 y_bottom = plot_bottom
                 y_top = plot_top
-                print("Using plot boundaries for Y-axis mapping")
+                self.trace.log("Using plot boundaries for Y-axis mapping", level='debug')
         else:
             # Fallback to plot boundaries
             y_bottom = plot_bottom
             y_top = plot_top
-            print("No grid lines detected, using plot boundaries")
+            self.trace.log("No grid lines detected, using plot boundaries", level='debug')
         
         # Map coordinates
         data_points = []
@@ -232,6 +226,6 @@ class OCRFriendlyChartParser(ITJobsWatchChartParser):
                       if year_range[0] <= year <= year_range[1]]
         data_points.sort(key=lambda p: p[0])
         
-        print(f"Mapped {len(data_points)} points using OCR-friendly coordinates")
+        self.trace.log(f"Mapped {len(data_points)} points using OCR-friendly coordinates", level='debug')
         
         return data_points
\ No newline at end of file
@@ -15,12 +15,39 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 from ocr_friendly_chart_parser import OCRFriendlyChartParser
 
 
+def run_length_profile(mask, axis):
+    """Count run-length segments and total run length of every row (axis=1) or column (axis=0)."""
+    # A segment starts at each rising edge of the mask, padded with a leading False
+    mask = np.asarray(mask, dtype=np.int8)
+    padding = [(0, 0), (0, 0)]
+    padding[axis] = (1, 0)
+    rising_edges = np.diff(np.pad(mask, padding), axis=axis) == 1
+    return rising_edges.sum(axis=axis), mask.sum(axis=axis, dtype=np.int64)
+
+
+def strong_edge_mask(gray, dx, dy, percentile=95):
+    """Pixels whose absolute 3x3 Sobel response is above the given percentile."""
+    # Sobel responses of an 8-bit image are exact integers (|value| <= 1020),
+    # so the percentile can be read off a histogram instead of sorting floats
+    edges = np.abs(cv2.Sobel(gray, cv2.CV_16S, dx, dy, ksize=3))
+    cumulative = np.cumsum(np.bincount(edges.ravel()))
+    
+    # Same linear interpolation between order statistics as np.percentile
+    position = percentile / 100 * (edges.size - 1)
+    below = int(position)
+    lower = np.searchsorted(cumulative, below, side='right')
+    upper = np.searchsorted(cumulative, min(below + 1, edges.size - 1), side='right')
+    threshold = lower + (upper - lower) * (position - below)
+    
+    return edges > threshold
+
+
 class StructureBasedChartParser(OCRFriendlyChartParser):
     """Chart parser that detects grid lines by geometric structure rather than color."""
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        print("Structure-based chart parser initialized (detects lines by geometry)")
+        self.trace.log("Structure-based chart parser initialized (detects lines by geometry)", level='debug')
     
     def detect_horizontal_lines(self, chart_area):
         """Detect horizontal lines by analyzing image structure."""
@@ -33,46 +60,18 @@ class StructureBasedChartParser(OCRFriendlyChartParser):
         height, width = gray.shape
         
         # Use edge detection to find horizontal structures
-        # Apply horizontal Sobel filter to detect horizontal edges
-        sobel_horizontal = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
-        sobel_horizontal = np.abs(sobel_horizontal)
-        
-        # Find strong horizontal edges
-        threshold = np.percentile(sobel_horizontal, 95)  # Top 5% of edge strengths
-        strong_edges = sobel_horizontal > threshold
+        # Strong horizontal edges: top 5% of horizontal Sobel edge strengths
+        strong_edges = strong_edge_mask(gray, 0, 1)
         
-        # Analyze each row for horizontal line characteristics
-        horizontal_lines = []
+        # Analyze every row at once for horizontal line characteristics
         min_line_length = width * 0.4  # Line must span at least 40% of width
+        segment_counts, total_line_lengths = run_length_profile(strong_edges, axis=1)
         
-        for y in range(height):
-            row_edges = strong_edges[y, :]
-            
-            # Count connected horizontal segments
-            segments = []
-            current_segment = 0
-            
-            for x in range(width):
-                if row_edges[x]:
-                    current_segment += 1
-                else:
-                    if current_segment > 0:
-                        segments.append(current_segment)
-                        current_segment = 0
-            
-            # Add final segment if it extends to the end
-            if current_segment > 0:
-                segments.append(current_segment)
-            
-            # Check if this row has horizontal line characteristics
-            total_line_length = sum(segments)
-            
-            if total_line_length > min_line_length:
-                # Additional check: ensure the line isn't too broken up
-                if len(segments) <= 5:  # Not too many gaps
-                    horizontal_lines.append(y)
+        # Long enough, and not too broken up (at most 5 segments)
+        is_line = (total_line_lengths > min_line_length) & (segment_counts <= 5)
+        horizontal_lines = np.flatnonzero(is_line).tolist()
         
-        print(f"Structure-based horizontal line detection: {len(horizontal_lines)} candidates")
+        self.trace.log(f"Structure-based horizontal line detection: {len(horizontal_lines)} candidates", level='debug')
         
         return horizontal_lines
     
@@ -87,46 +86,18 @@ class StructureBasedChartParser(OCRFriendlyChartParser):
         height, width = gray.shape
         
         # Use edge detection to find vertical structures
-        # Apply vertical Sobel filter to detect vertical edges
-        sobel_vertical = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
-        sobel_vertical = np.abs(sobel_vertical)
-        
-        # Find strong vertical edges
-        threshold = np.percentile(sobel_vertical, 95)  # Top 5% of edge strengths
-        strong_edges = sobel_vertical > threshold
+        # Strong vertical edges: top 5% of vertical Sobel edge strengths
+        strong_edges = strong_edge_mask(gray, 1, 0)
         
-        # Analyze each column for vertical line characteristics
-        vertical_lines = []
+        # Analyze every column at once for vertical line characteristics
         min_line_length = height * 0.3  # Line must span at least 30% of height
+        segment_counts, total_line_lengths = run_length_profile(strong_edges, axis=0)
         
-        for x in range(width):
-            col_edges = strong_edges[:, x]
-            
-            # Count connected vertical segments
-            segments = []
-            current_segment = 0
-            
-            for y in range(height):
-                if col_edges[y]:
-                    current_segment += 1
-                else:
-                    if current_segment > 0:
-                        segments.append(current_segment)
-                        current_segment = 0
-            
-            # Add final segment if it extends to the end
-            if current_segment > 0:
-                segments.append(current_segment)
-            
-            # Check if this column has vertical line characteristics
-            total_line_length = sum(segments)
-            
-            if total_line_length > min_line_length:
-                # Additional check: ensure the line isn't too broken up
-                if len(segments) <= 5:  # Not too many gaps
-                    vertical_lines.append(x)
+        # Long enough, and not too broken up (at most 5 segments)
+        is_line = (total_line_lengths > min_line_length) & (segment_counts <= 5)
+        vertical_lines = np.flatnonzero(is_line).tolist()
         
-        print(f"Structure-based vertical line detection: {len(vertical_lines)} candidates")
+        self.trace.log(f"Structure-based vertical line detection: {len(vertical_lines)} candidates", level='debug')
         
         return vertical_lines
     
@@ -183,14 +154,18 @@ class StructureBasedChartParser(OCRFriendlyChartParser):
             
             vertical_lines = chart_verticals
         
-        print(f"Filtered grid lines:")
-        print(f"  Horizontal: {len(horizontal_lines)} lines (target: ~12 for 0-12%)")
-        print(f"  Vertical: {len(vertical_lines)} lines")
+        self.trace.log(f"Filtered grid lines:", level='debug')
+        self.trace.log(f"  Horizontal: {len(horizontal_lines)} lines (target: ~12 for 0-12%)", level='debug')
+        self.trace.log(f"  Vertical: {len(vertical_lines)} lines", level='debug')
         
         return horizontal_lines, vertical_lines
     
     def detect_grid_lines(self, chart_area):
-        """Detect grid lines using structure-based approach."""
+        """Detect grid lines using structure-based approach (cached per chart area)."""
+        return self.cached_grid_lines(chart_area, 'structure', self._detect_structure_grid_lines)
+    
+    def _detect_structure_grid_lines(self, chart_area):
+        """Detect lines by their edge structure and filter them to the chart grid."""
         # Detect lines by geometric structure
         horizontal_lines = self.detect_horizontal_lines(chart_area)
         vertical_lines = self.detect_vertical_lines(chart_area)
@@ -219,8 +194,8 @@ class StructureBasedChartParser(OCRFriendlyChartParser):
         os.makedirs(data_dir, exist_ok=True)
         
         # Save basic images
-        cv2.imwrite(os.path.join(masks_dir, f"{technology}_chart_area.png"), chart_area)
-        cv2.imwrite(os.path.join(masks_dir, f"{technology}_orange_mask.png"), orange_mask)
+        self.trace.artifact(os.path.join(masks_dir, f"{technology}_chart_area.png"), chart_area)
+        self.trace.artifact(os.path.join(masks_dir, f"{technology}_orange_mask.png"), orange_mask)
         
         # Create structure analysis images
         gray = cv2.cvtColor(chart_area, cv2.COLOR_BGR2GRAY) if len(chart_area.shape) == 3 else chart_area
@@ -228,12 +203,12 @@ class StructureBasedChartParser(OCRFriendlyChartParser):
         # Horizontal edge detection
         sobel_h = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
         sobel_h_normalized = cv2.normalize(np.abs(sobel_h), None, 0, 255, cv2.NORM_MINMAX, dtype=cv2.CV_8U)
-        cv2.imwrite(os.path.join(masks_dir, f"{technology}_horizontal_edges.png"), sobel_h_normalized)
+        self.trace.artifact(os.path.join(masks_dir, f"{technology}_horizontal_edges.png"), sobel_h_normalized)
         
         # Vertical edge detection
         sobel_v = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3) 
         sobel_v_normalized = cv2.normalize(np.abs(sobel_v), None, 0, 255, cv2.NORM_MINMAX, dtype=cv2.CV_8U)
-        cv2.imwrite(os.path.join(masks_dir, f"{technology}_vertical_edges.png"), sobel_v_normalized)
+        self.trace.artifact(os.path.join(masks_dir, f"{technology}_vertical_edges.png"), sobel_v_normalized)
         
         # Create overlay with detected grid lines
         overlay = chart_area.copy()
@@ -252,18 +227,18 @@ class StructureBasedChartParser(OCRFriendlyChartParser):
         # Overlay orange line in green
         overlay[orange_mask > 0] = [0, 255, 0]
         
-        cv2.imwrite(os.path.join(debug_root, f"{technology}_structure_overlay.png"), overlay)
-        
-        print(f"Structure-based debug output saved:")
-        print(f"  debug/masks/:")
-        print(f"    - {technology}_chart_area.png")
-        print(f"    - {technology}_orange_mask.png")
-        print(f"    - {technology}_horizontal_edges.png (edge detection)")
-        print(f"    - {technology}_vertical_edges.png (edge detection)")
-        print(f"  debug/:")
-        print(f"    - {technology}_structure_overlay.png (detected grid lines)")
-        print(f"  debug/data/:")
-        print(f"    - (JSON files will be saved here by test script)")
+        self.trace.artifact(os.path.join(debug_root, f"{technology}_structure_overlay.png"), overlay)
+        
+        self.trace.log(f"Structure-based debug output saved:", level='debug')
+        self.trace.log(f"  debug/masks/:", level='debug')
+        self.trace.log(f"    - {technology}_chart_area.png", level='debug')
+        self.trace.log(f"    - {technology}_orange_mask.png", level='debug')
+        self.trace.log(f"    - {technology}_horizontal_edges.png (edge detection)", level='debug')
+        self.trace.log(f"    - {technology}_vertical_edges.png (edge detection)", level='debug')
+        self.trace.log(f"  debug/:", level='debug')
+        self.trace.log(f"    - {technology}_structure_overlay.png (detected grid lines)", level='debug')
+        self.trace.log(f"  debug/data/:", level='debug')
+        self.trace.log(f"    - (JSON files will be saved here by test script)", level='debug')
         
         return {
             'masks_dir': masks_dir,
@@ -0,0 +1,510 @@
+"""Axis scale recovery from the tick labels printed on ITJobsWatch charts.
+
+Each horizontal gridline carries a label such as '12.0%' on the right-hand
+axis, and the labels form an arithmetic progression ('0%', '2.0%', '4.0%',
+...). The x-axis labels below the tick marks are years ('2005', '2007',
+...), each centred on the tick at the start of its year. Labels are cut
+into glyphs by column projection and each glyph is matched against
+templates of the characters 0-9, '.' and '%'.
+
+Templates start as glyphs rendered from Pillow's bundled font. The first
+charts are read by choosing the progression whose label strings best fit
+those seed glyphs; the chart's own glyphs then replace the seeds and are
+stored in a JSON file, so later charts are read by direct template matching
+and only fall back to the progression search when a glyph does not match.
+"""
+
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+
+AXIS_GLYPHS_FILENAME = "axis_glyphs.json"
+AXIS_GLYPHS_VERSION = 1
+
+GLYPH_CHARACTERS = '0123456789.%'
+GLYPH_SIZE = (12, 18)      # Template width, height after normalization
+LABEL_MIN_INK = 95         # Label text is dark grey/black (ink = 255 - gray)
+
+# Matching thresholds (mean absolute difference plus aspect ratio difference)
+GLYPH_MATCH_DISTANCE = 0.1     # Learned template match for direct reading
+GLYPH_VARIANT_DISTANCE = 0.03  # Glyphs further than this from every variant are stored
+SEED_MAX_MEAN_DISTANCE = 0.4   # Mean distance for accepting a progression search
+
+# Labels sit at fractional pixel offsets, so each character keeps a few variants
+MAX_GLYPH_VARIANTS = 8
+
+# Progression steps considered when searching label values (percent)
+LABEL_STEPS = (0.1, 0.2, 0.25, 0.5, 1.0, 2.0, 2.5, 5.0, 10.0, 20.0, 25.0, 50.0)
+MAX_LABEL_VALUE = 100.0
+
+# Year progressions considered when searching x-axis label values
+YEAR_LABEL_STEPS = (1, 2, 5, 10)
+YEAR_LABEL_RANGE = (1990, 2040)
+
+# A label centre within this many pixels of a gridline (or tick) is anchored on it
+LABEL_GRIDLINE_TOLERANCE = 4
+
+
+def format_label(value: float) -> str:
+    """Axis label text for a value, e.g. '0%' or '12.0%'."""
+    if abs(value) < 1e-9:
+        return '0%'
+    return f"{value:.1f}%"
+
+
+def parse_label(text: str) -> Optional[float]:
+    """Value of an axis label ('12.0%' -> 12.0), or None if it is not a label."""
+    if not text.endswith('%'):
+        return None
+    try:
+        return float(text[:-1])
+    except ValueError:
+        return None
+
+
+def parse_year_label(text: str) -> Optional[float]:
+    """Value of an x-axis label ('2005' -> 2005.0), or None if it is not a year."""
+    if len(text) != 4 or not text.isdigit():
+        return None
+    return float(text)
+
+
+def is_progression(values: List[float], increasing: bool = False) -> bool:
+    """Check that label values change in equal steps.
+    
+    Args:
+        values: Label values in axis order
+        increasing: Expect increasing values (x-axis, left to right) instead
+            of decreasing ones (y-axis, top to bottom)
+    """
+    if len(values) < 2:
+        return False
+    steps = np.diff(values)
+    return bool((steps[0] > 0 if increasing else steps[0] < 0) and np.allclose(steps, steps[0], atol=1e-6))
+
+
+def _crop_ink(ink: np.ndarray) -> np.ndarray:
+    """Crop an ink image to the bounding box of its label pixels."""
+    text = ink > LABEL_MIN_INK
+    rows = np.flatnonzero(text.any(axis=1))
+    columns = np.flatnonzero(text.any(axis=0))
+    return ink[rows[0]:rows[-1] + 1, columns[0]:columns[-1] + 1]
+
+
+def _runs(indices: np.ndarray) -> List[np.ndarray]:
+    """Split sorted indices into runs of consecutive values."""
+    if indices.size == 0:
+        return []
+    return np.split(indices, np.flatnonzero(np.diff(indices) > 1) + 1)
+
+
+def glyph_features(crop: np.ndarray) -> Dict:
+    """Size-normalized glyph image and aspect ratio of an ink crop."""
+    height, width = crop.shape
+    return {
+        'aspect': width / height,
+        'pixels': cv2.resize(crop.astype(np.float32) / 255, GLYPH_SIZE, interpolation=cv2.INTER_AREA)
+    }
+
+
+def glyph_distance(glyph: Dict, template: Dict) -> float:
+    """Dissimilarity of a glyph and a template (0 for identical glyphs)."""
+    return float(np.abs(glyph['pixels'] - template['pixels']).mean() + abs(glyph['aspect'] - template['aspect']))
+
+
+def find_axis_labels(image: np.ndarray, measurement: Dict) -> List[Dict]:
+    """Locate the y-axis labels right of the plot and cut them into glyphs.
+    
+    Args:
+        image: Full chart image (BGR)
+        measurement: Chart measurement with 'plot_box' (see chart_calibration.measure_chart)
+        
+    Returns:
+        Labels from top to bottom, each with its centre 'y' and 'glyphs' features
+    """
+    box = measurement['plot_box']
+    strip = image[:box['bottom'], box['right'] + 1:]
+    gray = strip[..., 1] if strip.ndim == 3 else strip
+    ink = 255 - gray.astype(np.int16)
+    
+    labels = []
+    for rows in _runs(np.flatnonzero((ink > LABEL_MIN_INK).any(axis=1))):
+        band = ink[rows[0]:rows[-1] + 1]
+        columns = np.flatnonzero((band > LABEL_MIN_INK).any(axis=0))
+        labels.append({
+            'y': (rows[0] + rows[-1]) / 2,
+            'glyphs': [glyph_features(_crop_ink(band[:, run[0]:run[-1] + 1])) for run in _runs(columns)]
+        })
+    return labels
+
+
+def find_x_axis_labels(image: np.ndarray, measurement: Dict) -> List[Dict]:
+    """Locate the x-axis labels below the tick marks and cut them into glyphs.
+    
+    Args:
+        image: Full chart image (BGR)
+        measurement: Chart measurement with 'plot_box' (see chart_calibration.measure_chart)
+        
+    Returns:
+        Labels from left to right, each with its centre 'x' and 'glyphs' features
+    """
+    box = measurement['plot_box']
+    strip = image[box['bottom'] + 1:, box['left']:]
+    gray = strip[..., 1] if strip.ndim == 3 else strip
+    ink = 255 - gray.astype(np.int16)
+    
+    # The first text band below the tick marks (which start right under the axis)
+    bands = [rows for rows in _runs(np.flatnonzero((ink > LABEL_MIN_INK).any(axis=1))) if rows[0] > 0]
+    if not bands:
+        return []
+    band = ink[bands[0][0]:bands[0][-1] + 1]
+    
+    # Glyphs closer than half the text height belong to the same label
+    labels = []
+    for run in _runs(np.flatnonzero((band > LABEL_MIN_INK).any(axis=0))):
+        if labels and run[0] - labels[-1][-1][-1] <= band.shape[0] / 2:
+            labels[-1].append(run)
+        else:
+            labels.append([run])
+    
+    return [
+        {
+            'x': (runs[0][0] + runs[-1][-1]) / 2 + box['left'],
+            'glyphs': [glyph_features(_crop_ink(band[:, run[0]:run[-1] + 1])) for run in runs]
+        }
+        for runs in labels
+    ]
+
+
+def render_seed_templates() -> Dict[str, List[Dict]]:
+    """Glyph templates rendered from Pillow's bundled font.
+    
+    The chart font differs from the bundled one, so seeds only rank candidate
+    readings; they are replaced by glyphs learned from the charts.
+    """
+    try:
+        font = ImageFont.load_default(size=24)
+    except TypeError:
+        # Pillow < 10.1 only has the small bitmap font
+        font = ImageFont.load_default()
+    
+    templates = {}
+    for character in GLYPH_CHARACTERS:
+        canvas = Image.new('L', (48, 48), 0)
+        ImageDraw.Draw(canvas).text((8, 8), character, fill=255, font=font)
+        templates[character] = [glyph_features(_crop_ink(np.array(canvas, dtype=np.int16)))]
+    return templates
+
+
+def nearest_variant(glyph: Dict, variants: List[Dict]) -> float:
+    """Distance from a glyph to the closest of a character's template variants."""
+    return min(glyph_distance(glyph, variant) for variant in variants)
+
+
+def character_distances(labels: List[Dict], templates: Dict[str, List[Dict]]) -> Tuple[str, np.ndarray]:
+    """Distance from every glyph of every label to every character.
+    
+    Args:
+        labels: Labels from find_axis_labels
+        templates: Template variants by character
+        
+    Returns:
+        (characters, matrix with one row per glyph in label order and one
+        column per character, holding the distance to its closest variant)
+    """
+    characters = ''.join(sorted(templates))
+    glyphs = [glyph for label in labels for glyph in label['glyphs']]
+    pixels = np.array([glyph['pixels'].ravel() for glyph in glyphs])
+    aspects = np.array([glyph['aspect'] for glyph in glyphs])
+    
+    distances = np.full((len(glyphs), len(characters)), np.inf)
+    for column, character in enumerate(characters):
+        for variant in templates[character]:
+            distance = np.abs(pixels - variant['pixels'].ravel()).mean(axis=1) + np.abs(aspects - variant['aspect'])
+            np.minimum(distances[:, column], distance, out=distances[:, column])
+    return characters, distances
+
+
+def read_labels(labels: List[Dict], templates: Dict[str, List[Dict]]) -> Optional[List[str]]:
+    """Read labels by nearest template, if every glyph matches one closely.
+    
+    Args:
+        labels: Labels from find_axis_labels
+        templates: Learned template variants by character
+        
+    Returns:
+        Label texts from top to bottom, or None if a glyph has no close match
+    """
+    if not templates:
+        return None
+    
+    characters, distances = character_distances(labels, templates)
+    if distances.min(axis=1).max() > GLYPH_MATCH_DISTANCE:
+        return None
+    
+    # Split the per-glyph characters back into labels
+    text = ''.join(characters[i] for i in distances.argmin(axis=1))
+    ends = np.cumsum([len(label['glyphs']) for label in labels])
+    return [text[end - len(label['glyphs']):end] for label, end in zip(labels, ends)]
+
+
+def solve_labels(labels: List[Dict], templates: Dict[str, List[Dict]]) -> Optional[Tuple[List[str], float]]:
+    """Find the label progression whose texts best fit the glyph templates.
+    
+    Every progression start * step + k * step (k counting up from the bottom
+    label) with label texts of the right lengths is scored by the summed
+    distance of each glyph to the template of its character.
+    
+    Args:
+        labels: Labels from find_axis_labels
+        templates: Template variants for every character in GLYPH_CHARACTERS
+        
+    Returns:
+        (label texts from top to bottom, mean glyph distance), or None if no
+        progression fits the label lengths
+    """
+    # Distance rows of each label's glyphs, bottom label first
+    characters, distances = character_distances(labels, templates)
+    columns = {character: column for column, character in enumerate(characters)}
+    ends = np.cumsum([len(label['glyphs']) for label in labels])
+    label_distances = [distances[end - len(label['glyphs']):end] for label, end in zip(labels, ends)][::-1]
+    lengths = [len(rows) for rows in label_distances]
+    glyph_count = sum(lengths)
+    
+    best = None
+    for step in LABEL_STEPS:
+        for start in range(int(MAX_LABEL_VALUE / step) + 1):
+            texts = []
+            for k, length in enumerate(lengths):
+                text = format_label((start + k) * step)
+                if len(text) != length:
+                    break
+                texts.append(text)
+            else:
+                cost = sum(rows[i, columns[character]] for rows, text in zip(label_distances, texts)
+                           for i, character in enumerate(text))
+                if best is None or cost < best[0]:
+                    best = (cost, texts[::-1])
+    
+    if best is None:
+        return None
+    return best[1], best[0] / glyph_count
+
+
+def solve_year_labels(labels: List[Dict], templates: Dict[str, List[Dict]]) -> Optional[Tuple[List[str], float]]:
+    """Find the year progression whose texts best fit the glyph templates.
+    
+    Args:
+        labels: Labels from find_x_axis_labels
+        templates: Template variants for every character in GLYPH_CHARACTERS
+        
+    Returns:
+        (label texts from left to right, mean glyph distance), or None if the
+        labels are not all four glyphs long
+    """
+    if any(len(label['glyphs']) != 4 for label in labels):
+        return None
+    
+    characters, distances = character_distances(labels, templates)
+    columns = {character: column for column, character in enumerate(characters)}
+    label_distances = distances.reshape(len(labels), 4, len(characters))
+    
+    best = None
+    for step in YEAR_LABEL_STEPS:
+        for start in range(YEAR_LABEL_RANGE[0], YEAR_LABEL_RANGE[1] + 1):
+            texts = [str(start + k * step) for k in range(len(labels))]
+            cost = sum(rows[i, columns[character]] for rows, text in zip(label_distances, texts)
+                       for i, character in enumerate(text))
+            if best is None or cost < best[0]:
+                best = (cost, texts)
+    
+    return best[1], best[0] / (4 * len(labels))
+
+
+def fit_scale(centers: List[float], values: List[float], gridlines: List[float]) -> Dict[str, float]:
+    """Linear map from image position (row or column) to value through the label positions.
+    
+    Args:
+        centers: Label centre positions
+        values: Label values
+        gridlines: Gridline rows (or tick columns); a label close to one is placed on it
+        
+    Returns:
+        Dictionary with 'slope' and 'intercept' (value = intercept + slope * position)
+    """
+    rows = []
+    for center in centers:
+        nearest = min(gridlines, key=lambda y: abs(y - center), default=None)
+        if nearest is not None and abs(nearest - center) <= LABEL_GRIDLINE_TOLERANCE:
+            rows.append(nearest)
+        else:
+            rows.append(center)
+    
+    slope, intercept = np.polyfit(rows, values, 1)
+    return {'slope': float(slope), 'intercept': float(intercept)}
+
+
+class AxisGlyphTemplates:
+    """Glyph templates for axis labels, learned from charts and kept in a JSON file."""
+    
+    def __init__(self, path: str):
+        """Open a template file (created once a chart has been read).
+        
+        Args:
+            path: Template JSON path
+        """
+        self.path = path
+        self.seeds = render_seed_templates()
+        self.templates = self._read()
+        self.stats = {'matched': 0, 'solved': 0, 'failed': 0}
+    
+    def _read(self) -> Dict[str, List[Dict]]:
+        """Load templates written by this or another process."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        
+        if data.get('version') != AXIS_GLYPHS_VERSION or data.get('glyph_size') != list(GLYPH_SIZE):
+            return {}
+        
+        width, height = GLYPH_SIZE
+        return {
+            character: [
+                {
+                    'aspect': variant['aspect'],
+                    'pixels': np.array(variant['pixels'], dtype=np.float32).reshape(height, width) / 255
+                }
+                for variant in variants
+            ]
+            for character, variants in data['templates'].items()
+        }
+    
+    def _save(self) -> None:
+        """Merge with templates other processes saved, then replace the file atomically."""
+        merged = self._read()
+        for character, variants in self.templates.items():
+            stored = merged.setdefault(character, [])
+            for variant in variants:
+                if len(stored) < MAX_GLYPH_VARIANTS and (
+                        not stored or nearest_variant(variant, stored) > GLYPH_VARIANT_DISTANCE):
+                    stored.append(variant)
+        self.templates = merged
+        
+        data = {
+            'version': AXIS_GLYPHS_VERSION,
+            'glyph_size': list(GLYPH_SIZE),
+            'updated_at': time.time(),
+            'templates': {
+                character: [
+                    {
+                        'aspect': round(variant['aspect'], 4),
+                        'pixels': np.round(variant['pixels'] * 255).astype(int).ravel().tolist()
+                    }
+                    for variant in variants
+                ]
+                for character, variants in sorted(merged.items())
+            }
+        }
+        
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+    
+    def _learn(self, labels: List[Dict], texts: List[str]) -> None:
+        """Store glyphs of a verified reading that no template variant matches closely."""
+        learned = False
+        for label, text in zip(labels, texts):
+            for glyph, character in zip(label['glyphs'], text):
+                variants = self.templates.setdefault(character, [])
+                if len(variants) < MAX_GLYPH_VARIANTS and (
+                        not variants or nearest_variant(glyph, variants) > GLYPH_VARIANT_DISTANCE):
+                    variants.append(glyph)
+                    learned = True
+        
+        if learned:
+            self._save()
+    
+    def read_scale(self, image: np.ndarray, measurement: Dict) -> Optional[Dict]:
+        """Read a chart's y-axis labels and fit its value scale.
+        
+        Args:
+            image: Full chart image (BGR)
+            measurement: Chart measurement with 'plot_box' and 'horizontal_gridlines'
+            
+        Returns:
+            Dictionary with 'labels' (text per label, top to bottom), 'min' and
+            'max' label values, and 'slope'/'intercept' in image rows; None if
+            the labels could not be read
+        """
+        labels = find_axis_labels(image, measurement)
+        if len(labels) < 2:
+            self.stats['failed'] += 1
+            return None
+        
+        texts = read_labels(labels, self.templates)
+        values = [parse_label(text) for text in texts] if texts else []
+        if texts and None not in values and is_progression(values):
+            self.stats['matched'] += 1
+            self._learn(labels, texts)
+        else:
+            solved = solve_labels(labels, {**self.seeds, **self.templates})
+            if solved is None or solved[1] > SEED_MAX_MEAN_DISTANCE:
+                self.stats['failed'] += 1
+                return None
+            
+            texts = solved[0]
+            values = [parse_label(text) for text in texts]
+            self.stats['solved'] += 1
+            self._learn(labels, texts)
+        
+        scale = fit_scale([label['y'] for label in labels], values, measurement['horizontal_gridlines'])
+        return {'labels': texts, 'min': min(values), 'max': max(values), **scale}
+    
+    def read_time_scale(self, image: np.ndarray, measurement: Dict) -> Optional[Dict]:
+        """Read a chart's x-axis year labels and fit its time scale.
+        
+        Args:
+            image: Full chart image (BGR)
+            measurement: Chart measurement with 'plot_box' and 'x_ticks'
+            
+        Returns:
+            Dictionary with 'labels' (text per label, left to right), 'min' and
+            'max' label years, and 'slope'/'intercept' in image columns (year
+            = intercept + slope * x, whole years at the labelled ticks); None
+            if the labels could not be read
+        """
+        labels = find_x_axis_labels(image, measurement)
+        if len(labels) < 2:
+            self.stats['failed'] += 1
+            return None
+        
+        texts = read_labels(labels, self.templates)
+        values = [parse_year_label(text) for text in texts] if texts else []
+        if texts and None not in values and is_progression(values, increasing=True):
+            self.stats['matched'] += 1
+            self._learn(labels, texts)
+        else:
+            solved = solve_year_labels(labels, {**self.seeds, **self.templates})
+            if solved is None or solved[1] > SEED_MAX_MEAN_DISTANCE:
+                self.stats['failed'] += 1
+                return None
+            
+            texts = solved[0]
+            values = [parse_year_label(text) for text in texts]
+            self.stats['solved'] += 1
+            self._learn(labels, texts)
+        
+        scale = fit_scale([label['x'] for label in labels], values, measurement['x_ticks'])
+        return {'labels': texts, 'min': min(values), 'max': max(values), **scale}
@@ -0,0 +1,263 @@
+"""Parse every downloaded ITJobsWatch chart in parallel into one tidy dataset."""
+
+import argparse
+import contextlib
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+# Allow running as a plain script from any directory
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+sys.path.insert(1, os.path.join(SCRIPTS_DIR, 'scraping'))
+
+from chart_parser import SERIES_RESOLUTIONS, ITJobsWatchChartParser
+from chart_trace import TRACE_LEVELS
+from config import CHART_TYPES, LOCATIONS, MANIFEST_FILENAME, OUTPUT_DIR
+from manifest import ChartManifest
+
+
+# Columns of the tidy output, one row per (chart, series, year)
+OUTPUT_COLUMNS = ['skill', 'location', 'chart_type', 'job_type', 'period', 'series', 'year', 'value']
+
+# Full location for each chart directory prefix (the scraper keeps only the last path part)
+LOCATIONS_BY_SHORT_NAME = {location.split('/')[-1]: location for location in LOCATIONS}
+
+# Parser instance for each worker process (created once by _init_worker)
+_worker_parser: Optional[ITJobsWatchChartParser] = None
+
+
+def discover_charts(charts_dir: str) -> List[Dict[str, str]]:
+    """Find every chart to parse, preferring the scraper's manifest.
+    
+    Falls back to walking the scraper layout ({location}-{chart_type}/charts/
+    {skill}_{job_type}_{period}.webp) and finally to flat {skill}.webp files.
+    Locations are reported in full (e.g. 'uk/england/london') either way;
+    directory prefixes not in config.LOCATIONS are kept as they are.
+    
+    Args:
+        charts_dir: Scraper output directory
+    
+    Returns:
+        List of chart descriptions with 'path', 'skill', 'location',
+        'chart_type', 'job_type' and 'period'
+    """
+    if os.path.exists(os.path.join(charts_dir, MANIFEST_FILENAME)):
+        manifest = ChartManifest(charts_dir)
+        return [
+            {
+                'path': os.path.join(charts_dir, entry['path']),
+                'skill': entry['skill'],
+                'location': entry['location'],
+                'chart_type': entry['chart_type'],
+                'job_type': entry['job_type'],
+                'period': entry['time_period']
+            }
+            for entry in manifest
+        ]
+    
+    charts = []
+    for path in sorted(glob.glob(os.path.join(charts_dir, '*', 'charts', '*.webp'))):
+        chart_dir = os.path.basename(os.path.dirname(os.path.dirname(path)))
+        chart_type = next((ct for ct in CHART_TYPES if chart_dir.endswith(f"-{ct}")), '')
+        location = chart_dir[:-len(chart_type) - 1] if chart_type else chart_dir
+        location = LOCATIONS_BY_SHORT_NAME.get(location, location)
+        
+        stem = os.path.splitext(os.path.basename(path))[0]
+        skill, _, rest = stem.partition('_')
+        job_type, _, period = rest.partition('_')
+        
+        charts.append({
+            'path': path, 'skill': skill, 'location': location,
+            'chart_type': chart_type, 'job_type': job_type, 'period': period
+        })
+    
+    if not charts:
+        # Flat layout: one chart per skill with no other dimensions
+        for path in sorted(glob.glob(os.path.join(charts_dir, '*.webp'))):
+            charts.append({
+                'path': path, 'skill': os.path.splitext(os.path.basename(path))[0],
+                'location': '', 'chart_type': '', 'job_type': '', 'period': ''
+            })
+    
+    return charts
+
+
+def _init_worker(converted_dir: str, trace_level: str = 'off', trace_sample_rate: float = 1.0,
+                 save_debug: bool = False) -> None:
+    """Create the worker process's parser (quiet and without debug images by default)."""
+    global _worker_parser
+    _worker_parser = ITJobsWatchChartParser(converted_dir=converted_dir, save_debug=save_debug,
+                                            trace_level=trace_level, trace_sample_rate=trace_sample_rate)
+
+
+def parse_chart(chart: Dict[str, str], resolution: Optional[str] = None) -> Dict:
+    """Parse every series of one chart in a worker process.
+    
+    Args:
+        chart: Chart description from discover_charts
+        resolution: None for yearly averages, else a key of SERIES_RESOLUTIONS
+            for a fractional-year series
+    
+    Returns:
+        Dictionary with the chart, its tidy rows, elapsed seconds and any error
+    """
+    started = time.perf_counter()
+    try:
+        image = _worker_parser.load_chart_file(chart['path'])
+        if image is None:
+            raise ValueError(f"could not decode {chart['path']}")
+        series_data = _worker_parser.extract_all_series(
+            image, chart['skill'], chart_type=chart['chart_type'], time_period=chart['period'],
+            resolution=resolution
+        )
+        
+        # Worker processes exit without waiting for background writes
+        _worker_parser.trace.flush()
+        
+        rows = [
+            {**{key: chart[key] for key in OUTPUT_COLUMNS[:5]},
+             'series': _worker_parser.series_labels.get(series, series),
+             'year': round(year, 4), 'value': round(value, 4)}
+            for series, data in series_data.items()
+            for year, value in data
+        ]
+        error = None if rows else 'no data extracted'
+    except Exception as e:
+        rows, error = [], str(e)
+    
+    return {
+        'chart': chart,
+        'rows': rows,
+        'seconds': time.perf_counter() - started,
+        'error': error
+    }
+
+
+def parse_all_charts(charts: List[Dict[str, str]], output_path: str,
+                     workers: Optional[int] = None,
+                     converted_dir: str = "views/charts/scraped/converted",
+                     resolution: Optional[str] = None, trace_level: str = 'off',
+                     trace_sample_rate: float = 1.0, save_debug: bool = False) -> Dict:
+    """Parse charts across CPU cores and stream the results to a tidy file.
+    
+    CSV rows are written as each chart finishes; Parquet output (requires
+    pandas with pyarrow or fastparquet) is written once at the end.
+    
+    Args:
+        charts: Chart descriptions from discover_charts
+        output_path: Output file (.csv or .parquet)
+        workers: Worker processes (default: CPU count)
+        converted_dir: Converted/debug directory for the parsers
+        resolution: Time resolution passed to parse_chart (default: yearly averages)
+        trace_level: Parser output verbosity in the workers (default: silent)
+        trace_sample_rate: Fraction of charts traced in full (and given debug images)
+        save_debug: Write debug images for the traced charts
+    
+    Returns:
+        Run report with per-chart timings and failures
+    """
+    parquet = output_path.endswith('.parquet')
+    collected = []
+    timings = []
+    failures = []
+    total_rows = 0
+    
+    started = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        writer = None
+        if not parquet:
+            f = stack.enter_context(open(output_path, 'w', newline='', encoding='utf-8'))
+            writer = csv.DictWriter(f, fieldnames=OUTPUT_COLUMNS)
+            writer.writeheader()
+        
+        executor = stack.enter_context(ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(converted_dir, trace_level, trace_sample_rate, save_debug)
+        ))
+        futures = [executor.submit(parse_chart, chart, resolution) for chart in charts]
+        
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            chart = result['chart']
+            
+            timings.append({'path': chart['path'], 'seconds': round(result['seconds'], 4),
+                            'rows': len(result['rows'])})
+            if result['error']:
+                failures.append({'path': chart['path'], 'error': result['error']})
+            
+            if writer:
+                writer.writerows(result['rows'])
+            else:
+                collected.extend(result['rows'])
+            total_rows += len(result['rows'])
+            
+            if done % 100 == 0 or done == len(futures):
+                print(f"Parsed {done}/{len(futures)} charts ({len(failures)} failed)")
+    
+    if parquet:
+        import pandas as pd
+        pd.DataFrame(collected, columns=OUTPUT_COLUMNS).to_parquet(output_path, index=False)
+    
+    seconds = [t['seconds'] for t in timings]
+    return {
+        'charts': len(charts),
+        'rows': total_rows,
+        'failed': len(failures),
+        'workers': workers or os.cpu_count(),
+        'wall_clock_seconds': round(time.perf_counter() - started, 3),
+        'mean_seconds_per_chart': round(sum(seconds) / len(seconds), 4) if seconds else 0.0,
+        'failures': failures,
+        'timings': timings
+    }
+
+
+def main():
+    """Parse every chart in the scraper output and write a tidy dataset."""
+    parser = argparse.ArgumentParser(description='Parse all downloaded ITJobsWatch charts in parallel')
+    parser.add_argument('--charts-dir', default=OUTPUT_DIR,
+                        help='Scraper output directory (manifest or chart files)')
+    parser.add_argument('--output', default='chart_data.csv',
+                        help='Tidy output file, .csv or .parquet (default: chart_data.csv)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--report', help='Timing/failure report path (default: <output>.report.json)')
+    parser.add_argument('--resolution', choices=list(SERIES_RESOLUTIONS),
+                        help='Write fractional-year series at this resolution instead of yearly averages')
+    parser.add_argument('--trace-level', choices=list(TRACE_LEVELS), default='off',
+                        help='Parser output verbosity in the workers (default: off)')
+    parser.add_argument('--trace-sample', type=float, default=1.0,
+                        help='Fraction of charts traced in full, e.g. 0.01 (default: all)')
+    parser.add_argument('--save-debug', action='store_true',
+                        help='Write debug images for the traced charts')
+    args = parser.parse_args()
+    
+    charts = discover_charts(args.charts_dir)
+    if not charts:
+        print(f"No charts found in {args.charts_dir}")
+        return
+    
+    print(f"Parsing {len(charts)} charts from {args.charts_dir} "
+          f"with {args.workers or os.cpu_count()} workers")
+    
+    report = parse_all_charts(charts, args.output, workers=args.workers, resolution=args.resolution,
+                              trace_level=args.trace_level, trace_sample_rate=args.trace_sample,
+                              save_debug=args.save_debug)
+    
+    report_path = args.report or f"{os.path.splitext(args.output)[0]}.report.json"
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    
+    print(f"Wrote {report['rows']} rows from {report['charts']} charts to {args.output} "
+          f"in {report['wall_clock_seconds']:.1f}s ({report['failed']} failed)")
+    for failure in report['failures'][:10]:
+        print(f"  FAILED {failure['path']}: {failure['error']}")
+    print(f"Report saved to {report_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,341 @@
+"""Golden-chart benchmark: speed, memory and accuracy of every parser strategy.
+
+Each downloaded WEBP chart is paired with its manual year/share series where
+one exists (api/data/manual/year_market-share/{category}/{technology}.csv).
+Every registered strategy parses every chart, and the JSON report records the
+median wall time, the peak traced memory and the RMSE of the yearly series
+against the manual one. Timed runs start from empty decode and segmentation
+caches, as the batch parser sees each chart once; warm-cache times are
+reported alongside but not gated on. Passing a previous report as --baseline turns the run
+into a regression gate on speed and accuracy together.
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Allow running as a plain script from any directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from chart_parser import image_cache, segmentation_cache
+from parser_registry import (DEFAULT_MANUAL_DIR, STRATEGIES, ParserRegistry, find_reference_path,
+                             find_reference_series, score_series)
+
+
+# Version 2: 'seconds' are cold-cache times (version 1 timed warm caches)
+BENCHMARK_VERSION = 2
+
+# Regression gates against a baseline report
+DEFAULT_MAX_SLOWDOWN = 1.5         # A strategy's mean time per chart may grow by this factor
+DEFAULT_MAX_RMSE_INCREASE = 0.25   # A chart's RMSE may grow by this many percentage points
+
+
+def golden_charts(charts_dir: str, manual_dir: str = DEFAULT_MANUAL_DIR) -> List[Dict]:
+    """Downloaded charts paired with their manual series.
+    
+    Args:
+        charts_dir: Directory of downloaded WEBP charts
+        manual_dir: Directory of manual year/share CSVs
+        
+    Returns:
+        List of dictionaries with 'technology', 'path' and 'reference_path'
+        (None for charts without a manual series)
+    """
+    charts = []
+    for path in sorted(glob.glob(os.path.join(charts_dir, '*.webp'))):
+        technology = os.path.splitext(os.path.basename(path))[0]
+        charts.append({
+            'technology': technology,
+            'path': path,
+            'reference_path': find_reference_path(technology, manual_dir)
+        })
+    return charts
+
+
+def series_errors(data: List[Tuple[int, float]], reference: Optional[Dict[int, float]]) -> Dict:
+    """Error of a yearly series against a manual series on their shared years.
+    
+    Returns:
+        Dictionary with 'years_compared', 'rmse' and 'max_error' (percentage
+        points; None without a reference or shared years)
+    """
+    shared = [(value, reference[year]) for year, value in data if year in reference] if reference else []
+    if not shared:
+        return {'years_compared': 0, 'rmse': None, 'max_error': None}
+    
+    extracted, expected = np.array(shared).T
+    errors = extracted - expected
+    return {
+        'years_compared': len(shared),
+        'rmse': float(np.sqrt(np.mean(errors ** 2))),
+        'max_error': float(np.abs(errors).max())
+    }
+
+
+def clear_parse_caches() -> None:
+    """Drop the decoded images and segmentations shared by every parser."""
+    image_cache.clear()
+    segmentation_cache.clear()
+
+
+def failed_result(error: str) -> Dict:
+    """Benchmark result for a strategy that could not parse a chart."""
+    return {'seconds': None, 'min_seconds': None, 'warm_seconds': None, 'peak_memory_bytes': None, 'points': 0,
+            **series_errors([], None), 'score': None, 'error': error}
+
+
+def benchmark_strategy(registry: ParserRegistry, name: str, image: np.ndarray, technology: str,
+                       reference: Optional[Dict[int, float]], iterations: int = 5) -> Dict:
+    """Time, memory-profile and score one strategy on one chart.
+    
+    A warm-up run first calibrates the layout and learns the axis glyphs, so
+    the measurements cover steady-state parsing only. Each timed run starts
+    from empty shared caches, so it pays for colour segmentation as a batch
+    parse does (and no strategy reuses another's masks); the same number of
+    runs on warm caches follows. Memory is traced in a separate run, since
+    tracemalloc slows allocation-heavy code.
+    
+    Args:
+        registry: Registry providing the strategy's parser
+        name: Strategy name
+        image: Full chart image (BGR)
+        technology: Technology name
+        reference: Manual {year: share} series, or None
+        iterations: Timed runs (the median is reported)
+        
+    Returns:
+        Dictionary with 'seconds' and 'min_seconds' (cold caches),
+        'warm_seconds', 'peak_memory_bytes', 'points', the series_errors
+        fields, the registry 'score' and 'error'
+    """
+    clear_parse_caches()
+    warmup = registry.run(name, image, technology)
+    if warmup['error']:
+        return failed_result(warmup['error'])
+    
+    parser = registry.parser(name)
+    times = []
+    for _ in range(iterations):
+        clear_parse_caches()
+        started = time.perf_counter()
+        parser.extract_data_from_image(image, technology)
+        times.append(time.perf_counter() - started)
+    
+    # The last cold run left this chart's masks cached
+    warm_times = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        parser.extract_data_from_image(image, technology)
+        warm_times.append(time.perf_counter() - started)
+    
+    # Start from empty caches so every strategy pays for its own masks
+    clear_parse_caches()
+    tracemalloc.start()
+    try:
+        data = parser.extract_data_from_image(image, technology)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    
+    scale = warmup['axis_scale']
+    if warmup['time_scale']:
+        year_range = (int(warmup['time_scale']['min']), int(warmup['time_scale']['max']))
+    else:
+        year_range = getattr(parser, 'year_range', (2005, 2024))
+    scores = score_series(data, year_range[1] - year_range[0] + 1,
+                          (scale['min'], scale['max']) if scale else None, reference)
+    
+    return {
+        'seconds': statistics.median(times),
+        'min_seconds': min(times),
+        'warm_seconds': statistics.median(warm_times),
+        'peak_memory_bytes': peak_memory,
+        'points': len(data),
+        **series_errors(data, reference),
+        'score': scores['total'],
+        'error': None if data else 'no data extracted'
+    }
+
+
+def summarize(charts: List[Dict], names: List[str]) -> Dict[str, Dict]:
+    """Per-strategy totals over every chart of a report."""
+    summary = {}
+    for name in names:
+        results = [chart['results'][name] for chart in charts]
+        seconds = [result['seconds'] for result in results if result['seconds'] is not None]
+        warm_seconds = [result['warm_seconds'] for result in results if result['warm_seconds'] is not None]
+        memory = [result['peak_memory_bytes'] for result in results if result['peak_memory_bytes'] is not None]
+        rmses = [result['rmse'] for result in results if result['rmse'] is not None]
+        summary[name] = {
+            'charts': len(results),
+            'failed': sum(1 for result in results if result['error']),
+            'mean_seconds': statistics.mean(seconds) if seconds else None,
+            'total_seconds': sum(seconds),
+            'mean_warm_seconds': statistics.mean(warm_seconds) if warm_seconds else None,
+            'max_peak_memory_bytes': max(memory) if memory else None,
+            'rmse_charts': len(rmses),
+            'mean_rmse': statistics.mean(rmses) if rmses else None
+        }
+    return summary
+
+
+def run_benchmark(charts: List[Dict], strategies: Optional[List[str]] = None,
+                  converted_dir: Optional[str] = None, manual_dir: str = DEFAULT_MANUAL_DIR,
+                  iterations: int = 5) -> Dict:
+    """Benchmark every strategy on every golden chart.
+    
+    Args:
+        charts: Charts from golden_charts
+        strategies: Strategy names (default: all registered)
+        converted_dir: Calibration/glyph state directory (default: a fresh
+            temporary directory, so runs do not depend on earlier ones)
+        manual_dir: Directory of manual year/share CSVs
+        iterations: Timed runs per chart and strategy
+        
+    Returns:
+        Report with run metadata, per-strategy 'summary' (see summarize) and
+        per-chart 'charts' whose 'results' hold benchmark_strategy output
+    """
+    converted_dir = converted_dir or tempfile.mkdtemp(prefix='chart_benchmark_')
+    registry = ParserRegistry(strategies, converted_dir=converted_dir, manual_dir=manual_dir)
+    started = time.perf_counter()
+    
+    results = []
+    for chart in charts:
+        image = registry.parser(registry.names[0]).load_chart_file(chart['path'])
+        reference = find_reference_series(chart['technology'], manual_dir) if chart['reference_path'] else None
+        
+        chart_results = {}
+        for name in registry.names:
+            if image is None:
+                chart_results[name] = failed_result(f"could not decode {chart['path']}")
+            else:
+                chart_results[name] = benchmark_strategy(registry, name, image, chart['technology'],
+                                                         reference, iterations)
+        results.append({**chart, 'results': chart_results})
+    
+    return {
+        'version': BENCHMARK_VERSION,
+        'generated_at': time.time(),
+        'iterations': iterations,
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'opencv': cv2.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count()
+        },
+        'strategies': registry.names,
+        'wall_clock_seconds': round(time.perf_counter() - started, 3),
+        'summary': summarize(results, registry.names),
+        'charts': results
+    }
+
+
+def compare_reports(baseline: Dict, report: Dict, max_slowdown: float = DEFAULT_MAX_SLOWDOWN,
+                    max_rmse_increase: float = DEFAULT_MAX_RMSE_INCREASE) -> List[str]:
+    """Regressions of a report against a baseline report.
+    
+    Speed is gated on each strategy's mean cold-cache time per chart (single
+    charts are too noisy), and only against a baseline of the same benchmark
+    version; accuracy on each chart's RMSE, and on charts that newly fail.
+    
+    Args:
+        baseline: Earlier report from run_benchmark
+        report: New report
+        max_slowdown: Allowed factor on a strategy's mean seconds per chart
+        max_rmse_increase: Allowed RMSE increase per chart (percentage points)
+        
+    Returns:
+        Human-readable regression descriptions (empty if none)
+    """
+    regressions = []
+    same_timing = baseline.get('version') == report['version']
+    for name, summary in report['summary'].items():
+        before = baseline['summary'].get(name) if same_timing else None
+        if before and before['mean_seconds'] and summary['mean_seconds'] \
+                and summary['mean_seconds'] > before['mean_seconds'] * max_slowdown:
+            regressions.append(f"{name}: {summary['mean_seconds'] * 1000:.1f} ms per chart "
+                               f"(baseline {before['mean_seconds'] * 1000:.1f} ms)")
+    
+    baseline_charts = {chart['technology']: chart['results'] for chart in baseline['charts']}
+    for chart in report['charts']:
+        for name, result in chart['results'].items():
+            before = baseline_charts.get(chart['technology'], {}).get(name)
+            if before is None:
+                continue
+            if result['error'] and not before['error']:
+                regressions.append(f"{name} on {chart['technology']}: now fails ({result['error']})")
+            elif result['rmse'] is not None and before['rmse'] is not None \
+                    and result['rmse'] > before['rmse'] + max_rmse_increase:
+                regressions.append(f"{name} on {chart['technology']}: RMSE {result['rmse']:.3f} "
+                                   f"(baseline {before['rmse']:.3f})")
+    return regressions
+
+
+def main():
+    """Benchmark the strategies on the golden charts and write a JSON report."""
+    parser = argparse.ArgumentParser(description='Benchmark chart parser strategies on the golden charts')
+    parser.add_argument('--charts', default='api/data/scraped/itjobswatch',
+                        help='Directory of downloaded WEBP charts')
+    parser.add_argument('--manual-dir', default=DEFAULT_MANUAL_DIR,
+                        help='Directory of manual year/share CSVs')
+    parser.add_argument('--strategies', nargs='+', choices=list(STRATEGIES),
+                        help='Strategies to benchmark (default: all)')
+    parser.add_argument('--iterations', type=int, default=5, help='Timed runs per chart and strategy')
+    parser.add_argument('--converted-dir', help='Calibration/glyph state directory (default: fresh temp dir)')
+    parser.add_argument('--output', default='chart_benchmark.json', help='JSON report path')
+    parser.add_argument('--baseline', help='Earlier report; exit with status 1 on regressions against it')
+    parser.add_argument('--max-slowdown', type=float, default=DEFAULT_MAX_SLOWDOWN,
+                        help=f'Allowed factor on mean time per chart (default: {DEFAULT_MAX_SLOWDOWN})')
+    parser.add_argument('--max-rmse-increase', type=float, default=DEFAULT_MAX_RMSE_INCREASE,
+                        help=f'Allowed RMSE increase per chart in points (default: {DEFAULT_MAX_RMSE_INCREASE})')
+    args = parser.parse_args()
+    
+    charts = golden_charts(args.charts, args.manual_dir)
+    if not charts:
+        print(f"No WEBP charts found in {args.charts}")
+        return
+    
+    paired = sum(1 for chart in charts if chart['reference_path'])
+    print(f"Benchmarking {len(charts)} charts ({paired} with a manual series), "
+          f"{args.iterations} iterations each")
+    
+    report = run_benchmark(charts, args.strategies, args.converted_dir, args.manual_dir, args.iterations)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    
+    print(f"\n{'Strategy':<16} {'ms/chart':>9} {'warm ms':>8} {'peak MB':>8} {'mean RMSE':>10} {'failed':>7}")
+    print("-" * 63)
+    for name, summary in report['summary'].items():
+        mean_ms = f"{summary['mean_seconds'] * 1000:.1f}" if summary['mean_seconds'] is not None else '-'
+        warm_ms = f"{summary['mean_warm_seconds'] * 1000:.1f}" if summary['mean_warm_seconds'] is not None else '-'
+        peak_mb = f"{summary['max_peak_memory_bytes'] / 2 ** 20:.1f}" if summary['max_peak_memory_bytes'] else '-'
+        rmse = f"{summary['mean_rmse']:.3f}" if summary['mean_rmse'] is not None else '-'
+        print(f"{name:<16} {mean_ms:>9} {warm_ms:>8} {peak_mb:>8} {rmse:>10} {summary['failed']:>7}")
+    print(f"\nReport saved to {args.output}")
+    
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare_reports(baseline, report, args.max_slowdown, args.max_rmse_increase)
+        for regression in regressions:
+            print(f"  REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline")
+
+
+if __name__ == '__main__':
+    main()
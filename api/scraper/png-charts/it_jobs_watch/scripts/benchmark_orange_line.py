@@ -0,0 +1,125 @@
+"""Benchmark orange-line point extraction against the previous contour-walking implementation."""
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import sys
+import time
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+
+# Allow running as a plain script from any directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from chart_parser import ITJobsWatchChartParser
+
+
+def contour_line_points(mask: np.ndarray, width: int) -> List[Tuple[int, int]]:
+    """Previous implementation: walk contour points and average them per x in Python.
+    
+    Args:
+        mask: Binary line mask
+        width: Chart width for sampling
+    
+    Returns:
+        Sampled (x, y) points
+    """
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    
+    line_points = []
+    for contour in contours:
+        if cv2.contourArea(contour) > 10:
+            for point in contour:
+                x, y = point[0]
+                line_points.append((x, y))
+    
+    if not line_points:
+        return []
+    
+    line_points.sort(key=lambda p: p[0])
+    
+    x_groups = {}
+    for x, y in line_points:
+        if x not in x_groups:
+            x_groups[x] = []
+        x_groups[x].append(y)
+    
+    averaged_points = []
+    for x in sorted(x_groups.keys()):
+        avg_y = sum(x_groups[x]) / len(x_groups[x])
+        averaged_points.append((x, int(avg_y)))
+    
+    if len(averaged_points) > width // 10:
+        step = len(averaged_points) // (width // 10)
+        return averaged_points[::step]
+    return averaged_points
+
+
+def time_call(func, iterations: int) -> float:
+    """Average seconds per call over a number of iterations."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def yearly_series(parser: ITJobsWatchChartParser, points, chart_area, technology: str) -> dict:
+    """Map sampled points to {year: percentage} the same way extract_technology_data does."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        data_points = parser.map_pixels_to_data(points, {}, chart_area, technology)
+        return dict(parser.sample_yearly_data(data_points))
+
+
+def main():
+    """Time both implementations on every chart and compare their yearly series."""
+    parser = argparse.ArgumentParser(description='Benchmark orange-line point extraction')
+    parser.add_argument('--charts', default='api/data/scraped/itjobswatch',
+                        help='Directory of downloaded WEBP charts')
+    parser.add_argument('--iterations', type=int, default=20, help='Runs per chart and implementation')
+    args = parser.parse_args()
+    
+    paths = sorted(glob.glob(os.path.join(args.charts, '*.webp')))
+    if not paths:
+        print(f"No WEBP charts found in {args.charts}")
+        return
+    
+    chart_parser = ITJobsWatchChartParser(scraped_dir=args.charts, converted_dir='/tmp/chart_benchmark')
+    print(f"Benchmarking {len(paths)} charts ({args.iterations} iterations each)")
+    print(f"\n{'Chart':<26} {'Size':>10} {'contours ms':>12} {'numpy ms':>9} {'speedup':>8} {'max diff':>9}")
+    print("-" * 78)
+    
+    total_old = total_new = 0.0
+    for path in paths:
+        technology = os.path.splitext(os.path.basename(path))[0]
+        image = cv2.imread(path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            chart_area = chart_parser.extract_chart_area(image)
+        mask = chart_parser._best_orange_mask(chart_area)
+        if mask is None:
+            print(f"{technology:<26} no orange line")
+            continue
+        width = chart_area.shape[1]
+        
+        old_time = time_call(lambda: contour_line_points(mask, width), args.iterations)
+        new_time = time_call(lambda: chart_parser._sample_line_points(mask, width), args.iterations)
+        total_old += old_time
+        total_new += new_time
+        
+        old_series = yearly_series(chart_parser, contour_line_points(mask, width), chart_area, technology)
+        new_series = yearly_series(chart_parser, chart_parser._sample_line_points(mask, width), chart_area, technology)
+        shared = set(old_series) & set(new_series)
+        max_diff = max((abs(old_series[y] - new_series[y]) for y in shared), default=0.0)
+        
+        print(f"{technology:<26} {image.shape[1]:>5}x{image.shape[0]:<4} {old_time * 1000:>12.2f} "
+              f"{new_time * 1000:>9.2f} {old_time / new_time:>7.1f}x {max_diff:>8.3f}%")
+    
+    if total_new:
+        print(f"\nOverall: {total_old / total_new:.1f}x faster")
+
+
+if __name__ == '__main__':
+    main()
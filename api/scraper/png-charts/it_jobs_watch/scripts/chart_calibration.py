@@ -0,0 +1,264 @@
+"""Per-layout calibration of ITJobsWatch chart geometry.
+
+Every chart with the same chart type, time period and image size shares one
+layout: the x-axis line, the plot's horizontal extent and the band of tick
+marks below the axis sit at the same pixels. The layout is detected once per
+signature, stored in a JSON file and reused by later parses after a cheap
+check that the axis is still where it was. Only the chart-specific lines
+(gridlines depend on the y-scale, ticks on the date range) are then measured,
+with targeted scans inside the calibrated geometry.
+"""
+
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from chart_trace import ChartTracer
+
+
+CALIBRATION_FILENAME = "calibration.json"
+CALIBRATION_VERSION = 1
+
+# Pixel classes in the grayscale chart
+AXIS_MAX_GRAY = 100               # X-axis line and tick marks are black
+GRIDLINE_GRAY_RANGE = (200, 245)  # Gridlines are light grey (~230) on white
+
+# Detection thresholds
+AXIS_MIN_COVERAGE = 0.5        # Axis line spans at least half the image width
+GRIDLINE_MIN_COVERAGE = 0.5    # Gridlines cover at least half the plot width
+TICK_MAX_LENGTH = 12           # Tick marks extend at most this far below the axis
+TICK_MIN_LENGTH = 3
+GRIDLINE_COLUMN_STEP = 4       # Gridlines are horizontal, so every 4th column suffices
+
+# Validation threshold for the stored axis rows
+VALID_AXIS_COVERAGE = 0.9
+
+
+def layout_signature(image_shape: Tuple[int, ...], chart_type: str = '', time_period: str = '') -> str:
+    """Key shared by every chart drawn with the same layout.
+    
+    Args:
+        image_shape: Shape of the chart image
+        chart_type: Chart type (e.g. 'demand-trend')
+        time_period: Time period (e.g. 'all')
+        
+    Returns:
+        Signature string such as 'demand-trend|all|1400x700'
+    """
+    height, width = image_shape[:2]
+    return f"{chart_type}|{time_period}|{width}x{height}"
+
+
+def _to_gray(pixels: np.ndarray) -> np.ndarray:
+    """Green channel of a BGR image region (grayscale input is returned as is).
+    
+    Black, grey and white are equal in every channel, so one channel separates
+    the axis and gridlines from the background without a color conversion.
+    """
+    if pixels.ndim == 3:
+        return np.ascontiguousarray(pixels[..., 1])
+    return np.ascontiguousarray(pixels)
+
+
+def _run_centers(indices: np.ndarray) -> List[float]:
+    """Centers of runs of consecutive indices (a 2px line becomes one position)."""
+    if indices.size == 0:
+        return []
+    runs = np.split(indices, np.flatnonzero(np.diff(indices) > 1) + 1)
+    return [float(run.mean()) for run in runs]
+
+
+def detect_layout(image: np.ndarray) -> Optional[Dict]:
+    """Detect the x-axis line, plot extent and tick band of a chart.
+    
+    Args:
+        image: Full chart image (BGR)
+        
+    Returns:
+        Layout dictionary, or None if no x-axis line was found
+    """
+    gray = _to_gray(image)
+    height, width = gray.shape
+    dark = gray <= AXIS_MAX_GRAY
+    
+    # X-axis: the lowest run of rows that are mostly dark
+    axis_rows = np.flatnonzero(dark.mean(axis=1) > AXIS_MIN_COVERAGE)
+    if axis_rows.size == 0:
+        return None
+    axis_run = np.split(axis_rows, np.flatnonzero(np.diff(axis_rows) > 1) + 1)[-1]
+    axis_top, axis_bottom = int(axis_run[0]), int(axis_run[-1])
+    axis_columns = np.flatnonzero(dark[axis_top])
+    
+    return {
+        'version': CALIBRATION_VERSION,
+        'image_size': [width, height],
+        'axis_rows': [axis_top, axis_bottom],
+        'plot_left': int(axis_columns[0]),
+        'plot_right': int(axis_columns[-1]),
+        'tick_rows': [axis_bottom + 1, min(axis_bottom + 1 + TICK_MAX_LENGTH, height)],
+        'calibrated_at': time.time()
+    }
+
+
+def validate_layout(image: np.ndarray, layout: Dict) -> bool:
+    """Check that a stored layout still matches an image.
+    
+    Only the stored axis rows and the row above them are inspected, so this
+    costs a small fraction of a full detection.
+    
+    Args:
+        image: Full chart image (BGR)
+        layout: Layout from detect_layout
+        
+    Returns:
+        True if the x-axis line is where the layout says
+    """
+    height, width = image.shape[:2]
+    if [width, height] != layout['image_size']:
+        return False
+    
+    axis_top, axis_bottom = layout['axis_rows']
+    rows = _to_gray(image[axis_top - 1:axis_bottom + 1, layout['plot_left']:layout['plot_right'] + 1])
+    coverage = (rows <= AXIS_MAX_GRAY).mean(axis=1)
+    
+    # Axis rows still dark, and the line has not grown or moved upwards
+    return bool(coverage[1:].min() >= VALID_AXIS_COVERAGE and coverage[0] < AXIS_MIN_COVERAGE)
+
+
+def measure_chart(image: np.ndarray, layout: Dict) -> Dict:
+    """Measure a chart's plot box, gridlines and ticks inside a calibrated layout.
+    
+    Args:
+        image: Full chart image (BGR)
+        layout: Validated layout from detect_layout
+        
+    Returns:
+        Dictionary with 'plot_box' (left, top, right, bottom), 'horizontal_gridlines'
+        (y centers, top to bottom) and 'x_ticks' (x centers, left to right)
+    """
+    axis_top, axis_bottom = layout['axis_rows']
+    
+    # Plot extent from the axis row alone (label widths move the right end)
+    axis_row = _to_gray(image[axis_top:axis_top + 1])[0]
+    axis_columns = np.flatnonzero(axis_row <= AXIS_MAX_GRAY)
+    left, right = int(axis_columns[0]), int(axis_columns[-1])
+    
+    # Ticks: short dark columns in the band below the axis
+    tick_start, tick_end = layout['tick_rows']
+    band = _to_gray(image[tick_start:tick_end, left:right + 1]) <= AXIS_MAX_GRAY
+    x_ticks = _run_centers(np.flatnonzero(band.sum(axis=0) >= TICK_MIN_LENGTH) + left)
+    
+    # Gridlines: light grey rows above the axis, sampled on every few columns
+    low, high = GRIDLINE_GRAY_RANGE
+    plot = _to_gray(image[:axis_top, left:right + 1:GRIDLINE_COLUMN_STEP])
+    light = cv2.inRange(plot, low, high)
+    coverage = cv2.reduce(light, 1, cv2.REDUCE_AVG, dtype=cv2.CV_32F).ravel() / 255
+    gridlines = _run_centers(np.flatnonzero(coverage > GRIDLINE_MIN_COVERAGE))
+    
+    return {
+        'plot_box': {
+            'left': left,
+            'top': int(round(gridlines[0])) if gridlines else 0,
+            'right': right,
+            'bottom': axis_bottom
+        },
+        'horizontal_gridlines': gridlines,
+        'x_ticks': x_ticks
+    }
+
+
+class ChartCalibrationStore:
+    """JSON-backed chart layouts keyed by layout signature."""
+    
+    def __init__(self, path: str, trace: Optional[ChartTracer] = None):
+        """Open a calibration file (created on first save).
+        
+        Args:
+            path: Calibration JSON path
+            trace: Tracer for progress messages (default: a new one at the
+                default level)
+        """
+        self.path = path
+        self.trace = trace or ChartTracer()
+        self.calibrations = self._read()
+        self.stats = {'hits': 0, 'detections': 0, 'invalidations': 0}
+    
+    def _read(self) -> Dict[str, Dict]:
+        """Load calibrations written by this or another process."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        
+        return {
+            signature: calibration for signature, calibration in data.items()
+            if calibration.get('version') == CALIBRATION_VERSION
+        }
+    
+    def _write(self, calibrations: Dict[str, Dict]) -> None:
+        """Replace the calibration file atomically."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(calibrations, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+    
+    def _save(self) -> None:
+        """Merge with calibrations other processes saved, then write the file."""
+        merged = self._read()
+        merged.update(self.calibrations)
+        self.calibrations = merged
+        self._write(merged)
+    
+    def get(self, signature: str) -> Optional[Dict]:
+        """Stored calibration for a layout signature, or None."""
+        return self.calibrations.get(signature)
+    
+    def invalidate(self, signature: str) -> None:
+        """Forget a layout's calibration (it will be re-detected on next use)."""
+        merged = self._read()
+        merged.update(self.calibrations)
+        merged.pop(signature, None)
+        self.calibrations = merged
+        self._write(merged)
+    
+    def calibrate(self, image: np.ndarray, chart_type: str = '', time_period: str = '') -> Optional[Dict]:
+        """Calibrated geometry of a chart, reusing the stored layout while it validates.
+        
+        A stored layout that fails validation is treated as drift and replaced
+        by a fresh detection.
+        
+        Args:
+            image: Full chart image (BGR)
+            chart_type: Chart type for the layout signature
+            time_period: Time period for the layout signature
+            
+        Returns:
+            measure_chart result plus 'signature', or None if the layout could
+            not be detected
+        """
+        signature = layout_signature(image.shape, chart_type, time_period)
+        
+        layout = self.get(signature)
+        if layout is not None:
+            if validate_layout(image, layout):
+                self.stats['hits'] += 1
+                return {'signature': signature, **measure_chart(image, layout)}
+            self.trace.log(f"Calibration for layout {signature} no longer matches; recalibrating")
+            self.stats['invalidations'] += 1
+        
+        self.stats['detections'] += 1
+        layout = detect_layout(image)
+        if layout is None or not validate_layout(image, layout):
+            return None
+        
+        self.calibrations[signature] = layout
+        self._save()
+        return {'signature': signature, **measure_chart(image, layout)}
@@ -1,30 +1,318 @@
 """Chart image parser for extracting real data from ITJobsWatch WEBP files."""
 
 import os
+import io
+import sys
+import hashlib
+from collections import OrderedDict
 import numpy as np
 from PIL import Image
 import cv2
 from typing import Dict, List, Tuple, Optional
 import json
 
+# The calibration and axis scale modules live next to this file
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from axis_scale import AXIS_GLYPHS_FILENAME, AxisGlyphTemplates
+from chart_calibration import (CALIBRATION_FILENAME, ChartCalibrationStore, detect_layout,
+                               measure_chart, validate_layout)
+from chart_trace import DEFAULT_TRACE_LEVEL, ChartTracer
+
+
+# Number of decoded chart images kept in memory across parser instances
+DEFAULT_IMAGE_CACHE_SIZE = 32
+
+
+def decode_chart_bytes(data: bytes) -> Optional[np.ndarray]:
+    """Decode WEBP (or any image) bytes straight to a BGR array.
+    
+    Args:
+        data: Encoded image bytes
+        
+    Returns:
+        BGR image array, or None if the bytes cannot be decoded
+    """
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is not None:
+        return image
+    
+    # OpenCV builds without WEBP support: decode with PIL instead
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            rgb = np.asarray(img.convert('RGB'))
+        return np.ascontiguousarray(rgb[:, :, ::-1])
+    except Exception:
+        return None
+
+
+class ChartImageCache:
+    """LRU cache of decoded chart images keyed by the SHA-256 of the file contents."""
+    
+    def __init__(self, max_items: int = DEFAULT_IMAGE_CACHE_SIZE):
+        """Initialize the cache.
+        
+        Args:
+            max_items: Maximum number of decoded images to keep (0 disables caching)
+        """
+        self.max_items = max_items
+        self._images = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0}
+    
+    def load(self, path: str) -> Optional[np.ndarray]:
+        """Load and decode an image file, reusing a cached decode of identical bytes.
+        
+        Args:
+            path: Image file path
+            
+        Returns:
+            BGR image array (a private copy), or None if decoding failed
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        key = hashlib.sha256(data).hexdigest()
+        
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            self.stats['hits'] += 1
+            return image.copy()  # Parsers may draw on the image
+        
+        self.stats['misses'] += 1
+        image = decode_chart_bytes(data)
+        if image is None or self.max_items <= 0:
+            return image
+        
+        self._images[key] = image
+        if len(self._images) > self.max_items:
+            self._images.popitem(last=False)
+        
+        return image.copy()
+    
+    def clear(self) -> None:
+        """Drop every cached image."""
+        self._images.clear()
+
+
+# Shared by every parser in the process so parser variants decode each chart once
+image_cache = ChartImageCache()
+
+
+# Number of chart areas whose HSV image and masks are kept across parser calls
+DEFAULT_SEGMENTATION_CACHE_SIZE = 8
+
+# Samples per year for continuous series output ('column' keeps every pixel column)
+SERIES_RESOLUTIONS = {'quarterly': 4, 'monthly': 12, 'weekly': 52, 'column': None}
+
+
+class ColorSegmenter:
+    """Evaluates a set of HSV ranges over an image in a single lookup-table pass.
+    
+    An HSV range is a box, so the 3D lookup table over H/S/V factors into one
+    256-entry table per channel. Each entry is a bitfield with one bit per
+    range; ANDing the three channel lookups gives every pixel's membership in
+    every range at once.
+    """
+    
+    def __init__(self, ranges: List[Dict[str, np.ndarray]]):
+        """Build the per-channel lookup tables.
+        
+        Args:
+            ranges: HSV ranges as {'lower': array, 'upper': array} (at most 16)
+        """
+        if len(ranges) > 16:
+            raise ValueError(f"At most 16 HSV ranges per segmenter, got {len(ranges)}")
+        
+        self.ranges = ranges
+        self.dtype = np.uint8 if len(ranges) <= 8 else np.uint16
+        self.luts = np.zeros((3, 256), dtype=self.dtype)
+        for bit, color_range in enumerate(ranges):
+            for channel in range(3):
+                low = int(color_range['lower'][channel])
+                high = int(color_range['upper'][channel])
+                self.luts[channel, max(low, 0):min(high, 255) + 1] |= 1 << bit
+    
+    def classify(self, hsv: np.ndarray) -> np.ndarray:
+        """Per-pixel bitfield of the ranges each pixel falls in.
+        
+        Args:
+            hsv: HSV image
+            
+        Returns:
+            Array of range bitfields with the image's height and width
+        """
+        h, s, v = cv2.split(hsv)
+        codes = cv2.bitwise_and(cv2.LUT(h, self.luts[0]), cv2.LUT(s, self.luts[1]))
+        return cv2.bitwise_and(codes, cv2.LUT(v, self.luts[2]))
+    
+    def counts(self, codes: np.ndarray) -> List[int]:
+        """Number of pixels in each range, from one histogram of the bitfields.
+        
+        Args:
+            codes: Output of classify
+            
+        Returns:
+            Pixel count per range, in range order
+        """
+        histogram = np.bincount(codes.ravel(), minlength=1 << len(self.ranges))
+        values = np.arange(histogram.size)
+        return [int(histogram[(values >> bit) & 1 == 1].sum()) for bit in range(len(self.ranges))]
+    
+    def mask(self, codes: np.ndarray, index: int) -> np.ndarray:
+        """Binary 0/255 mask of one range, identical to cv2.inRange.
+        
+        Args:
+            codes: Output of classify
+            index: Range index
+            
+        Returns:
+            uint8 mask
+        """
+        return cv2.compare(cv2.bitwise_and(codes, 1 << index), 0, cv2.CMP_GT)
+
+
+# One segmenter per distinct set of ranges, shared by every parser instance
+_segmenters: Dict[tuple, ColorSegmenter] = {}
+
+
+def get_segmenter(ranges: List[Dict[str, np.ndarray]]) -> ColorSegmenter:
+    """Shared segmenter for a list of HSV ranges (lookup tables are built once)."""
+    signature = tuple(
+        (tuple(int(x) for x in r['lower']), tuple(int(x) for x in r['upper'])) for r in ranges
+    )
+    segmenter = _segmenters.get(signature)
+    if segmenter is None:
+        segmenter = _segmenters[signature] = ColorSegmenter(ranges)
+    return segmenter
+
+
+class SegmentationCache:
+    """Per-image HSV conversion, range bitfields, derived masks and grid lines.
+    
+    Chart areas are fresh views on every extract_chart_area call, so entries
+    are keyed by the array owning the pixels plus the view's position within
+    it (data address, shape and strides): every crop of the same region of
+    the same image shares one entry. The cache keeps a reference to the
+    owning array, so its id cannot be reused while cached. Cached arrays are
+    read-only: parsers must copy before drawing on them, and must not modify
+    an image in place after segmenting it.
+    """
+    
+    def __init__(self, max_items: int = DEFAULT_SEGMENTATION_CACHE_SIZE):
+        """Initialize the cache.
+        
+        Args:
+            max_items: Maximum number of images to keep segmentations for
+        """
+        self.max_items = max_items
+        self._entries = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0}
+    
+    def entry(self, image: np.ndarray) -> Dict:
+        """Cache entry for an image.
+        
+        Args:
+            image: BGR image
+            
+        Returns:
+            Dictionary with 'hsv' (None until converted), 'codes' (per segmenter),
+            'masks' (per key) and 'grids' (per detector)
+        """
+        source = image if image.base is None else image.base
+        key = (id(source), image.__array_interface__['data'][0], image.shape, image.strides)
+        entry = self._entries.get(key)
+        if entry is not None and entry['source'] is source:
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry
+        
+        self.stats['misses'] += 1
+        entry = {'source': source, 'hsv': None, 'codes': {}, 'masks': {}, 'grids': {}}
+        
+        if self.max_items > 0:
+            self._entries[key] = entry
+            if len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+        
+        return entry
+    
+    def hsv(self, image: np.ndarray) -> np.ndarray:
+        """HSV conversion of an image, computed once while the image is cached (read-only)."""
+        entry = self.entry(image)
+        if entry['hsv'] is None:
+            entry['hsv'] = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+            entry['hsv'].flags.writeable = False
+        return entry['hsv']
+    
+    def clear(self) -> None:
+        """Drop every cached segmentation."""
+        self._entries.clear()
+
+
+# Shared by every parser in the process so subclasses reuse each other's masks
+segmentation_cache = SegmentationCache()
+
 
 class ITJobsWatchChartParser:
     """Extracts actual data from ITJobsWatch chart images using computer vision."""
     
     def __init__(self, scraped_dir: str = "views/charts/scraped/itjobswatch", 
-                 converted_dir: str = "views/charts/scraped/converted"):
+                 converted_dir: str = "views/charts/scraped/converted",
+                 save_debug: bool = False, save_png: bool = False,
+                 use_calibration: bool = True, calibration_path: Optional[str] = None,
+                 read_axis_labels: bool = True, axis_glyphs_path: Optional[str] = None,
+                 trace_level: str = DEFAULT_TRACE_LEVEL, trace_sample_rate: float = 1.0):
         """Initialize the chart parser.
         
         Args:
             scraped_dir: Directory containing original WEBP files
             converted_dir: Directory to save converted PNG files
+            save_debug: Write debug images (chart area, line mask) for each chart
+            save_png: Also write a PNG copy of each loaded chart (debug artifact)
+            use_calibration: Take grid lines from the per-layout calibration
+                instead of detecting them on every chart
+            calibration_path: Calibration JSON (default: converted_dir/calibration.json)
+            read_axis_labels: Read each chart's y-axis scale from its tick labels
+                instead of assuming a fixed percentage range
+            axis_glyphs_path: Learned glyph templates JSON (default: converted_dir/axis_glyphs.json)
+            trace_level: Progress output verbosity ('off', 'error', 'info', 'debug', 'trace')
+            trace_sample_rate: Fraction of charts that get full output and debug
+                images (the same charts on every run)
         """
         self.scraped_dir = scraped_dir
         self.converted_dir = converted_dir
+        self.save_debug = save_debug
+        self.save_png = save_png
+        
+        # Leveled progress output; debug images are written in the background
+        self.trace = ChartTracer(trace_level, trace_sample_rate, save_artifacts=save_debug)
         
         # Create converted directory if it doesn't exist
         os.makedirs(self.converted_dir, exist_ok=True)
         
+        # Layouts shared by every chart with the same type, period and size
+        self.calibration = None
+        if use_calibration:
+            self.calibration = ChartCalibrationStore(
+                calibration_path or os.path.join(self.converted_dir, CALIBRATION_FILENAME), trace=self.trace
+            )
+        
+        # ITJobsWatch charts span 2005-2024 based on visual inspection
+        # (assumed only when a chart's x-axis labels cannot be read)
+        self.year_range = (2005, 2024)
+        
+        # Axis label reader, and the scales read from the chart being parsed
+        self.axis_glyphs = None
+        if read_axis_labels:
+            self.axis_glyphs = AxisGlyphTemplates(
+                axis_glyphs_path or os.path.join(self.converted_dir, AXIS_GLYPHS_FILENAME)
+            )
+        self.y_axis_scale = None
+        self.x_axis_scale = None
+        
+        # (bottom, top) calibrated gridline rows of the chart being parsed, in chart area coordinates
+        self.gridline_rows = None
+        
         # Chart area coordinates (approximate, based on ITJobsWatch layout)
         self.chart_crop = {
             'top_percent': 0.15,    # Skip title area
@@ -40,6 +328,28 @@ class ITJobsWatchChartParser:
             'blue': {'lower': np.array([100, 150, 100]), 'upper': np.array([130, 255, 255])}, # Blue (Contract)
             'gray': {'lower': np.array([0, 0, 100]), 'upper': np.array([180, 50, 200])}        # Gray (All Jobs)
         }
+        
+        # Job type each line color stands for in the chart legend
+        self.series_labels = {'orange': 'permanent', 'blue': 'contract', 'gray': 'all'}
+        
+        # Candidate HSV ranges per feature, all evaluated in one segmentation pass
+        self.candidate_ranges = {
+            'orange': [
+                {'lower': np.array([8, 150, 150]), 'upper': np.array([25, 255, 255])},   # Primary orange
+                {'lower': np.array([5, 100, 100]), 'upper': np.array([30, 255, 255])},   # Broader orange
+                {'lower': np.array([10, 80, 80]), 'upper': np.array([25, 255, 255])},    # Darker orange
+            ],
+            'light_grey': [
+                {'lower': np.array([0, 0, 100]), 'upper': np.array([180, 60, 255])},    # Very permissive
+                {'lower': np.array([0, 0, 120]), 'upper': np.array([180, 50, 250])},    # Current range
+                {'lower': np.array([0, 0, 140]), 'upper': np.array([180, 40, 230])},    # Stricter
+            ],
+            'blue': [self.line_colors['blue']],
+            'gray': [self.line_colors['gray']]
+        }
+        
+        # Mask segments with a contour area at or below this are treated as noise
+        self.min_segment_area = 10
     
     def convert_webp_to_png(self, technology: str) -> Optional[str]:
         """Convert WEBP file to PNG for better processing.
@@ -54,7 +364,7 @@ class ITJobsWatchChartParser:
         png_path = os.path.join(self.converted_dir, f"{technology}.png")
         
         if not os.path.exists(webp_path):
-            print(f"WEBP file not found: {webp_path}")
+            self.trace.log(f"WEBP file not found: {webp_path}", level='error')
             return None
         
         try:
@@ -66,15 +376,15 @@ class ITJobsWatchChartParser:
                 
                 # Save as PNG
                 img.save(png_path, 'PNG')
-                print(f"Converted {webp_path} -> {png_path}")
+                self.trace.log(f"Converted {webp_path} -> {png_path}", level='debug')
                 return png_path
                 
         except Exception as e:
-            print(f"Error converting {webp_path} to PNG: {e}")
+            self.trace.log(f"Error converting {webp_path} to PNG: {e}", level='error')
             return None
     
     def load_chart_image(self, technology: str) -> Optional[np.ndarray]:
-        """Load chart image from WEBP file, converting to PNG if needed.
+        """Load chart image from WEBP file, decoding it in memory.
         
         Args:
             technology: Technology name
@@ -82,23 +392,38 @@ class ITJobsWatchChartParser:
         Returns:
             OpenCV image array, or None if loading failed
         """
-        # Convert WEBP to PNG first
-        png_path = self.convert_webp_to_png(technology)
-        if not png_path:
+        webp_path = os.path.join(self.scraped_dir, f"{technology}.webp")
+        
+        if not os.path.exists(webp_path):
+            self.trace.log(f"WEBP file not found: {webp_path}", level='error')
             return None
         
+        # PNG conversion is only kept as an optional debug artifact
+        if self.save_png:
+            self.convert_webp_to_png(technology)
+        
+        return self.load_chart_file(webp_path)
+    
+    def load_chart_file(self, path: str) -> Optional[np.ndarray]:
+        """Decode a chart image file through the shared in-memory cache.
+        
+        Args:
+            path: Path to a WEBP (or other image) file
+            
+        Returns:
+            OpenCV image array, or None if loading failed
+        """
         try:
-            # Load with OpenCV
-            image = cv2.imread(png_path)
+            image = image_cache.load(path)
             if image is None:
-                print(f"Failed to load image: {png_path}")
+                self.trace.log(f"Failed to load image: {path}", level='error')
                 return None
             
-            print(f"Loaded chart image: {image.shape}")
+            self.trace.log(f"Loaded chart image: {image.shape}", level='debug')
             return image
             
         except Exception as e:
-            print(f"Error loading chart image: {e}")
+            self.trace.log(f"Error loading chart image: {e}", level='error')
             return None
     
     def extract_chart_area(self, image: np.ndarray) -> np.ndarray:
@@ -121,18 +446,24 @@ class ITJobsWatchChartParser:
         # Extract chart area
         chart_area = image[top:bottom, left:right]
         
-        print(f"Chart area extracted: {chart_area.shape} (from {image.shape})")
+        self.trace.log(f"Chart area extracted: {chart_area.shape} (from {image.shape})", level='debug')
         return chart_area
     
     def detect_grid_lines(self, chart_area: np.ndarray) -> Dict[str, List[int]]:
         """Detect horizontal and vertical grid lines for coordinate mapping.
         
+        Results are cached per chart area and shared by every parser variant.
+        
         Args:
             chart_area: Cropped chart area
             
         Returns:
             Dictionary with 'horizontal' and 'vertical' grid line positions
         """
+        return self.cached_grid_lines(chart_area, 'contours', self._detect_contour_grid_lines)
+    
+    def _detect_contour_grid_lines(self, chart_area: np.ndarray) -> Dict[str, List[int]]:
+        """Find grid lines as contours of the morphologically opened grayscale chart."""
         # Convert to grayscale for line detection
         gray = cv2.cvtColor(chart_area, cv2.COLOR_BGR2GRAY)
         
@@ -167,7 +498,7 @@ class ITJobsWatchChartParser:
             'vertical': sorted(vertical_positions)
         }
         
-        print(f"Detected {len(grid_lines['horizontal'])} horizontal and {len(grid_lines['vertical'])} vertical grid lines")
+        self.trace.log(f"Detected {len(grid_lines['horizontal'])} horizontal and {len(grid_lines['vertical'])} vertical grid lines", level='debug')
         return grid_lines
     
     def extract_orange_line(self, chart_area: np.ndarray, technology: str) -> List[Tuple[int, int]]:
@@ -179,105 +510,394 @@ class ITJobsWatchChartParser:
         Returns:
             List of (x, y) pixel coordinates along the orange line
         """
-        # Convert to HSV for better color filtering
-        hsv = cv2.cvtColor(chart_area, cv2.COLOR_BGR2HSV)
+        return self.extract_series_line(chart_area, technology, 'orange')
+    
+    def extract_series_line(self, chart_area: np.ndarray, technology: str,
+                            series: str) -> List[Tuple[int, int]]:
+        """Extract one colored series line from the chart.
+        
+        Args:
+            chart_area: Cropped chart area
+            technology: Technology name (for debug filenames)
+            series: Line color, a key of self.line_colors
+            
+        Returns:
+            List of (x, y) pixel coordinates along the line
+        """
+        best_mask = self._best_series_mask(chart_area, series)
         
-        # Try multiple orange color ranges to catch the line
-        orange_ranges = [
-            {'lower': np.array([8, 150, 150]), 'upper': np.array([25, 255, 255])},   # Primary orange
-            {'lower': np.array([5, 100, 100]), 'upper': np.array([30, 255, 255])},   # Broader orange
-            {'lower': np.array([10, 80, 80]), 'upper': np.array([25, 255, 255])},    # Darker orange
-        ]
+        if best_mask is None:
+            self.trace.log(f"No {series} line detected with any color range")
+            return []
         
-        best_mask = None
-        best_contour_count = 0
+        # Save debug image to see what we're detecting
+        if self.trace.artifacts_enabled() and series == 'orange':
+            technology_safe = technology.replace('-', '_')
+            self.save_debug_images(technology_safe, chart_area, best_mask)
         
-        for color_range in orange_ranges:
-            # Create mask for this orange range
-            mask = cv2.inRange(hsv, color_range['lower'], color_range['upper'])
+        # Reduce the mask to one y-centroid per covered column, taken at a regular stride
+        sampled_points = self._sample_line_points(best_mask, chart_area.shape[1])
+        
+        if not sampled_points:
+            self.trace.log(f"No valid points found in {series} mask")
+            return []
+        
+        self.trace.log(f"Extracted {len(sampled_points)} points from {series} line", level='debug')
+        return sampled_points
+    
+    def _best_orange_mask(self, chart_area: np.ndarray) -> Optional[np.ndarray]:
+        """Build the orange line mask from whichever color range captures the most pixels."""
+        return self._best_series_mask(chart_area, 'orange')
+    
+    def _best_series_mask(self, chart_area: np.ndarray, series: str) -> Optional[np.ndarray]:
+        """Build a series line mask from whichever color range captures the most pixels.
+        
+        The result is cached per chart area and shared by every parser variant.
+        
+        Args:
+            chart_area: Cropped chart area
+            series: Line color, a key of self.candidate_ranges
+            
+        Returns:
+            Cleaned binary mask (read-only), or None if no range matched any pixels
+        """
+        def build():
+            best_mask = None
+            best_contour_count = 0
             
-            # Apply morphological operations to clean up
+            # Apply morphological operations to clean up each candidate range
             kernel = np.ones((2,2), np.uint8)
-            mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
-            mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
+            for mask in self.range_masks(chart_area, series):
+                mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
+                mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
+                
+                # Count non-zero pixels as a quality metric
+                pixel_count = cv2.countNonZero(mask)
+                
+                if pixel_count > best_contour_count:
+                    best_contour_count = pixel_count
+                    best_mask = mask
             
-            # Count non-zero pixels as a quality metric
-            pixel_count = cv2.countNonZero(mask)
+            return best_mask
+        
+        return self.cached_mask(chart_area, series, build)
+    
+    def _segmentation(self, chart_area: np.ndarray) -> Tuple[Dict, ColorSegmenter, np.ndarray]:
+        """Shared segmentation of a chart area: cache entry, segmenter and range bitfields.
+        
+        Every candidate range of every feature is evaluated in the same pass.
+        """
+        entry = segmentation_cache.entry(chart_area)
+        segmenter = get_segmenter([r for group in self.candidate_ranges.values() for r in group])
+        
+        codes = entry['codes'].get(segmenter)
+        if codes is None:
+            codes = segmenter.classify(segmentation_cache.hsv(chart_area))
+            codes.flags.writeable = False
+            entry['codes'][segmenter] = codes
+        
+        return entry, segmenter, codes
+    
+    def _range_indices(self, feature: str) -> range:
+        """Positions of a feature's candidate ranges within the combined segmenter."""
+        start = 0
+        for name, group in self.candidate_ranges.items():
+            if name == feature:
+                return range(start, start + len(group))
+            start += len(group)
+        raise KeyError(f"No candidate HSV ranges for '{feature}'")
+    
+    def get_hsv(self, chart_area: np.ndarray) -> np.ndarray:
+        """HSV conversion of a chart area, computed once per image (read-only)."""
+        return segmentation_cache.hsv(chart_area)
+    
+    def range_masks(self, chart_area: np.ndarray, feature: str) -> List[np.ndarray]:
+        """Raw masks (as cv2.inRange would produce) for each candidate range of a feature.
+        
+        Args:
+            chart_area: Cropped chart area
+            feature: Key of self.candidate_ranges
             
-            if pixel_count > best_contour_count:
-                best_contour_count = pixel_count
-                best_mask = mask
+        Returns:
+            One 0/255 mask per candidate range, in order
+        """
+        _, segmenter, codes = self._segmentation(chart_area)
+        return [segmenter.mask(codes, i) for i in self._range_indices(feature)]
+    
+    def range_pixel_counts(self, chart_area: np.ndarray, feature: str) -> List[int]:
+        """Pixel count of each candidate range of a feature, without building the masks.
         
-        if best_mask is None:
-            print("No orange line detected with any color range")
-            return []
+        Args:
+            chart_area: Cropped chart area
+            feature: Key of self.candidate_ranges
+            
+        Returns:
+            Pixel count per candidate range, in order
+        """
+        _, segmenter, codes = self._segmentation(chart_area)
+        counts = segmenter.counts(codes)
+        return [counts[i] for i in self._range_indices(feature)]
+    
+    def calibrate_chart(self, image: np.ndarray, chart_type: str = '',
+                        time_period: str = '') -> Optional[Dict]:
+        """Chart geometry measured inside its calibrated layout, once per image.
         
-        # Save debug image to see what we're detecting
-        technology_safe = technology.replace('-', '_')
-        self.save_debug_images(technology_safe, chart_area, best_mask)
+        Args:
+            image: Full chart image (BGR)
+            chart_type: Chart type for the layout signature
+            time_period: Time period for the layout signature
+            
+        Returns:
+            Calibration from ChartCalibrationStore.calibrate, or None if
+            calibration is disabled or the layout could not be detected
+        """
+        if self.calibration is None:
+            return None
         
-        # Find contours of the best orange mask
-        contours, _ = cv2.findContours(best_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # Every parser strategy run on the same image shares the measurement
+        grids = segmentation_cache.entry(image)['grids']
+        key = ('calibration', chart_type, time_period)
+        if key not in grids:
+            grids[key] = self.calibration.calibrate(image, chart_type, time_period)
+        return grids[key]
+    
+    def calibrated_grid_lines(self, image: np.ndarray, chart_area: np.ndarray,
+                              calibration: Optional[Dict]) -> Optional[Dict[str, List[int]]]:
+        """Grid lines from the layout calibration, in chart area coordinates.
         
-        if not contours:
-            print("No contours found in orange mask")
-            return []
+        Gridlines become 'horizontal' positions and x-axis ticks 'vertical'
+        positions, so no grid detection runs on the chart itself.
         
-        # Combine all significant contours (line might be broken into segments)
-        line_points = []
-        for contour in contours:
-            if cv2.contourArea(contour) > 10:  # Filter tiny noise
-                for point in contour:
-                    x, y = point[0]
-                    line_points.append((x, y))
+        Args:
+            image: Full chart image (BGR)
+            chart_area: Chart area cropped from the image with self.chart_crop
+            calibration: Result of calibrate_chart
+            
+        Returns:
+            Dictionary with 'horizontal' and 'vertical' positions, or None
+            without a calibration
+        """
+        if calibration is None:
+            return None
         
-        if not line_points:
-            print("No valid points found in contours")
-            return []
+        # Offset of the chart area within the image (same formula as extract_chart_area)
+        height, width = image.shape[:2]
+        top = int(height * self.chart_crop['top_percent'])
+        left = int(width * self.chart_crop['left_percent'])
+        area_height, area_width = chart_area.shape[:2]
         
-        # Sort by x-coordinate to get chronological order
-        line_points.sort(key=lambda p: p[0])
+        horizontal = [int(round(y)) - top for y in calibration['horizontal_gridlines']]
+        vertical = [int(round(x)) - left for x in calibration['x_ticks']]
+        grid_lines = {
+            'horizontal': [y for y in horizontal if 0 <= y < area_height],
+            'vertical': [x for x in vertical if 0 <= x < area_width]
+        }
         
-        # Sample points more densely along x-axis for better coverage
-        sampled_points = self._sample_line_points(line_points, chart_area.shape[1])
+        self.trace.log(f"Calibrated grid for layout {calibration['signature']}: "
+                       f"{len(grid_lines['horizontal'])} horizontal and {len(grid_lines['vertical'])} vertical lines", level='debug')
+        return grid_lines
+    
+    def read_y_axis_scale(self, image: np.ndarray, calibration: Optional[Dict]) -> Optional[Dict]:
+        """Y-axis scale read from the chart's tick labels, in chart area coordinates.
         
-        print(f"Extracted {len(sampled_points)} points from orange line")
-        return sampled_points
+        Args:
+            image: Full chart image (BGR)
+            calibration: Result of calibrate_chart (the layout is detected
+                directly when calibration is disabled)
+            
+        Returns:
+            Scale from AxisGlyphTemplates.read_scale with the intercept moved to
+            chart area rows, or None if label reading is disabled or failed
+        """
+        if self.axis_glyphs is None:
+            return None
+        
+        calibration = self.axis_measurement(image, calibration)
+        if calibration is None:
+            return None
+        
+        scale = self.axis_glyphs.read_scale(image, calibration)
+        if scale is None:
+            self.trace.log("Could not read the y-axis labels")
+            return None
+        
+        # value = intercept + slope * image_y, with image_y = area_y + top
+        top = int(image.shape[0] * self.chart_crop['top_percent'])
+        scale['intercept'] += scale['slope'] * top
+        
+        self.trace.log(f"Y-axis labels read: {scale['min']:g}% to {scale['max']:g}% ({len(scale['labels'])} labels)")
+        return scale
+    
+    def read_x_axis_scale(self, image: np.ndarray, calibration: Optional[Dict]) -> Optional[Dict]:
+        """Time scale read from the chart's x-axis year labels, in chart area coordinates.
+        
+        Args:
+            image: Full chart image (BGR)
+            calibration: Result of calibrate_chart (the layout is detected
+                directly when calibration is disabled)
+            
+        Returns:
+            Scale from AxisGlyphTemplates.read_time_scale with the intercept
+            moved to chart area columns, or None if label reading is disabled
+            or failed
+        """
+        if self.axis_glyphs is None:
+            return None
+        
+        calibration = self.axis_measurement(image, calibration)
+        if calibration is None:
+            return None
+        
+        scale = self.axis_glyphs.read_time_scale(image, calibration)
+        if scale is None:
+            self.trace.log("Could not read the x-axis labels")
+            return None
+        
+        # year = intercept + slope * image_x, with image_x = area_x + left
+        left = int(image.shape[1] * self.chart_crop['left_percent'])
+        scale['intercept'] += scale['slope'] * left
+        
+        self.trace.log(f"X-axis labels read: {scale['min']:g} to {scale['max']:g} ({len(scale['labels'])} labels)")
+        return scale
     
-    def _sample_line_points(self, line_points: List[Tuple[int, int]], width: int) -> List[Tuple[int, int]]:
-        """Sample points more evenly along the x-axis.
+    def axis_measurement(self, image: np.ndarray, calibration: Optional[Dict]) -> Optional[Dict]:
+        """Plot box, gridlines and ticks to read axis labels against.
         
         Args:
-            line_points: Raw line points
+            image: Full chart image (BGR)
+            calibration: Result of calibrate_chart, returned as is when set
+            
+        Returns:
+            The calibration, else a measurement of a freshly detected layout,
+            or None if no layout was found
+        """
+        if calibration is not None:
+            return calibration
+        layout = detect_layout(image)
+        if layout is None or not validate_layout(image, layout):
+            return None
+        return measure_chart(image, layout)
+    
+    def cached_grid_lines(self, chart_area: np.ndarray, key: str, detect) -> Dict[str, List[int]]:
+        """Grid line positions for a chart area, detected once per image.
+        
+        Args:
+            chart_area: Cropped chart area
+            key: Name of the detector (e.g. 'contours', 'light_grey_masks')
+            detect: Callable (chart_area) -> grid lines, run on a cache miss
+            
+        Returns:
+            Dictionary of grid line positions (fresh lists the caller may modify)
+        """
+        grids = segmentation_cache.entry(chart_area)['grids']
+        if key not in grids:
+            grids[key] = detect(chart_area)
+        return {name: list(positions) for name, positions in grids[key].items()}
+    
+    @staticmethod
+    def thin_positions(positions: List[int], min_spacing: float, strict: bool = False,
+                       limit: Optional[int] = None) -> List[int]:
+        """Greedily keep sorted positions at least min_spacing after the last kept one.
+        
+        Each step jumps straight to the next acceptable position with a binary
+        search, so the cost depends on the number of kept lines, not candidates.
+        
+        Args:
+            positions: Sorted candidate positions (the first is always kept)
+            min_spacing: Minimum distance from the previously kept position
+            strict: Require a distance strictly greater than min_spacing
+            limit: Stop after keeping this many positions
+            
+        Returns:
+            Kept positions in order
+        """
+        positions = np.asarray(positions)
+        kept = []
+        i = 0
+        while i < positions.size and (limit is None or len(kept) < limit):
+            kept.append(int(positions[i]))
+            next_i = np.searchsorted(positions, positions[i] + min_spacing,
+                                     side='right' if strict else 'left')
+            i = max(i + 1, int(next_i))
+        return kept
+    
+    def cached_mask(self, chart_area: np.ndarray, key: str, build) -> Optional[np.ndarray]:
+        """Mask derived from the segmentation, built once per chart area.
+        
+        Args:
+            chart_area: Cropped chart area
+            key: Name of the derived mask (e.g. 'orange', 'light_grey_horizontal')
+            build: Callable returning the mask (or None) on a cache miss
+            
+        Returns:
+            The cached mask (read-only), or None
+        """
+        entry, segmenter, _ = self._segmentation(chart_area)
+        cache_key = (key, segmenter)
+        if cache_key not in entry['masks']:
+            mask = build()
+            if mask is not None:
+                mask.flags.writeable = False
+            entry['masks'][cache_key] = mask
+        return entry['masks'][cache_key]
+    
+    def _sample_line_points(self, mask: np.ndarray, width: int) -> List[Tuple[int, int]]:
+        """Sample the line mask more evenly along the x-axis.
+        
+        Small specks are dropped, then each column's line pixels are reduced
+        to their mean y (column-wise weighted sums over the mask pixels).
+        Only columns the mask covers are sampled, at a regular stride, so
+        gaps between broken segments stay empty.
+        
+        Args:
+            mask: Binary line mask
             width: Chart width for sampling
             
         Returns:
-            Evenly sampled points
+            Sampled (x, y) points
         """
-        if not line_points:
+        columns, centroids = self._line_centroids(mask)
+        if columns.size == 0:
             return []
+        ys = centroids.astype(int)
         
-        # Group points by x-coordinate and average their y-values
-        x_groups = {}
-        for x, y in line_points:
-            if x not in x_groups:
-                x_groups[x] = []
-            x_groups[x].append(y)
-        
-        # Average y-values for each x
-        averaged_points = []
-        for x in sorted(x_groups.keys()):
-            avg_y = sum(x_groups[x]) / len(x_groups[x])
-            averaged_points.append((x, int(avg_y)))
-        
-        # Sample at regular intervals if we have many points
-        if len(averaged_points) > width // 10:  # Limit to ~10% of width
-            step = len(averaged_points) // (width // 10)
-            sampled = averaged_points[::step]
-        else:
-            sampled = averaged_points
+        # Sample at regular intervals if we have many columns (limit to ~10% of width)
+        limit = max(1, width // 10)
+        if columns.size > limit:
+            step = columns.size // limit
+            columns, ys = columns[::step], ys[::step]
         
-        return sampled
+        return list(zip(columns.tolist(), ys.tolist()))
+    
+    def _line_centroids(self, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Mean y of the line pixels in every column the line crosses.
+        
+        Args:
+            mask: Binary line mask
+            
+        Returns:
+            (columns, centroid y per column); both empty if the mask has no line
+        """
+        # Filter tiny noise (line might be broken into segments, so keep every real one)
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        specks = [contour for contour in contours if cv2.contourArea(contour) <= self.min_segment_area]
+        if specks:
+            mask = mask.copy()
+            cv2.drawContours(mask, specks, -1, 0, thickness=cv2.FILLED)
+        
+        pixels = cv2.findNonZero(mask)
+        if pixels is None:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        pixels = pixels.reshape(-1, 2)
+        xs, ys = pixels[:, 0], pixels[:, 1]
+        
+        # Per-column centroid: sum(y) / count over the line pixels in each column
+        column_counts = np.bincount(xs, minlength=mask.shape[1])
+        column_sums = np.bincount(xs, weights=ys, minlength=mask.shape[1])
+        columns = np.flatnonzero(column_counts)
+        centroids = column_sums[columns] / column_counts[columns]
+        
+        return columns, centroids
     
     def map_pixels_to_data(self, pixel_points: List[Tuple[int, int]], 
                           grid_lines: Dict[str, List[int]], 
@@ -292,51 +912,114 @@ class ITJobsWatchChartParser:
         Returns:
             List of (year, percentage) data points
         """
-        height, width = chart_area.shape[:2]
+        points = np.array(pixel_points, dtype=np.float64).reshape(-1, 2)
+        years, percentages, percent_range = self.map_pixels_to_series(
+            points[:, 0], points[:, 1], chart_area, technology
+        )
+        
+        # Whole years, sorted (stable, so points within a year keep their order);
+        # only the assumed year range needs clamping
+        years = np.rint(years)
+        if self.x_axis_scale is None:
+            years = np.clip(years, *self.year_range)
+        years = years.astype(int)
+        order = np.argsort(years, kind='stable')
+        data_points = list(zip(years[order].tolist(), percentages[order].tolist()))
+        
+        self.trace.log(f"Mapped {len(data_points)} pixel points to data coordinates", level='debug')
+        self.trace.log(f"Using percentage range: {percent_range[0]:.1f}% to {percent_range[1]:.1f}%", level='debug')
+        return data_points
+    
+    def map_pixels_to_series(self, xs: np.ndarray, ys: np.ndarray, chart_area: np.ndarray,
+                             technology: str) -> Tuple[np.ndarray, np.ndarray, Tuple[float, float]]:
+        """Map pixel coordinates to fractional years and percentages, vectorized.
         
-        # ITJobsWatch charts span 2005-2024 based on visual inspection
-        year_range = (2005, 2024)
-        x_min, x_max = 0, width - 1
+        Args:
+            xs: X pixel coordinates in the chart area
+            ys: Y pixel coordinates in the chart area
+            chart_area: Chart area for coordinate reference
+            technology: Technology name (percentage range fallback)
+            
+        Returns:
+            (fractional years, percentages, percentage range used)
+        """
+        height, width = chart_area.shape[:2]
         
         # Y-axis mapping: 0% at bottom of chart, max% at top
         # In pixel coordinates: bottom of chart = higher Y values, top = lower Y values
         # So we need to map: high Y pixels (bottom) -> 0%, low Y pixels (top) -> max%
-        y_bottom, y_top = height - 1, 0  # Bottom and top pixel coordinates
+        # The calibrated gridlines bound the plot; otherwise the whole chart area
+        y_bottom, y_top = self.gridline_rows or (height - 1, 0)
         
         # Determine percentage range based on technology and chart analysis
         # From the original charts:
         # - AI chart: starts near 0%, grows to ~11-12%
         # - Web Dev chart: starts around 2.5%, peaks at ~6%, declines to ~1%
-        if "artificial-intelligence" in technology.lower():
+        # A scale read from the chart's own y-axis labels takes precedence
+        scale = self.y_axis_scale
+        if scale is not None:
+            percent_range = (scale['intercept'] + scale['slope'] * y_bottom,
+                             scale['intercept'] + scale['slope'] * y_top)
+        elif "artificial-intelligence" in technology.lower():
             percent_range = (0.0, 12.0)  # AI chart range
         elif "web-development" in technology.lower():
             percent_range = (0.0, 6.0)   # Web Dev chart range
         else:
             percent_range = (0.0, 10.0)  # Default fallback
             
-        data_points = []
-        for x, y in pixel_points:
-            # Map x to year
-            year_ratio = (x - x_min) / (x_max - x_min) if x_max > x_min else 0
-            year = year_range[0] + year_ratio * (year_range[1] - year_range[0])
-            year = max(year_range[0], min(year_range[1], int(round(year))))
-            
-            # Map y to percentage
-            # y_bottom (high pixel value) -> 0%, y_top (low pixel value) -> max%
-            percent_ratio = (y_bottom - y) / (y_bottom - y_top) if y_bottom > y_top else 0
-            percentage = percent_range[0] + percent_ratio * (percent_range[1] - percent_range[0])
-            percentage = max(0.0, percentage)  # Don't go below 0%
+        # Map x to year through the chart's own year labels, else spread the
+        # assumed year range across the chart area
+        time_scale = self.x_axis_scale
+        if time_scale is not None:
+            years = time_scale['intercept'] + time_scale['slope'] * xs
+        else:
+            year_range = self.year_range
+            x_min, x_max = 0, width - 1
+            year_ratio = (xs - x_min) / (x_max - x_min) if x_max > x_min else np.zeros_like(xs)
+            years = year_range[0] + year_ratio * (year_range[1] - year_range[0])
+        
+        # Map y to percentage
+        # y_bottom (high pixel value) -> 0%, y_top (low pixel value) -> max%
+        percent_ratio = (y_bottom - ys) / (y_bottom - y_top) if y_bottom > y_top else np.zeros_like(ys)
+        percentages = percent_range[0] + percent_ratio * (percent_range[1] - percent_range[0])
+        percentages = np.maximum(0.0, percentages)  # Don't go below 0%
+        
+        return years, percentages, percent_range
+    
+    def continuous_series(self, mask: np.ndarray, chart_area: np.ndarray, technology: str,
+                          resolution='monthly') -> List[Tuple[float, float]]:
+        """Fractional-year series of a line mask at a fixed time resolution.
+        
+        Every column the line crosses is mapped to (fractional year, percentage),
+        then linearly interpolated onto an even time grid.
+        
+        Args:
+            mask: Binary line mask of the chart area
+            chart_area: Chart area for coordinate reference
+            technology: Technology name (percentage range fallback)
+            resolution: Key of SERIES_RESOLUTIONS, or samples per year
             
-            data_points.append((year, percentage))
+        Returns:
+            List of (fractional year, percentage) points in time order
+        """
+        columns, centroids = self._line_centroids(mask)
+        if columns.size == 0:
+            return []
         
-        # Filter to reasonable year range and sort
-        data_points = [(year, pct) for year, pct in data_points 
-                      if year_range[0] <= year <= year_range[1]]
-        data_points.sort(key=lambda p: p[0])
+        years, percentages, _ = self.map_pixels_to_series(
+            columns.astype(np.float64), centroids, chart_area, technology
+        )
         
-        print(f"Mapped {len(data_points)} pixel points to data coordinates")
-        print(f"Using percentage range: {percent_range[0]:.1f}% to {percent_range[1]:.1f}%")
-        return data_points
+        samples_per_year = SERIES_RESOLUTIONS.get(resolution, resolution)
+        if samples_per_year is not None:
+            # Grid points that fall on the line's time span, e.g. whole months
+            first = np.ceil(years[0] * samples_per_year)
+            last = np.floor(years[-1] * samples_per_year)
+            grid = np.arange(first, last + 1) / samples_per_year
+            percentages = np.interp(grid, years, percentages)
+            years = grid
+        
+        return list(zip(years.tolist(), percentages.tolist()))
     
     def sample_yearly_data(self, data_points: List[Tuple[int, float]]) -> List[Tuple[int, float]]:
         """Sample data points to get one value per year.
@@ -363,7 +1046,7 @@ class ITJobsWatchChartParser:
             avg_percentage = sum(year_groups[year]) / len(year_groups[year])
             yearly_data.append((year, avg_percentage))
         
-        print(f"Sampled to {len(yearly_data)} yearly data points")
+        self.trace.log(f"Sampled to {len(yearly_data)} yearly data points", level='debug')
         return yearly_data
     
     def extract_technology_data(self, technology: str) -> List[Tuple[int, float]]:
@@ -375,41 +1058,110 @@ class ITJobsWatchChartParser:
         Returns:
             List of (year, percentage) data points
         """
-        print(f"\n=== Extracting real data for: {technology} ===")
+        self.trace.begin_chart(technology)
+        self.trace.log(f"\n=== Extracting real data for: {technology} ===")
         
         # Step 1: Load chart image
         image = self.load_chart_image(technology)
         if image is None:
-            print(f"Failed to load image for {technology}")
+            self.trace.log(f"Failed to load image for {technology}", level='error')
             return []
         
-        # Step 2: Extract chart area
-        chart_area = self.extract_chart_area(image)
-        
-        # Step 3: Detect grid lines for coordinate mapping
-        grid_lines = self.detect_grid_lines(chart_area)
+        return self.extract_data_from_image(image, technology)
+    
+    def extract_data_from_image(self, image: np.ndarray, technology: str,
+                                chart_type: str = '', time_period: str = '') -> List[Tuple[int, float]]:
+        """Extract (year, percentage) data from an already loaded chart image.
         
-        # Step 4: Extract orange line (Permanent jobs)
-        pixel_points = self.extract_orange_line(chart_area, technology)
-        if not pixel_points:
-            print(f"Failed to extract orange line for {technology}")
-            return []
+        Args:
+            image: Full chart image (BGR)
+            technology: Technology name (scaling fallback and debug filenames)
+            chart_type: Chart type, part of the calibration layout signature
+            time_period: Time period, part of the calibration layout signature
+            
+        Returns:
+            List of (year, percentage) data points
+        """
+        series_data = self.extract_all_series(image, technology, chart_type, time_period, series=['orange'])
+        return series_data.get('orange', [])
+    
+    def extract_all_series(self, image: np.ndarray, technology: str, chart_type: str = '',
+                           time_period: str = '', series: Optional[List[str]] = None,
+                           resolution=None) -> Dict[str, List[Tuple[float, float]]]:
+        """Extract every series line from an already loaded chart image in one pass.
         
-        # Step 5: Map pixel coordinates to data values
-        data_points = self.map_pixels_to_data(pixel_points, grid_lines, chart_area, technology)
+        The chart area, grid, y-axis scale and color segmentation (one HSV
+        conversion covering every series' ranges) are shared by all series.
         
-        # Step 6: Sample to yearly data
-        yearly_data = self.sample_yearly_data(data_points)
+        Args:
+            image: Full chart image (BGR)
+            technology: Technology name (scaling fallback and debug filenames)
+            chart_type: Chart type, part of the calibration layout signature
+            time_period: Time period, part of the calibration layout signature
+            series: Line colors to extract (default: every key of self.line_colors)
+            resolution: None for one averaged value per whole year, else a
+                continuous series at this resolution (see continuous_series)
+            
+        Returns:
+            Dictionary of line color -> (year, percentage) data points, for
+            each series found on the chart
+        """
+        self.trace.begin_chart('|'.join(part for part in (technology, chart_type, time_period) if part))
         
-        # Show sample of extracted data
-        if yearly_data:
-            print("Sample extracted data points:")
-            for i, (year, percentage) in enumerate(yearly_data[:5]):
-                print(f"  {year}: {percentage:.2f}%")
-            if len(yearly_data) > 5:
-                print(f"  ... and {len(yearly_data) - 5} more")
+        # Step 2: Extract chart area
+        chart_area = self.extract_chart_area(image)
         
-        return yearly_data
+        # Step 3: Grid lines for coordinate mapping (calibrated layout, else detection)
+        calibration = self.calibrate_chart(image, chart_type, time_period)
+        grid_lines = self.calibrated_grid_lines(image, chart_area, calibration)
+        if grid_lines is None:
+            grid_lines = self.detect_grid_lines(chart_area)
+        
+        # Labelled gridlines bound the y-axis when its labels cannot be read
+        horizontal = grid_lines['horizontal'] if calibration is not None else []
+        self.gridline_rows = (horizontal[-1], horizontal[0]) if len(horizontal) >= 2 else None
+        
+        # Axis scales from the chart's own labels (used by map_pixels_to_series)
+        measurement = self.axis_measurement(image, calibration) if self.axis_glyphs is not None else None
+        self.y_axis_scale = self.read_y_axis_scale(image, measurement)
+        self.x_axis_scale = self.read_x_axis_scale(image, measurement)
+        
+        series_data = {}
+        for name in series or list(self.line_colors):
+            if resolution is not None:
+                # Steps 4-6 at sub-year resolution: every line column, mapped in bulk
+                mask = self._best_series_mask(chart_area, name)
+                points = self.continuous_series(mask, chart_area, technology, resolution) if mask is not None else []
+                if points:
+                    self.trace.log(f"Extracted {len(points)} {name} line points at {resolution} resolution", level='debug')
+                    series_data[name] = points
+                continue
+            
+            # Step 4: Extract the series line (orange = Permanent jobs)
+            if name == 'orange':
+                pixel_points = self.extract_orange_line(chart_area, technology)
+            else:
+                pixel_points = self.extract_series_line(chart_area, technology, name)
+            if not pixel_points:
+                self.trace.log(f"Failed to extract {name} line for {technology}")
+                continue
+            
+            # Step 5: Map pixel coordinates to data values
+            data_points = self.map_pixels_to_data(pixel_points, grid_lines, chart_area, technology)
+            
+            # Step 6: Sample to yearly data
+            yearly_data = self.sample_yearly_data(data_points)
+            
+            # Show sample of extracted data
+            if yearly_data:
+                self.trace.log(f"Sample extracted data points ({name} line):")
+                for i, (year, percentage) in enumerate(yearly_data[:5]):
+                    self.trace.log(f"  {year}: {percentage:.2f}%")
+                if len(yearly_data) > 5:
+                    self.trace.log(f"  ... and {len(yearly_data) - 5} more")
+                series_data[name] = yearly_data
+        
+        return series_data
     
     def save_debug_images(self, technology: str, chart_area: np.ndarray, 
                          orange_mask: np.ndarray) -> None:
@@ -424,12 +1176,12 @@ class ITJobsWatchChartParser:
         os.makedirs(debug_dir, exist_ok=True)
         
         # Save chart area
-        cv2.imwrite(os.path.join(debug_dir, f"{technology}_chart_area.png"), chart_area)
+        self.trace.artifact(os.path.join(debug_dir, f"{technology}_chart_area.png"), chart_area)
         
         # Save orange mask
-        cv2.imwrite(os.path.join(debug_dir, f"{technology}_orange_mask.png"), orange_mask)
+        self.trace.artifact(os.path.join(debug_dir, f"{technology}_orange_mask.png"), orange_mask)
         
-        print(f"Debug images saved to {debug_dir}")
+        self.trace.log(f"Debug images saved to {debug_dir}", level='debug')
 
 
 def test_chart_parser():
@@ -0,0 +1,136 @@
+"""Leveled, sampled progress output and debug artifacts for the chart parsers.
+
+Parsers report through a ChartTracer instead of printing directly. Messages
+carry a level and are printed only up to the configured level; debug images
+are built only for charts that are traced and are encoded and written on a
+background thread, so a batch run pays nothing for debugging it has not
+asked for. Sampling keeps the full output for a stable subset of charts
+(e.g. 1%), chosen by hashing the chart key.
+"""
+
+import os
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional, Union
+
+import cv2
+import numpy as np
+
+
+# Verbosity levels, least to most verbose
+TRACE_LEVELS = {'off': 0, 'error': 1, 'info': 2, 'debug': 3, 'trace': 4}
+DEFAULT_TRACE_LEVEL = 'info'
+
+# Sampling resolution (a rate of 0.01 keeps charts whose hash bucket is below 100)
+SAMPLE_BUCKETS = 10000
+
+
+def chart_sampled(key: str, sample_rate: float) -> bool:
+    """Stable sampling decision for a chart (the same key always gets the same answer)."""
+    if sample_rate >= 1.0:
+        return True
+    return zlib.crc32(key.encode('utf-8')) % SAMPLE_BUCKETS < sample_rate * SAMPLE_BUCKETS
+
+
+class ChartTracer:
+    """Leveled messages and asynchronously written debug images for one parser."""
+    
+    def __init__(self, level: str = DEFAULT_TRACE_LEVEL, sample_rate: float = 1.0,
+                 save_artifacts: bool = False):
+        """Create a tracer.
+        
+        Args:
+            level: Most verbose message level printed (a key of TRACE_LEVELS)
+            sample_rate: Fraction of charts traced; untraced charts only
+                report errors
+            save_artifacts: Write debug images for traced charts
+        """
+        if level not in TRACE_LEVELS:
+            raise ValueError(f"Unknown trace level '{level}' (expected one of {', '.join(TRACE_LEVELS)})")
+        
+        self.level = TRACE_LEVELS[level]
+        self.sample_rate = sample_rate
+        self.save_artifacts = save_artifacts
+        
+        # Chart being parsed, and whether it is traced (True outside begin_chart)
+        self.chart_key: Optional[str] = None
+        self.sampled = True
+        self.stats = {'charts': 0, 'sampled': 0, 'artifacts': 0}
+        
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._pending: List[Future] = []
+    
+    def begin_chart(self, key: str) -> bool:
+        """Start tracing a chart; returns whether it was sampled.
+        
+        Calling again with the chart already being traced (e.g. from a wrapper
+        and the method it delegates to) does not count it twice.
+        """
+        if key == self.chart_key:
+            return self.sampled
+        
+        self.chart_key = key
+        self.sampled = chart_sampled(key, self.sample_rate)
+        self.stats['charts'] += 1
+        self.stats['sampled'] += self.sampled
+        return self.sampled
+    
+    def enabled(self, level: str = 'info') -> bool:
+        """Whether messages of a level are printed for the current chart."""
+        if TRACE_LEVELS[level] > self.level:
+            return False
+        return self.sampled or level == 'error'
+    
+    def log(self, message: str, level: str = 'info') -> None:
+        """Print a message if its level is enabled."""
+        if self.enabled(level):
+            print(message)
+    
+    def artifacts_enabled(self) -> bool:
+        """Whether debug images are written for the current chart."""
+        return self.save_artifacts and self.sampled
+    
+    def artifact(self, path: str, image: Union[np.ndarray, Callable[[], np.ndarray]]) -> bool:
+        """Queue a debug image to be written on the background thread.
+        
+        Args:
+            path: Output image path (directories are created)
+            image: Image array, or a callable building it (only called when
+                artifacts are enabled)
+                
+        Returns:
+            True if the image was queued
+        """
+        if not self.artifacts_enabled():
+            return False
+        
+        # Copy so later in-place edits by the caller cannot race the writer
+        pixels = np.array(image() if callable(image) else image, copy=True)
+        
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='chart-trace')
+        self._pending = [future for future in self._pending if not future.done()]
+        self._pending.append(self._writer.submit(self._write, path, pixels))
+        self.stats['artifacts'] += 1
+        return True
+    
+    @staticmethod
+    def _write(path: str, pixels: np.ndarray) -> None:
+        """Encode and write one image (runs on the writer thread)."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        cv2.imwrite(path, pixels)
+    
+    def flush(self) -> None:
+        """Wait until every queued image is written (re-raising write errors)."""
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+    
+    def close(self) -> None:
+        """Flush queued images and stop the writer thread."""
+        self.flush()
+        if self._writer is not None:
+            self._writer.shutdown()
+            self._writer = None
@@ -0,0 +1,382 @@
+"""Registry of chart parser strategies with scored best-of selection per layout.
+
+A strategy is a parser class: the base parser in this directory or one of
+the variants in annotating/orange-line. For the first few charts of a layout
+every registered strategy parses the image and its series is scored on how
+well it fits the chart's labelled y-axis, how continuous it is and, where a
+manual series exists, how closely it agrees with it. Scores are summed over
+those charts (one chart is not representative of its layout) and the
+strategy with the best total is remembered per layout signature in a JSON
+file, so later charts with the same layout run only that strategy.
+"""
+
+import argparse
+import glob
+import importlib
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Allow running as a plain script from any directory
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+VARIANTS_DIR = os.path.join(os.path.dirname(SCRIPTS_DIR), 'annotating', 'orange-line')
+sys.path.insert(0, SCRIPTS_DIR)
+sys.path.insert(1, VARIANTS_DIR)
+
+from chart_calibration import layout_signature
+from chart_trace import DEFAULT_TRACE_LEVEL, ChartTracer
+
+
+SELECTION_FILENAME = "parser_selection.json"
+SELECTION_VERSION = 2
+
+# Charts of a layout scored with every strategy before its winner is memoized
+DEFAULT_SELECTION_CHARTS = 5
+
+# Manual (year, share) series the strategies are checked against, one CSV per technology
+DEFAULT_MANUAL_DIR = os.path.normpath(
+    os.path.join(SCRIPTS_DIR, '..', '..', '..', '..', 'data', 'manual', 'year_market-share')
+)
+
+# Strategy name -> (module, class)
+STRATEGIES = {
+    'base': ('chart_parser', 'ITJobsWatchChartParser'),
+    'accurate': ('accurate_chart_parser', 'AccurateChartParser'),
+    'corrected': ('corrected_chart_parser', 'CorrectedChartParser'),
+    'grid_based': ('grid_based_chart_parser', 'GridBasedChartParser'),
+    'ocr_friendly': ('ocr_friendly_chart_parser', 'OCRFriendlyChartParser'),
+    'enhanced_ocr': ('enhanced_ocr_chart_parser', 'EnhancedOCRChartParser'),
+    'structure_based': ('structure_based_chart_parser', 'StructureBasedChartParser'),
+}
+
+# Weight of each score component (components without data are left out)
+SCORE_WEIGHTS = {'axis_fit': 0.4, 'continuity': 0.2, 'reference': 0.4}
+
+# Values may sit this fraction of the labelled range outside it (the plot
+# extends a little beyond the top and bottom gridlines)
+AXIS_FIT_MARGIN = 0.1
+
+
+def register_strategy(name: str, module: str, class_name: str) -> None:
+    """Add or replace a strategy (module must be importable from sys.path)."""
+    STRATEGIES[name] = (module, class_name)
+
+
+def load_strategy(name: str) -> type:
+    """Import a strategy's parser class."""
+    module, class_name = STRATEGIES[name]
+    return getattr(importlib.import_module(module), class_name)
+
+
+def find_reference_path(technology: str, manual_dir: str = DEFAULT_MANUAL_DIR) -> Optional[str]:
+    """Manual series CSV for a technology ({category}/{technology}.csv), or None."""
+    paths = sorted(glob.glob(os.path.join(manual_dir, '**', f"{technology}.csv"), recursive=True))
+    return paths[0] if paths else None
+
+
+def find_reference_series(technology: str, manual_dir: str = DEFAULT_MANUAL_DIR) -> Optional[Dict[int, float]]:
+    """Manual series for a technology, averaged per (rounded) year.
+    
+    Args:
+        technology: Technology name, matched against {category}/{technology}.csv
+        manual_dir: Directory of manual year/share CSVs
+        
+    Returns:
+        {year: share}, or None if there is no manual series
+    """
+    path = find_reference_path(technology, manual_dir)
+    if path is None:
+        return None
+    
+    points = np.loadtxt(path, delimiter=',', ndmin=2)
+    years = np.rint(points[:, 0]).astype(int)
+    return {int(year): float(points[years == year, 1].mean()) for year in np.unique(years)}
+
+
+def score_series(data: List[Tuple[int, float]], expected_years: int,
+                 axis_range: Optional[Tuple[float, float]] = None,
+                 reference: Optional[Dict[int, float]] = None) -> Dict[str, Optional[float]]:
+    """Score one strategy's yearly series (each component in 0-1, higher is better).
+    
+    Args:
+        data: (year, percentage) points from the strategy
+        expected_years: Number of years the chart spans
+        axis_range: (lowest, highest) y-axis label value read from the chart
+        reference: Manual {year: share} series
+        
+    Returns:
+        Dictionary with 'axis_fit', 'continuity', 'reference' (None when not
+        measurable), 'rmse' against the reference and the weighted 'total'
+    """
+    scores = {'axis_fit': None, 'continuity': 0.0, 'reference': None, 'rmse': None, 'total': 0.0}
+    if not data:
+        return scores
+    
+    years = np.array([year for year, _ in data])
+    values = np.array([value for _, value in data])
+    span = values.max() - values.min() or 1.0
+    
+    # Axis fit: share of values inside the range spanned by the labelled gridlines
+    if axis_range is not None:
+        low, high = axis_range
+        margin = AXIS_FIT_MARGIN * (high - low)
+        span = high - low or span
+        scores['axis_fit'] = float(np.mean((values >= low - margin) & (values <= high + margin)))
+    
+    # Continuity: year coverage, damped by year-to-year jumps relative to the axis
+    coverage = min(1.0, np.unique(years).size / expected_years)
+    jumps = np.abs(np.diff(values)).mean() / span if values.size > 1 else 1.0
+    scores['continuity'] = float(coverage / (1.0 + jumps))
+    
+    # Agreement with the manual series on shared years
+    if reference:
+        shared = [(value, reference[year]) for year, value in data if year in reference]
+        if shared:
+            extracted, expected = np.array(shared).T
+            rmse = float(np.sqrt(np.mean((extracted - expected) ** 2)))
+            reference_span = max(reference.values()) - min(reference.values()) or 1.0
+            scores['rmse'] = rmse
+            scores['reference'] = 1.0 / (1.0 + rmse / reference_span)
+    
+    weighted = [(SCORE_WEIGHTS[name], scores[name]) for name in SCORE_WEIGHTS if scores[name] is not None]
+    scores['total'] = sum(weight * score for weight, score in weighted) / sum(weight for weight, _ in weighted)
+    return scores
+
+
+class ParserRegistry:
+    """Runs registered parser strategies and memoizes the best one per chart layout."""
+    
+    def __init__(self, strategies: Optional[List[str]] = None,
+                 converted_dir: str = "views/charts/scraped/converted",
+                 selection_path: Optional[str] = None, manual_dir: str = DEFAULT_MANUAL_DIR,
+                 selection_charts: int = DEFAULT_SELECTION_CHARTS, quiet: bool = True, **parser_kwargs):
+        """Create a registry.
+        
+        Args:
+            strategies: Strategy names to consider (default: all registered)
+            converted_dir: Converted/debug directory for the parsers
+            selection_path: Selection JSON (default: converted_dir/parser_selection.json)
+            manual_dir: Directory of manual year/share CSVs used for scoring
+            selection_charts: Charts of a layout to score every strategy on
+                before memoizing the best one
+            quiet: Silence the parsers' progress output (trace level 'off'
+                unless a trace_level is passed)
+            **parser_kwargs: Extra parser constructor arguments (debug images
+                are off unless save_debug=True is passed)
+        """
+        self.names = list(strategies or STRATEGIES)
+        self.parser_kwargs = {'converted_dir': converted_dir, 'save_debug': False,
+                              **({'trace_level': 'off'} if quiet else {}), **parser_kwargs}
+        self.path = selection_path or os.path.join(converted_dir, SELECTION_FILENAME)
+        self.manual_dir = manual_dir
+        self.selection_charts = max(1, selection_charts)
+        
+        # Selection messages follow the parsers' trace level
+        self.trace = ChartTracer(self.parser_kwargs.get('trace_level', DEFAULT_TRACE_LEVEL))
+        
+        self.selections = self._read()
+        self.stats = {'memoized': 0, 'selected': 0}
+        self._parsers = {}
+    
+    def _read(self) -> Dict[str, Dict]:
+        """Load selections written by this or another process."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        
+        return {
+            signature: selection for signature, selection in data.items()
+            if selection.get('version') == SELECTION_VERSION
+        }
+    
+    def _save(self) -> None:
+        """Merge with selections other processes saved, then replace the file atomically."""
+        merged = self._read()
+        merged.update(self.selections)
+        self.selections = merged
+        
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(merged, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+    
+    def parser(self, name: str):
+        """Parser instance for a strategy, created on first use."""
+        if name not in self._parsers:
+            self._parsers[name] = load_strategy(name)(**self.parser_kwargs)
+        return self._parsers[name]
+    
+    def run(self, name: str, image: np.ndarray, technology: str,
+            chart_type: str = '', time_period: str = '') -> Dict:
+        """Parse a chart with one strategy.
+        
+        Returns:
+            Dictionary with 'data', 'seconds', 'error' and the parser's
+            'axis_scale' and 'time_scale' (None if it read no y-axis or
+            x-axis labels)
+        """
+        started = time.perf_counter()
+        try:
+            parser = self.parser(name)
+            data = parser.extract_data_from_image(image, technology, chart_type, time_period)
+            axis_scale, error = getattr(parser, 'y_axis_scale', None), None
+            time_scale = getattr(parser, 'x_axis_scale', None)
+        except Exception as e:
+            data, axis_scale, time_scale, error = [], None, None, f"{type(e).__name__}: {e}"
+        
+        return {
+            'data': data,
+            'seconds': time.perf_counter() - started,
+            'error': error,
+            'axis_scale': axis_scale,
+            'time_scale': time_scale
+        }
+    
+    def evaluate(self, image: np.ndarray, technology: str,
+                 chart_type: str = '', time_period: str = '') -> Dict[str, Dict]:
+        """Run and score every strategy on a chart.
+        
+        Returns:
+            Run result (see run) plus 'scores' (see score_series) per strategy
+        """
+        results = {name: self.run(name, image, technology, chart_type, time_period) for name in self.names}
+        
+        # Every strategy sees the same image, so any successful axis reading applies to all
+        scale = next((result['axis_scale'] for result in results.values() if result['axis_scale']), None)
+        axis_range = (scale['min'], scale['max']) if scale else None
+        time_scale = next((result['time_scale'] for result in results.values() if result['time_scale']), None)
+        reference = find_reference_series(technology, self.manual_dir)
+        
+        for name, result in results.items():
+            parser = self._parsers.get(name)
+            if time_scale:
+                year_range = (int(time_scale['min']), int(time_scale['max']))
+            else:
+                year_range = getattr(parser, 'year_range', (2005, 2024))
+            result['scores'] = score_series(
+                result['data'], year_range[1] - year_range[0] + 1, axis_range, reference
+            )
+        return results
+    
+    def extract(self, image: np.ndarray, technology: str, chart_type: str = '',
+                time_period: str = '') -> Tuple[str, List[Tuple[int, float]]]:
+        """Parse a chart with the best strategy for its layout.
+        
+        A memoized strategy runs alone. Until a layout has one (and whenever
+        it extracts nothing) every strategy is run and scored, the chart gets
+        its own best result, and the scores are added to the layout's totals
+        (see record_scores).
+        
+        Args:
+            image: Full chart image (BGR)
+            technology: Technology name
+            chart_type: Chart type, part of the layout signature
+            time_period: Time period, part of the layout signature
+            
+        Returns:
+            (strategy name, (year, percentage) data points)
+        """
+        signature = layout_signature(image.shape, chart_type, time_period)
+        
+        selection = self.selections.get(signature)
+        if selection is not None and selection['strategy'] in self.names:
+            result = self.run(selection['strategy'], image, technology, chart_type, time_period)
+            if result['data']:
+                self.stats['memoized'] += 1
+                return selection['strategy'], result['data']
+            self.trace.log(f"Strategy {selection['strategy']} extracted nothing for layout {signature}; reselecting")
+        
+        results = self.evaluate(image, technology, chart_type, time_period)
+        best = max(results, key=lambda name: results[name]['scores']['total'])
+        
+        self.stats['selected'] += 1
+        self.record_scores(signature, technology, results)
+        return best, results[best]['data']
+    
+    def record_scores(self, signature: str, technology: str, results: Dict[str, Dict]) -> Dict:
+        """Add one chart's strategy scores to its layout's totals.
+        
+        Once selection_charts charts of the layout have been scored, the
+        strategy with the highest total is memoized; charts scored later (when
+        the memoized strategy extracts nothing) keep updating the totals and
+        can change the winner.
+        
+        Args:
+            signature: Layout signature
+            technology: Technology of the scored chart
+            results: evaluate() results for the chart
+            
+        Returns:
+            The layout's selection record
+        """
+        selection = self.selections.get(signature) or {
+            'version': SELECTION_VERSION,
+            'strategy': None,
+            'charts': 0,
+            'score_totals': {},
+            'scored_on': []
+        }
+        
+        totals = selection['score_totals']
+        for name, result in results.items():
+            totals[name] = totals.get(name, 0.0) + result['scores']['total']
+        selection['charts'] += 1
+        selection['scored_on'].append(technology)
+        selection['scores'] = {name: round(total / selection['charts'], 4) for name, total in totals.items()}
+        
+        if selection['charts'] >= self.selection_charts:
+            candidates = [name for name in self.names if name in totals]
+            selection['strategy'] = max(candidates, key=lambda name: totals[name])
+            selection['selected_at'] = time.time()
+        
+        self.selections[signature] = selection
+        self._save()
+        return selection
+
+
+def main():
+    """Score every strategy on a directory of charts and report the winners."""
+    parser = argparse.ArgumentParser(description='Select the best chart parser strategy per chart')
+    parser.add_argument('--charts', default='api/data/scraped/itjobswatch',
+                        help='Directory of downloaded WEBP charts')
+    parser.add_argument('--strategies', nargs='+', choices=list(STRATEGIES),
+                        help='Strategies to consider (default: all)')
+    parser.add_argument('--converted-dir', default='views/charts/scraped/converted',
+                        help='Converted/debug directory (selection JSON is written here)')
+    args = parser.parse_args()
+    
+    paths = sorted(glob.glob(os.path.join(args.charts, '*.webp')))
+    if not paths:
+        print(f"No WEBP charts found in {args.charts}")
+        return
+    
+    registry = ParserRegistry(args.strategies, converted_dir=args.converted_dir)
+    names = registry.names
+    print(f"{'Chart':<26} " + ' '.join(f"{name[:12]:>12}" for name in names) + "  best")
+    print("-" * (28 + 13 * len(names) + 6))
+    
+    for path in paths:
+        technology = os.path.splitext(os.path.basename(path))[0]
+        image = registry.parser(names[0]).load_chart_file(path)
+        if image is None:
+            print(f"{technology:<26} could not decode")
+            continue
+        
+        results = registry.evaluate(image, technology)
+        best = max(results, key=lambda name: results[name]['scores']['total'])
+        print(f"{technology:<26} " + ' '.join(
+            f"{results[name]['scores']['total']:>12.3f}" for name in names
+        ) + f"  {best}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+"""
+Asyncio download engine for the WebP chart scraper.
+
+Downloads run on an event loop with a concurrency cap, a token bucket per
+host and retries with jittered exponential backoff. The blocking transfer
+itself is handed to a worker thread, so the existing requests session
+(and its HTTP cache adapter) is reused unchanged.
+"""
+
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+
+class RetryableDownloadError(Exception):
+    """Transient failure (connection error, timeout, 429/5xx) worth retrying."""
+
+
+class AsyncRateLimiter:
+    """Token bucket for coroutines that caps requests per second."""
+    
+    def __init__(self, rps: float, burst: Optional[int] = None):
+        """
+        Create a rate limiter.
+        
+        Args:
+            rps: Maximum sustained requests per second
+            burst: Maximum number of requests allowed back-to-back (default 1)
+        """
+        if rps <= 0:
+            raise ValueError(f"rps must be positive, got {rps}")
+        
+        self.rps = rps
+        self.capacity = float(burst or 1)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        """Wait until a request slot is available, then consume it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                elapsed = now - self._last_refill
+                self._tokens = min(self.capacity, self._tokens + elapsed * self.rps)
+                self._last_refill = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                # Holding the lock while sleeping keeps waiters in FIFO order
+                await asyncio.sleep((1 - self._tokens) / self.rps)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of a list of values.
+    
+    Args:
+        values: Sample values
+        pct: Percentile in the range 0-100
+    
+    Returns:
+        Percentile value, or 0.0 for an empty list
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100.0 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class AsyncDownloadEngine:
+    """Runs blocking download callables concurrently under rate and retry limits."""
+    
+    def __init__(self, fetch: Callable[[str, str, Dict], Tuple[str, int]],
+                 concurrency: int, rps: float, max_attempts: int,
+                 backoff_base: float = 1.0, logger=None,
+                 on_result: Optional[Callable[[str, str, int, int, float], None]] = None):
+        """
+        Create a download engine.
+        
+        Args:
+            fetch: Blocking callable (url, filename, metadata) -> (outcome, bytes);
+                raises RetryableDownloadError for transient failures
+            concurrency: Maximum number of downloads in flight
+            rps: Maximum requests per second to each host
+            max_attempts: Attempts per URL before giving up
+            backoff_base: Base delay in seconds for exponential backoff
+            logger: Logger for retry/failure messages
+            on_result: Optional callback (url, outcome, attempts, bytes, latency_ms)
+                invoked once per URL with its final outcome
+        """
+        self.fetch = fetch
+        self.concurrency = max(1, concurrency)
+        self.rps = rps
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.logger = logger
+        self.on_result = on_result
+        
+        # One record per HTTP request: url, attempt, outcome, latency and bytes
+        self.timings: List[Dict] = []
+        self.wall_clock_seconds = 0.0
+    
+    def run(self, url_list: List[Tuple[str, str, Dict]]) -> List[str]:
+        """
+        Download every URL in the list.
+        
+        Args:
+            url_list: List of (url, filename, metadata) tuples
+        
+        Returns:
+            Final outcome for each URL, in input order: whatever fetch returned,
+            or 'failed' once retries are exhausted
+        """
+        return asyncio.run(self._run(url_list))
+    
+    async def _run(self, url_list: List[Tuple[str, str, Dict]]) -> List[str]:
+        """Schedule all downloads on the event loop."""
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._limiters: Dict[str, AsyncRateLimiter] = {}
+        
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            self._executor = executor
+            outcomes = await asyncio.gather(*(
+                self._download(url, filename, metadata)
+                for url, filename, metadata in url_list
+            ))
+        self.wall_clock_seconds = time.perf_counter() - started
+        
+        return list(outcomes)
+    
+    def _limiter_for(self, url: str) -> AsyncRateLimiter:
+        """Token bucket for the URL's host."""
+        host = urlparse(url).netloc
+        if host not in self._limiters:
+            self._limiters[host] = AsyncRateLimiter(self.rps)
+        return self._limiters[host]
+    
+    async def _download(self, url: str, filename: str, metadata: Dict) -> str:
+        """Download one URL, retrying transient failures with jittered backoff."""
+        loop = asyncio.get_running_loop()
+        
+        async with self._semaphore:
+            for attempt in range(1, self.max_attempts + 1):
+                await self._limiter_for(url).acquire()
+                
+                started = time.perf_counter()
+                try:
+                    outcome, size = await loop.run_in_executor(
+                        self._executor, self.fetch, url, filename, metadata
+                    )
+                except RetryableDownloadError as e:
+                    self._record(url, attempt, 'retry', started, 0)
+                    if attempt == self.max_attempts:
+                        if self.logger:
+                            self.logger.error(f"Giving up on {url} after {attempt} attempts: {e}")
+                        self._report(url, 'failed', attempt)
+                        return 'failed'
+                    
+                    # Full jitter spreads retries so workers don't hit the host in lockstep
+                    delay = random.uniform(0, self.backoff_base * (2 ** (attempt - 1)))
+                    if self.logger:
+                        self.logger.warning(f"Retrying {url} in {delay:.1f}s (attempt {attempt}): {e}")
+                    await asyncio.sleep(delay)
+                    continue
+                
+                self._record(url, attempt, outcome, started, size)
+                self._report(url, outcome, attempt)
+                return outcome
+        
+        return 'failed'
+    
+    def _report(self, url: str, outcome: str, attempts: int) -> None:
+        """Pass a URL's final outcome to the on_result callback."""
+        if self.on_result:
+            last = self.timings[-1]
+            self.on_result(url, outcome, attempts, last['bytes'], last['latency_ms'])
+    
+    def _record(self, url: str, attempt: int, outcome: str, started: float, size: int) -> None:
+        """Store the timing of one request."""
+        self.timings.append({
+            'url': url,
+            'attempt': attempt,
+            'outcome': outcome,
+            'latency_ms': round((time.perf_counter() - started) * 1000, 2),
+            'bytes': size
+        })
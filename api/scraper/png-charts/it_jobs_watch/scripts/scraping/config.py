@@ -60,8 +60,19 @@ RATE_LIMIT_DELAY = 1.0
 
 OUTPUT_DIR = "data/scraped/itjobswatch"
 
+# Index of downloaded charts, relative to OUTPUT_DIR
+MANIFEST_FILENAME = "manifest.jsonl"
+
+# Crawl journal used by --resume, relative to OUTPUT_DIR
+JOURNAL_FILENAME = "crawl_journal.jsonl"
+
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 
 REQUEST_TIMEOUT = 30
 
-MAX_RETRIES = 3
\ No newline at end of file
+MAX_RETRIES = 3
+
+# Async download engine configuration
+DEFAULT_CONCURRENCY = 4  # downloads in flight at once
+DEFAULT_RPS = 1.0 / RATE_LIMIT_DELAY  # requests-per-second ceiling per host
+DOWNLOAD_CHUNK_SIZE = 64 * 1024  # bytes per streamed write
\ No newline at end of file
@@ -0,0 +1,137 @@
+"""
+Manifest index of downloaded WebP charts.
+
+One JSON line is appended per download, so the manifest survives a crash
+mid-crawl. On load the lines are replayed into an in-memory dictionary,
+giving O(1) lookups by (skill, location, chart_type, job_type, time_period)
+without walking the output directories.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from config import MANIFEST_FILENAME
+from url_builder import generate_chart_key
+
+
+def sha256_file(filepath: Path) -> str:
+    """Compute the SHA-256 of a file on disk."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ChartManifest:
+    """Append-only manifest mapping chart identities to stored files."""
+    
+    def __init__(self, base_dir: Path, filename: str = MANIFEST_FILENAME):
+        """
+        Load (or create) the manifest in a scraper output directory.
+        
+        Args:
+            base_dir: Scraper output directory; entry paths are relative to it
+            filename: Manifest filename
+        """
+        self.base_dir = Path(base_dir)
+        self.path = self.base_dir / filename
+        self.entries: Dict[str, Dict] = {}
+        
+        # record() is called from the download engine's worker threads
+        self._lock = threading.Lock()
+        
+        if self.path.exists():
+            self._load()
+    
+    def _load(self) -> None:
+        """Replay the manifest lines; later lines override earlier ones."""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Tolerate a torn final line after a crash
+                self.entries[entry['key']] = entry
+    
+    def lookup(self, skill: str, location: str, chart_type: str, 
+               job_type: str, time_period: str) -> Optional[Dict]:
+        """
+        Look up a chart in the manifest.
+        
+        Returns:
+            Manifest entry dictionary, or None if the chart was never recorded
+        """
+        return self.entries.get(generate_chart_key(skill, location, chart_type, job_type, time_period))
+    
+    def is_complete(self, metadata: Dict) -> bool:
+        """
+        Check whether a chart is recorded and its file is still on disk.
+        
+        Args:
+            metadata: URL metadata dictionary from url_builder
+        """
+        entry = self.lookup(metadata['skill'], metadata['location'], metadata['chart_type'],
+                            metadata['job_type'], metadata['time_period'])
+        return entry is not None and (self.base_dir / entry['path']).exists()
+    
+    def record(self, metadata: Dict, filepath: Path, sha256: Optional[str] = None,
+               downloaded_at: Optional[str] = None) -> Dict:
+        """
+        Record a stored chart and append it to the manifest file.
+        
+        Args:
+            metadata: URL metadata dictionary from url_builder
+            filepath: Path of the stored WebP file
+            sha256: Content hash (computed from the file if not given)
+            downloaded_at: ISO timestamp (defaults to now)
+        
+        Returns:
+            The manifest entry
+        """
+        filepath = Path(filepath)
+        entry = {
+            'key': generate_chart_key(metadata['skill'], metadata['location'], metadata['chart_type'],
+                                      metadata['job_type'], metadata['time_period']),
+            'skill': metadata['skill'],
+            'location': metadata['location'],
+            'chart_type': metadata['chart_type'],
+            'job_type': metadata['job_type'],
+            'time_period': metadata['time_period'],
+            'url': metadata.get('url'),
+            'path': os.path.relpath(filepath, self.base_dir),
+            'sha256': sha256 or sha256_file(filepath),
+            'bytes': filepath.stat().st_size,
+            'downloaded_at': downloaded_at or datetime.now().isoformat()
+        }
+        
+        line = json.dumps(entry) + '\n'
+        with self._lock:
+            self.entries[entry['key']] = entry
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+        
+        return entry
+    
+    def compact(self) -> None:
+        """Rewrite the manifest with one line per chart, dropping superseded lines."""
+        tmp_path = self.path.with_suffix('.tmp')
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for entry in self.entries.values():
+                    f.write(json.dumps(entry) + '\n')
+            os.replace(tmp_path, self.path)
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.entries.values())
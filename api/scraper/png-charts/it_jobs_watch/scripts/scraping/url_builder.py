@@ -36,19 +36,34 @@ def build_chart_url(skill: str, location: str = "uk", chart_type: str = "demand-
 def generate_filename(skill: str, location: str, chart_type: str, 
                      job_type: str, time_period: str) -> str:
     """
-    Generate a simple filename for the downloaded WebP file.
+    Generate a filename for the downloaded WebP file.
+    
+    Files are stored in a per-location, per-chart-type directory, so the
+    filename carries the job type and time period to keep every variant of
+    a chart distinct.
     
     Args:
         skill: The skill/technology keyword
-        location: Geographic location (unused for filename)
-        chart_type: Type of chart (unused for filename)
-        job_type: Type of job (unused for filename)
-        time_period: Time period for the chart (unused for filename)
+        location: Geographic location (encoded in the directory, not the filename)
+        chart_type: Type of chart (encoded in the directory, not the filename)
+        job_type: Type of job
+        time_period: Time period for the chart
+    
+    Returns:
+        Filename string (e.g., 'artificial-intelligence_permanent_m2x.webp')
+    """
+    return f"{skill}_{job_type}_{time_period}.webp"
+
+
+def generate_chart_key(skill: str, location: str, chart_type: str, 
+                      job_type: str, time_period: str) -> str:
+    """
+    Generate the manifest key identifying one chart in the URL matrix.
     
     Returns:
-        Simple filename string (e.g., 'artificial-intelligence.webp')
+        Key string (e.g., 'python|uk/england/london|demand-trend|permanent|m2x')
     """
-    return f"{skill}.webp"
+    return "|".join([skill, location, chart_type, job_type, time_period])
 
 
 def generate_all_urls() -> List[Tuple[str, str, Dict[str, str]]]:
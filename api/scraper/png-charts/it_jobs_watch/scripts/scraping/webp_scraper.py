@@ -4,56 +4,88 @@ Downloads WebP chart images and saves them with metadata.
 """
 
 import os
+import sys
 import json
-import time
+import hashlib
 import logging
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import List, Tuple, Dict, Optional
 import requests
 from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 from config import (
-    OUTPUT_DIR, USER_AGENT, REQUEST_TIMEOUT, MAX_RETRIES, RATE_LIMIT_DELAY
+    OUTPUT_DIR, USER_AGENT, REQUEST_TIMEOUT, MAX_RETRIES,
+    DEFAULT_CONCURRENCY, DEFAULT_RPS, DOWNLOAD_CHUNK_SIZE, JOURNAL_FILENAME
 )
 from url_builder import generate_all_urls, generate_priority_urls
+from manifest import ChartManifest
+from async_downloader import AsyncDownloadEngine, RetryableDownloadError, percentile
+
+# Statuses retried by the download engine (with jittered backoff)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Shared scraper utilities live in api/scraper
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+
+from http_cache import HTTPCache, DEFAULT_CACHE_DIR, mount_cache
+from crawl_journal import CrawlJournal, STATUS_DONE, STATUS_FAILED
 
 
 class WebPScraper:
     """WebP chart scraper for ITJobsWatch."""
     
-    def __init__(self, output_dir: str = OUTPUT_DIR):
+    def __init__(self, output_dir: str = OUTPUT_DIR, cache: Optional[HTTPCache] = None,
+                 refresh: bool = False, concurrency: int = DEFAULT_CONCURRENCY,
+                 rps: float = DEFAULT_RPS, journal: Optional[CrawlJournal] = None):
         self.base_output_dir = Path(output_dir)
+        self.cache = cache
+        self.refresh = refresh  # Re-request (revalidate) files that already exist
+        self.concurrency = max(1, concurrency)
+        self.rps = rps
+        self.journal = journal
         self.session = self._create_session()
         self.logger = self._setup_logging()
         
         # Create base output directory
         self.base_output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Statistics
+        # Index of stored charts, used to resume without re-checking the filesystem
+        self.manifest = ChartManifest(self.base_output_dir)
+        
+        # Statistics (counted from the download engine's worker threads, see _count)
+        self._stats_lock = threading.Lock()
         self.stats = {
             'downloaded': 0,
             'skipped': 0,
+            'revalidated': 0,
             'errors': 0,
-            'total': 0
+            'total': 0,
+            'wall_clock_seconds': 0.0
         }
+        
+        # Per-request timings from the download engine
+        self.timings: List[Dict] = []
     
     def _create_session(self) -> requests.Session:
-        """Create a requests session with retry strategy."""
+        """Create a requests session sized for concurrent downloads."""
         session = requests.Session()
         
-        # Retry strategy
-        retry_strategy = Retry(
-            total=MAX_RETRIES,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS"],
-            backoff_factor=1
-        )
+        # Retries are handled by the download engine, which adds jitter to the backoff
+        adapter_kwargs = {
+            'max_retries': 0,
+            'pool_connections': self.concurrency,
+            'pool_maxsize': self.concurrency
+        }
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
+        if self.cache:
+            # Revalidate previously downloaded charts with If-None-Match/If-Modified-Since
+            mount_cache(session, self.cache, **adapter_kwargs)
+        else:
+            adapter = HTTPAdapter(**adapter_kwargs)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
         
         # Set headers
         session.headers.update({
@@ -95,17 +127,21 @@ class WebPScraper:
         
         return logger
     
-    def download_webp(self, url: str, filename: str, metadata: Dict) -> bool:
+    def _count(self, stat: str) -> None:
+        """Increment a statistics counter (safe from worker threads)."""
+        with self._stats_lock:
+            self.stats[stat] += 1
+    
+    def _chart_paths(self, filename: str, metadata: Dict) -> Tuple[Path, Path]:
         """
-        Download a single WebP file.
+        Resolve (and create) the storage location of a chart.
         
         Args:
-            url: URL to download
             filename: Local filename to save as
             metadata: Metadata dictionary for the file
         
         Returns:
-            True if successful, False otherwise
+            Tuple of (WebP file path, metadata directory)
         """
         # Create directory path based on location and chart type
         location_short = metadata['location'].split('/')[-1] if '/' in metadata['location'] else metadata['location']
@@ -117,55 +153,203 @@ class WebPScraper:
         output_dir.mkdir(parents=True, exist_ok=True)
         metadata_dir.mkdir(parents=True, exist_ok=True)
         
-        filepath = output_dir / filename
+        return output_dir / filename, metadata_dir
+    
+    def _skip_existing(self, filename: str, metadata: Dict) -> bool:
+        """
+        Check whether a chart is already stored and can be skipped.
+        
+        Args:
+            filename: Local filename to save as
+            metadata: Metadata dictionary for the file
+        
+        Returns:
+            True if the chart should not be requested
+        """
+        if self.refresh:
+            return False  # Refreshing revalidates everything against the HTTP cache
+        
+        # Skip charts the manifest already records
+        if self.manifest.is_complete(metadata):
+            self.logger.info(f"Skipping existing file: {filename}")
+            self._count('skipped')
+            return True
         
-        # Skip if file already exists
+        # File from a run that stopped before recording it: adopt it into the manifest
+        filepath, _ = self._chart_paths(filename, metadata)
         if filepath.exists():
+            self.manifest.record(metadata, filepath)
             self.logger.info(f"Skipping existing file: {filename}")
-            self.stats['skipped'] += 1
+            self._count('skipped')
             return True
         
+        return False
+    
+    def _skip_journaled(self, url: str, filename: str) -> bool:
+        """Skip URLs a resumed crawl journal already marks as done."""
+        if self.refresh or not self.journal or not self.journal.is_done(url):
+            return False
+        
+        self.logger.info(f"Skipping journaled URL: {filename}")
+        self._count('skipped')
+        return True
+    
+    def _journal_result(self, url: str, outcome: str, attempts: int,
+                        size: int, latency_ms: float) -> None:
+        """Record a URL's final outcome in the crawl journal."""
+        if not self.journal:
+            return
+        
+        status = STATUS_DONE if outcome in ('downloaded', 'revalidated') else STATUS_FAILED
+        self.journal.record(url, status, attempts=attempts, num_bytes=size, latency_ms=latency_ms)
+    
+    def _fetch_chart(self, url: str, filename: str, metadata: Dict) -> Tuple[str, int]:
+        """
+        Request a chart and stream it to disk (runs on a worker thread).
+        
+        Args:
+            url: URL to download
+            filename: Local filename to save as
+            metadata: Metadata dictionary for the file
+        
+        Returns:
+            Tuple of (outcome, bytes written) where outcome is 'downloaded',
+            'revalidated' or 'error'
+        
+        Raises:
+            RetryableDownloadError: On connection errors, timeouts and retryable statuses
+        """
+        filepath, metadata_dir = self._chart_paths(filename, metadata)
+        
         try:
             self.logger.info(f"Downloading: {url}")
             
-            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            
-            # Check if response is actually a WebP image
-            if not response.headers.get('content-type', '').startswith('image/'):
-                self.logger.warning(f"Unexpected content type for {url}: {response.headers.get('content-type')}")
-                self.stats['errors'] += 1
-                return False
-            
-            # Save the WebP file
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
-            
-            # Save metadata in file-data subdirectory
-            metadata_file = metadata_dir / f"{filepath.stem}.json"
-            metadata_with_download = metadata.copy()
-            metadata_with_download.update({
-                'downloaded_at': datetime.now().isoformat(),
-                'file_size': len(response.content),
-                'content_type': response.headers.get('content-type'),
-                'status_code': response.status_code
-            })
-            
-            with open(metadata_file, 'w') as f:
-                json.dump(metadata_with_download, f, indent=2)
-            
-            self.logger.info(f"Successfully downloaded: {filename} ({len(response.content)} bytes)")
-            self.stats['downloaded'] += 1
-            return True
-            
+            # Bodies are streamed unless the HTTP cache needs them in memory to store
+            with self.session.get(url, timeout=REQUEST_TIMEOUT, stream=not self.cache) as response:
+                if response.status_code in RETRY_STATUSES:
+                    raise RetryableDownloadError(f"HTTP {response.status_code}")
+                response.raise_for_status()
+                
+                # Check if response is actually a WebP image
+                if not response.headers.get('content-type', '').startswith('image/'):
+                    self.logger.warning(f"Unexpected content type for {url}: {response.headers.get('content-type')}")
+                    self._count('errors')
+                    return 'error', 0
+                
+                # 304 Not Modified answered from the cache: the file on disk is current
+                if getattr(response, 'from_cache', False) and filepath.exists():
+                    if not self.manifest.is_complete(metadata):
+                        self.manifest.record(metadata, filepath)
+                    self.logger.info(f"Not modified: {filename}")
+                    self._count('revalidated')
+                    return 'revalidated', 0
+                
+                # Stream the WebP file to a temporary file so an interrupted write
+                # is never mistaken for a download
+                digest = hashlib.sha256()
+                size = 0
+                tmp_path = filepath.with_suffix('.tmp')
+                with open(tmp_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        digest.update(chunk)
+                        size += len(chunk)
+                os.replace(tmp_path, filepath)
+                
+                content_type = response.headers.get('content-type')
+                status_code = response.status_code
+        
+        except RetryableDownloadError:
+            raise
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                requests.exceptions.ChunkedEncodingError) as e:
+            raise RetryableDownloadError(str(e)) from e
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Failed to download {url}: {e}")
-            self.stats['errors'] += 1
-            return False
+            self._count('errors')
+            return 'error', 0
         except Exception as e:
             self.logger.error(f"Unexpected error downloading {url}: {e}")
-            self.stats['errors'] += 1
-            return False
+            self._count('errors')
+            return 'error', 0
+        
+        sha256 = digest.hexdigest()
+        downloaded_at = datetime.now().isoformat()
+        
+        # Save metadata in file-data subdirectory
+        metadata_file = metadata_dir / f"{filepath.stem}.json"
+        metadata_with_download = metadata.copy()
+        metadata_with_download.update({
+            'downloaded_at': downloaded_at,
+            'file_size': size,
+            'sha256': sha256,
+            'content_type': content_type,
+            'status_code': status_code
+        })
+        
+        with open(metadata_file, 'w') as f:
+            json.dump(metadata_with_download, f, indent=2)
+        
+        self.manifest.record(metadata, filepath, sha256=sha256, downloaded_at=downloaded_at)
+        
+        self.logger.info(f"Successfully downloaded: {filename} ({size} bytes)")
+        self._count('downloaded')
+        return 'downloaded', size
+    
+    def download_webp(self, url: str, filename: str, metadata: Dict) -> bool:
+        """
+        Download a single WebP file.
+        
+        Args:
+            url: URL to download
+            filename: Local filename to save as
+            metadata: Metadata dictionary for the file
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        return self._download_all([(url, filename, metadata)]) == 0
+    
+    def _download_all(self, url_list: List[Tuple[str, str, Dict]]) -> int:
+        """
+        Download a list of charts through the async engine.
+        
+        Args:
+            url_list: List of (url, filename, metadata) tuples
+        
+        Returns:
+            Number of URLs that failed
+        """
+        if self.journal:
+            self.journal.plan(url for url, _, _ in url_list)
+        
+        pending = [
+            (url, filename, metadata)
+            for url, filename, metadata in url_list
+            if not self._skip_journaled(url, filename) and not self._skip_existing(filename, metadata)
+        ]
+        
+        self.logger.info(
+            f"{len(pending)} to download ({len(url_list) - len(pending)} already stored), "
+            f"concurrency={self.concurrency}, rps={self.rps}"
+        )
+        
+        engine = AsyncDownloadEngine(
+            self._fetch_chart,
+            concurrency=self.concurrency,
+            rps=self.rps,
+            max_attempts=MAX_RETRIES + 1,
+            logger=self.logger,
+            on_result=self._journal_result
+        )
+        outcomes = engine.run(pending)
+        
+        # Retries exhausted: _fetch_chart never got to count these
+        self.stats['errors'] += outcomes.count('failed')
+        self.stats['wall_clock_seconds'] += engine.wall_clock_seconds
+        self.timings.extend(engine.timings)
+        
+        return outcomes.count('error') + outcomes.count('failed')
     
     def scrape_priority_charts(self) -> None:
         """Scrape a priority subset of charts for testing."""
@@ -174,14 +358,7 @@ class WebPScraper:
         
         self.logger.info(f"Starting priority scrape of {len(urls)} charts...")
         
-        for i, (url, filename, metadata) in enumerate(urls, 1):
-            self.logger.info(f"Progress: {i}/{len(urls)}")
-            
-            self.download_webp(url, filename, metadata)
-            
-            # Rate limiting
-            if i < len(urls):  # Don't delay after the last request
-                time.sleep(RATE_LIMIT_DELAY)
+        self._download_all(urls)
         
         self._log_final_stats()
     
@@ -192,14 +369,7 @@ class WebPScraper:
         
         self.logger.info(f"Starting full scrape of {len(urls)} charts...")
         
-        for i, (url, filename, metadata) in enumerate(urls, 1):
-            self.logger.info(f"Progress: {i}/{len(urls)}")
-            
-            self.download_webp(url, filename, metadata)
-            
-            # Rate limiting
-            if i < len(urls):  # Don't delay after the last request
-                time.sleep(RATE_LIMIT_DELAY)
+        self._download_all(urls)
         
         self._log_final_stats()
     
@@ -209,14 +379,7 @@ class WebPScraper:
         
         self.logger.info(f"Starting custom scrape of {len(url_list)} charts...")
         
-        for i, (url, filename, metadata) in enumerate(url_list, 1):
-            self.logger.info(f"Progress: {i}/{len(url_list)}")
-            
-            self.download_webp(url, filename, metadata)
-            
-            # Rate limiting
-            if i < len(url_list):  # Don't delay after the last request
-                time.sleep(RATE_LIMIT_DELAY)
+        self._download_all(url_list)
         
         self._log_final_stats()
     
@@ -226,12 +389,30 @@ class WebPScraper:
         self.logger.info(f"Total URLs: {self.stats['total']}")
         self.logger.info(f"Downloaded: {self.stats['downloaded']}")
         self.logger.info(f"Skipped (existing): {self.stats['skipped']}")
+        self.logger.info(f"Revalidated (not modified): {self.stats['revalidated']}")
         self.logger.info(f"Errors: {self.stats['errors']}")
+        self.logger.info(f"Manifest entries: {len(self.manifest)}")
+        
+        latencies = [t['latency_ms'] for t in self.timings]
+        self.stats['requests'] = len(self.timings)
+        self.stats['latency_p50_ms'] = percentile(latencies, 50)
+        self.stats['latency_p95_ms'] = percentile(latencies, 95)
+        self.stats['wall_clock_seconds'] = round(self.stats['wall_clock_seconds'], 3)
+        self.logger.info(
+            f"Wall clock: {self.stats['wall_clock_seconds']:.1f}s, "
+            f"latency p50={self.stats['latency_p50_ms']:.0f}ms p95={self.stats['latency_p95_ms']:.0f}ms"
+        )
+        
+        # Drop superseded manifest lines now that the run has finished
+        self.manifest.compact()
         
         # Save stats to file
         stats_file = self.base_output_dir / 'scrape_stats.json'
         stats_with_timestamp = self.stats.copy()
         stats_with_timestamp['completed_at'] = datetime.now().isoformat()
+        stats_with_timestamp['concurrency'] = self.concurrency
+        stats_with_timestamp['rps'] = self.rps
+        stats_with_timestamp['request_timings'] = self.timings
         
         with open(stats_file, 'w') as f:
             json.dump(stats_with_timestamp, f, indent=2)
@@ -246,10 +427,30 @@ def main():
                        default='priority', help='Scraping mode')
     parser.add_argument('--output-dir', default=OUTPUT_DIR, 
                        help='Output directory for downloaded files')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                       help='HTTP cache directory shared with the table scraper')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Disable conditional-request HTTP caching')
+    parser.add_argument('--refresh', action='store_true',
+                       help='Revalidate existing files instead of skipping them')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                       help=f'Number of downloads in flight (default: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--rps', type=float, default=DEFAULT_RPS,
+                       help=f'Maximum requests per second per host (default: {DEFAULT_RPS})')
+    parser.add_argument('--resume', action='store_true',
+                       help='Resume the previous crawl, requesting only URLs still pending or failed')
     
     args = parser.parse_args()
     
-    scraper = WebPScraper(output_dir=args.output_dir)
+    cache = None if args.no_cache else HTTPCache(args.cache_dir)
+    journal = CrawlJournal(Path(args.output_dir) / JOURNAL_FILENAME, resume=args.resume)
+    if args.resume:
+        counts = journal.counts()
+        print(f"Resuming crawl: {counts['done']} URLs done, "
+              f"{counts['pending'] + counts['failed']} pending or failed")
+    
+    scraper = WebPScraper(output_dir=args.output_dir, cache=cache, refresh=args.refresh,
+                          concurrency=args.concurrency, rps=args.rps, journal=journal)
     
     if args.mode == 'priority':
         scraper.scrape_priority_charts()
@@ -270,6 +471,8 @@ def main():
             'url': url
         }
         scraper.scrape_custom_urls([(url, filename, metadata)])
+    
+    journal.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,75 @@
+"""Benchmark the HTML parser backends against the saved debug_output.html page."""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Allow running as a plain script from any directory
+sys.path.insert(0, str(Path(__file__).parent))
+
+from html_parsers import PARSER_BACKENDS, get_parser
+
+
+def benchmark_backend(backend: str, content: bytes, iterations: int) -> dict:
+    """
+    Parse the same page repeatedly with one backend.
+    
+    Args:
+        backend: Parser backend name
+        content: Raw HTML bytes
+        iterations: Number of times to parse the page
+    
+    Returns:
+        Dictionary of timing results
+    """
+    parser = get_parser(backend)
+    
+    # Warm up (imports, XPath compilation, caches)
+    rows, total_results = parser.parse(content)
+    
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parser.parse(content)
+    elapsed = time.perf_counter() - start
+    
+    return {
+        'backend': backend,
+        'rows_per_page': len(rows),
+        'total_results': total_results,
+        'seconds_per_page': elapsed / iterations,
+        'rows_per_second': len(rows) * iterations / elapsed,
+        'rows': rows
+    }
+
+
+def main():
+    """Run the benchmark and print rows/sec for every backend."""
+    parser = argparse.ArgumentParser(description='Benchmark ITJobsWatch HTML parser backends')
+    parser.add_argument('--html', default=str(Path(__file__).parent / 'debug_output.html'),
+                        help='Saved results page to parse')
+    parser.add_argument('--iterations', type=int, default=50, help='Parses per backend')
+    args = parser.parse_args()
+    
+    content = Path(args.html).read_bytes()
+    print(f"Benchmarking {len(PARSER_BACKENDS)} backends on {args.html} ({len(content):,} bytes, "
+          f"{args.iterations} iterations)")
+    
+    results = [benchmark_backend(name, content, args.iterations) for name in PARSER_BACKENDS]
+    
+    print(f"\n{'Backend':<8} {'Rows':>5} {'ms/page':>9} {'rows/sec':>10}")
+    print("-" * 35)
+    for result in results:
+        print(f"{result['backend']:<8} {result['rows_per_page']:>5} "
+              f"{result['seconds_per_page'] * 1000:>9.2f} {result['rows_per_second']:>10,.0f}")
+    
+    baseline = results[0]
+    for result in results[1:]:
+        speedup = baseline['seconds_per_page'] / result['seconds_per_page']
+        identical = result['rows'] == baseline['rows'] and result['total_results'] == baseline['total_results']
+        print(f"\n{result['backend']} vs {baseline['backend']}: {speedup:.1f}x faster, "
+              f"output {'identical' if identical else 'DIFFERS'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -11,8 +11,13 @@ REQUEST_TIMEOUT = 30
 MAX_RETRIES = 3
 RATE_LIMIT_DELAY = 1.0  # seconds between requests
 
+# Concurrent fetch configuration
+DEFAULT_CONCURRENCY = 1  # pages in flight at once (1 = sequential)
+DEFAULT_RPS = 1.0 / RATE_LIMIT_DELAY  # requests-per-second ceiling
+
 # Output configuration
 OUTPUT_DIR = "data/scraped/itjobswatch/table-data"
+JOURNAL_FILENAME = "crawl_journal.jsonl"  # Crawl journal, relative to OUTPUT_DIR
 
 # Default search parameters
 DEFAULT_PARAMS = {
@@ -26,6 +31,21 @@ DEFAULT_PARAMS = {
     'orderby': '0'  # Order (0 = ascending)
 }
 
+# Locations crawled in batch mode (ITJobsWatch 'll' location filter values)
+LOCATIONS = [
+    "UK",
+    "London",
+    "Manchester",
+    "Birmingham",
+    "Leeds",
+    "Bristol",
+    "Cambridge",
+    "Edinburgh",
+    "Glasgow",
+    "Cardiff",
+    "Belfast"
+]
+
 # Results per page (typically 50 on IT Jobs Watch)
 RESULTS_PER_PAGE = 50
 
@@ -0,0 +1,336 @@
+"""
+HTML parser backends for ITJobsWatch results pages.
+
+Each backend turns a raw results page into a list of row dictionaries
+(the format expected by JobListing.from_row_data) plus the total result
+count from the "Results x - y of N" summary.
+"""
+
+import logging
+import traceback
+from typing import Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
+
+
+logger = logging.getLogger('itjobswatch_table_scraper')
+
+# Column classes used by the results table
+# c2: skill name, c3: rank, c4: rank change, c5: salary, c6: salary change, c7: historical, c8: live
+COLUMN_CLASSES = ('c2', 'c3', 'c4', 'c5', 'c6', 'c7', 'c8')
+
+
+def _parse_total_from_text(results_text: str) -> int:
+    """
+    Parse the total count out of text like "Results 1 - 50 of 5,261".
+    
+    Args:
+        results_text: Summary text
+    
+    Returns:
+        Total number of results, or 0 if it cannot be parsed
+    """
+    parts = results_text.strip().split()
+    if 'of' in parts:
+        total_index = parts.index('of') + 1
+        if total_index < len(parts):
+            total_str = parts[total_index].replace(',', '')
+            return int(total_str)
+    return 0
+
+
+class BeautifulSoupTableParser:
+    """Results page parser built on BeautifulSoup's html.parser tree."""
+    
+    name = 'bs4'
+    
+    def parse(self, content: bytes) -> Tuple[List[Dict[str, str]], int]:
+        """
+        Parse a results page.
+        
+        Args:
+            content: Raw HTML bytes
+        
+        Returns:
+            Tuple of (list of row dictionaries, total results count)
+        """
+        soup = BeautifulSoup(content, 'html.parser')
+        
+        total_results = self._extract_total_results(soup)
+        
+        # Find the main results table
+        table = soup.find('table', class_='results')
+        if not table:
+            logger.warning("Could not find results table on page")
+            return [], total_results
+        
+        rows = []
+        for i, row in enumerate(table.find_all('tr')):
+            if i == 0:  # Skip header
+                continue
+            
+            row_data = self._parse_table_row(row)
+            if row_data:
+                rows.append(row_data)
+        
+        return rows, total_results
+    
+    def _parse_table_row(self, row_element) -> Optional[Dict[str, str]]:
+        """
+        Parse a single table row from the HTML.
+        
+        Args:
+            row_element: BeautifulSoup element for the row
+        
+        Returns:
+            Dictionary with parsed data or None if parsing fails
+        """
+        try:
+            skill_cell = row_element.find('td', class_='c2')
+            if not skill_cell:
+                return None
+            
+            # Extract skill name
+            skill_link = skill_cell.find('a')
+            skill_name = skill_link.text.strip() if skill_link else skill_cell.text.strip()
+            
+            # Extract rank
+            rank_cell = row_element.find('td', class_='c3')
+            rank = rank_cell.text.strip() if rank_cell else '0'
+            
+            # Extract rank change
+            rank_change_cell = row_element.find('td', class_='c4')
+            rank_change = '0'
+            if rank_change_cell:
+                # The change is in the text after any span elements
+                change_text = rank_change_cell.text.strip()
+                if change_text and change_text != '0':
+                    rank_change = change_text
+            
+            # Extract median salary
+            salary_cell = row_element.find('td', class_='c5')
+            median_salary = salary_cell.text.strip() if salary_cell else '-'
+            
+            # Extract salary change
+            salary_change_cell = row_element.find('td', class_='c6')
+            salary_change = salary_change_cell.text.strip() if salary_change_cell else '-'
+            
+            # Extract historical vacancies
+            hist_cell = row_element.find('td', class_='c7')
+            historical_vacancies = '-'
+            if hist_cell:
+                # Get the main number
+                hist_text = hist_cell.contents[0].strip() if hist_cell.contents else ''
+                # Get the percentage from span
+                hist_span = hist_cell.find('span', class_='data-relative')
+                hist_pct = hist_span.text.strip() if hist_span else ''
+                if hist_text and hist_pct:
+                    historical_vacancies = f"{hist_text} {hist_pct}"
+                elif hist_text:
+                    historical_vacancies = hist_text
+            
+            # Extract live jobs
+            live_cell = row_element.find('td', class_='c8')
+            live_jobs = '0'
+            if live_cell:
+                live_link = live_cell.find('a')
+                live_jobs = live_link.text.strip() if live_link else live_cell.text.strip()
+            
+            logger.debug(f"Parsed: {skill_name}, rank={rank}, change={rank_change}, salary={median_salary}")
+            
+            return {
+                'skill_name': skill_name,
+                'rank': rank,
+                'rank_change': rank_change,
+                'median_salary': median_salary,
+                'salary_change': salary_change,
+                'historical_vacancies': historical_vacancies,
+                'live_jobs': live_jobs
+            }
+        
+        except Exception as e:
+            logger.error(f"Error parsing table row: {e}")
+            logger.debug(traceback.format_exc())
+            return None
+    
+    def _extract_total_results(self, soup: BeautifulSoup) -> int:
+        """
+        Extract total number of results from the page.
+        
+        Args:
+            soup: BeautifulSoup object of the page
+        
+        Returns:
+            Total number of results
+        """
+        try:
+            # Look for results text like "Results 1 - 50 of 5,261"
+            results_text = soup.find(text=lambda t: t and 'Results' in t and 'of' in t)
+            if results_text:
+                return _parse_total_from_text(results_text)
+        except Exception as e:
+            logger.error(f"Error extracting total results: {e}")
+        
+        return 0
+
+
+class LxmlTableParser:
+    """Results page parser using lxml and compiled XPath expressions."""
+    
+    name = 'lxml'
+    
+    # Compiled once at import time and reused for every page
+    _RESULT_ROWS = etree.XPath(
+        "(//table[contains(concat(' ', normalize-space(@class), ' '), ' results ')])[1]//tr"
+    )
+    _RESULTS_TEXT = etree.XPath("//text()[contains(., 'Results') and contains(., 'of')]")
+    _RELATIVE_SPAN = etree.XPath(
+        ".//span[contains(concat(' ', normalize-space(@class), ' '), ' data-relative ')]"
+    )
+    
+    def parse(self, content: bytes) -> Tuple[List[Dict[str, str]], int]:
+        """
+        Parse a results page.
+        
+        Args:
+            content: Raw HTML bytes
+        
+        Returns:
+            Tuple of (list of row dictionaries, total results count)
+        """
+        document = lxml_html.fromstring(content)
+        
+        total_results = self._extract_total_results(document)
+        
+        rows = self._RESULT_ROWS(document)
+        if not rows:
+            logger.warning("Could not find results table on page")
+            return [], total_results
+        
+        parsed_rows = []
+        for row in rows[1:]:  # Skip header
+            row_data = self._parse_table_row(row)
+            if row_data:
+                parsed_rows.append(row_data)
+        
+        return parsed_rows, total_results
+    
+    def _parse_table_row(self, row_element) -> Optional[Dict[str, str]]:
+        """
+        Parse a single table row in one pass over its cells.
+        
+        Args:
+            row_element: lxml element for the row
+        
+        Returns:
+            Dictionary with parsed data or None if parsing fails
+        """
+        try:
+            # Index the row's cells by column class in a single scan
+            cells = {}
+            for cell in row_element.iter('td'):
+                for css_class in (cell.get('class') or '').split():
+                    if css_class in COLUMN_CLASSES:
+                        cells.setdefault(css_class, cell)
+            
+            skill_cell = cells.get('c2')
+            if skill_cell is None:
+                return None
+            
+            skill_name = self._link_or_cell_text(skill_cell)
+            
+            rank_cell = cells.get('c3')
+            rank = rank_cell.text_content().strip() if rank_cell is not None else '0'
+            
+            rank_change = '0'
+            rank_change_cell = cells.get('c4')
+            if rank_change_cell is not None:
+                change_text = rank_change_cell.text_content().strip()
+                if change_text and change_text != '0':
+                    rank_change = change_text
+            
+            salary_cell = cells.get('c5')
+            median_salary = salary_cell.text_content().strip() if salary_cell is not None else '-'
+            
+            salary_change_cell = cells.get('c6')
+            salary_change = salary_change_cell.text_content().strip() if salary_change_cell is not None else '-'
+            
+            historical_vacancies = '-'
+            hist_cell = cells.get('c7')
+            if hist_cell is not None:
+                hist_text = (hist_cell.text or '').strip()
+                hist_spans = self._RELATIVE_SPAN(hist_cell)
+                hist_pct = hist_spans[0].text_content().strip() if hist_spans else ''
+                if hist_text and hist_pct:
+                    historical_vacancies = f"{hist_text} {hist_pct}"
+                elif hist_text:
+                    historical_vacancies = hist_text
+            
+            live_cell = cells.get('c8')
+            live_jobs = self._link_or_cell_text(live_cell) if live_cell is not None else '0'
+            
+            return {
+                'skill_name': skill_name,
+                'rank': rank,
+                'rank_change': rank_change,
+                'median_salary': median_salary,
+                'salary_change': salary_change,
+                'historical_vacancies': historical_vacancies,
+                'live_jobs': live_jobs
+            }
+        
+        except Exception as e:
+            logger.error(f"Error parsing table row: {e}")
+            logger.debug(traceback.format_exc())
+            return None
+    
+    @staticmethod
+    def _link_or_cell_text(cell) -> str:
+        """Return the text of the cell's first link, or of the cell itself."""
+        link = next(cell.iter('a'), None)
+        return (link if link is not None else cell).text_content().strip()
+    
+    def _extract_total_results(self, document) -> int:
+        """
+        Extract total number of results from the page.
+        
+        Args:
+            document: Parsed lxml document
+        
+        Returns:
+            Total number of results
+        """
+        try:
+            matches = self._RESULTS_TEXT(document)
+            if matches:
+                return _parse_total_from_text(matches[0])
+        except Exception as e:
+            logger.error(f"Error extracting total results: {e}")
+        
+        return 0
+
+
+PARSER_BACKENDS = {
+    BeautifulSoupTableParser.name: BeautifulSoupTableParser,
+    LxmlTableParser.name: LxmlTableParser,
+}
+
+DEFAULT_PARSER_BACKEND = LxmlTableParser.name
+
+
+def get_parser(backend: str = DEFAULT_PARSER_BACKEND):
+    """
+    Create a results page parser for the named backend.
+    
+    Args:
+        backend: Backend name ('lxml' or 'bs4')
+    
+    Returns:
+        Parser instance
+    """
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(
+            f"Unknown parser backend '{backend}'. Choose from: {', '.join(PARSER_BACKENDS)}"
+        )
+    return PARSER_BACKENDS[backend]()
@@ -4,31 +4,58 @@ Scrapes job market statistics from ITJobsWatch listings.
 """
 
 import os
+import sys
 import csv
 import json
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 import requests
-from bs4 import BeautifulSoup
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 from .config import (
     BASE_URL, USER_AGENT, REQUEST_TIMEOUT, MAX_RETRIES, 
-    RATE_LIMIT_DELAY, OUTPUT_DIR, RESULTS_PER_PAGE, MAX_PAGES
+    OUTPUT_DIR, RESULTS_PER_PAGE, MAX_PAGES,
+    DEFAULT_CONCURRENCY, DEFAULT_RPS, LOCATIONS, JOURNAL_FILENAME
 )
 from .url_builder import build_table_url, parse_url_params
 from .models import JobListing, ScrapeMetadata
+from .rate_limiter import RateLimiter
+from .html_parsers import DEFAULT_PARSER_BACKEND, PARSER_BACKENDS, get_parser
+
+# Shared scraper utilities live one level up in api/scraper
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from http_cache import HTTPCache, DEFAULT_CACHE_DIR, mount_cache
+from crawl_journal import CrawlJournal, STATUS_DONE, STATUS_FAILED
 
 
 class ITJobsWatchTableScraper:
     """Scraper for IT Jobs Watch table data."""
     
-    def __init__(self, output_dir: str = OUTPUT_DIR):
+    def __init__(
+        self,
+        output_dir: str = OUTPUT_DIR,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        rps: float = DEFAULT_RPS,
+        parser_backend: str = DEFAULT_PARSER_BACKEND,
+        cache: Optional[HTTPCache] = None,
+        journal: Optional[CrawlJournal] = None
+    ):
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        
         self.output_dir = Path(output_dir)
+        self.concurrency = concurrency
+        self.rate_limiter = RateLimiter(rps)
+        self.parser = get_parser(parser_backend)
+        self.cache = cache
+        self.journal = journal
+        self.failed_urls = set()  # Pages whose last fetch failed
         self.session = self._create_session()
         self.logger = self._setup_logging()
         
@@ -47,9 +74,20 @@ class ITJobsWatchTableScraper:
             backoff_factor=1
         )
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
+        # Size the connection pool so every worker thread can keep a connection alive
+        adapter_kwargs = {
+            'max_retries': retry_strategy,
+            'pool_connections': self.concurrency,
+            'pool_maxsize': self.concurrency
+        }
+        
+        if self.cache:
+            # Revalidate previously seen pages with If-None-Match/If-Modified-Since
+            mount_cache(session, self.cache, **adapter_kwargs)
+        else:
+            adapter = HTTPAdapter(**adapter_kwargs)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
         
         # Set headers
         session.headers.update({
@@ -91,114 +129,6 @@ class ITJobsWatchTableScraper:
         
         return logger
     
-    def _parse_table_row(self, row_element) -> Optional[Dict[str, str]]:
-        """
-        Parse a single table row from the HTML.
-        
-        Args:
-            row_element: BeautifulSoup element for the row
-        
-        Returns:
-            Dictionary with parsed data or None if parsing fails
-        """
-        try:
-            # The data is in a structured format with specific column classes
-            # c2: skill name, c3: rank, c4: rank change, c5: salary, c6: salary change, c7: historical, c8: live
-            
-            skill_cell = row_element.find('td', class_='c2')
-            if not skill_cell:
-                return None
-            
-            # Extract skill name
-            skill_link = skill_cell.find('a')
-            skill_name = skill_link.text.strip() if skill_link else skill_cell.text.strip()
-            
-            # Extract rank
-            rank_cell = row_element.find('td', class_='c3')
-            rank = rank_cell.text.strip() if rank_cell else '0'
-            
-            # Extract rank change
-            rank_change_cell = row_element.find('td', class_='c4')
-            rank_change = '0'
-            if rank_change_cell:
-                # The change is in the text after any span elements
-                change_text = rank_change_cell.text.strip()
-                if change_text and change_text != '0':
-                    rank_change = change_text
-            
-            # Extract median salary
-            salary_cell = row_element.find('td', class_='c5')
-            median_salary = salary_cell.text.strip() if salary_cell else '-'
-            
-            # Extract salary change
-            salary_change_cell = row_element.find('td', class_='c6')
-            salary_change = salary_change_cell.text.strip() if salary_change_cell else '-'
-            
-            # Extract historical vacancies
-            hist_cell = row_element.find('td', class_='c7')
-            historical_vacancies = '-'
-            if hist_cell:
-                # Get the main number
-                hist_text = hist_cell.contents[0].strip() if hist_cell.contents else ''
-                # Get the percentage from span
-                hist_span = hist_cell.find('span', class_='data-relative')
-                hist_pct = hist_span.text.strip() if hist_span else ''
-                if hist_text and hist_pct:
-                    historical_vacancies = f"{hist_text} {hist_pct}"
-                elif hist_text:
-                    historical_vacancies = hist_text
-            
-            # Extract live jobs
-            live_cell = row_element.find('td', class_='c8')
-            live_jobs = '0'
-            if live_cell:
-                live_link = live_cell.find('a')
-                live_jobs = live_link.text.strip() if live_link else live_cell.text.strip()
-            
-            self.logger.debug(f"Parsed: {skill_name}, rank={rank}, change={rank_change}, salary={median_salary}")
-            
-            return {
-                'skill_name': skill_name,
-                'rank': rank,
-                'rank_change': rank_change,
-                'median_salary': median_salary,
-                'salary_change': salary_change,
-                'historical_vacancies': historical_vacancies,
-                'live_jobs': live_jobs
-            }
-            
-        except Exception as e:
-            self.logger.error(f"Error parsing table row: {e}")
-            import traceback
-            self.logger.debug(traceback.format_exc())
-            return None
-    
-    def _extract_total_results(self, soup: BeautifulSoup) -> int:
-        """
-        Extract total number of results from the page.
-        
-        Args:
-            soup: BeautifulSoup object of the page
-        
-        Returns:
-            Total number of results
-        """
-        try:
-            # Look for results text like "Results 1 - 50 of 5,261"
-            results_text = soup.find(text=lambda t: t and 'Results' in t and 'of' in t)
-            if results_text:
-                # Extract the total number
-                parts = results_text.strip().split()
-                if 'of' in parts:
-                    total_index = parts.index('of') + 1
-                    if total_index < len(parts):
-                        total_str = parts[total_index].replace(',', '')
-                        return int(total_str)
-        except Exception as e:
-            self.logger.error(f"Error extracting total results: {e}")
-        
-        return 0
-    
     def scrape_page(self, url: str, location: str) -> Tuple[List[JobListing], int]:
         """
         Scrape a single page of results.
@@ -210,51 +140,90 @@ class ITJobsWatchTableScraper:
         Returns:
             Tuple of (list of JobListing objects, total results count)
         """
+        # Pages completed by an earlier run are replayed from the journal
+        if self.journal and self.journal.is_done(url):
+            payload = self.journal.get(url).get('payload') or {}
+            self.logger.info(f"Replaying journaled page: {url}")
+            return self._build_listings(payload.get('rows', []), location), payload.get('total_results', 0)
+        
         listings = []
         total_results = 0
+        started = time.perf_counter()
         
         try:
             self.logger.info(f"Scraping page: {url}")
             
+            self.rate_limiter.acquire()
             response = self.session.get(url, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract total results on first page
-            total_results = self._extract_total_results(soup)
-            
-            # Find the main results table
-            # IT Jobs Watch uses a table structure for results
-            table = soup.find('table', class_='results')
-            
-            if table:
-                rows = table.find_all('tr')
-                
-                # Skip the header row
-                for i, row in enumerate(rows):
-                    if i == 0:  # Skip header
-                        continue
-                    
-                    row_data = self._parse_table_row(row)
-                    if row_data:
-                        try:
-                            listing = JobListing.from_row_data(row_data, location)
-                            listings.append(listing)
-                        except Exception as e:
-                            self.logger.error(f"Error creating JobListing: {e}")
-            else:
-                self.logger.warning("Could not find results table on page")
+            # Extract table rows and the total results count
+            rows, total_results = self.parser.parse(response.content)
+            listings = self._build_listings(rows, location)
             
             self.logger.info(f"Extracted {len(listings)} listings from page")
             
+            self.failed_urls.discard(url)
+            if self.journal:
+                self.journal.record(
+                    url, STATUS_DONE,
+                    num_bytes=len(response.content),
+                    latency_ms=(time.perf_counter() - started) * 1000,
+                    payload={'rows': rows, 'total_results': total_results}
+                )
+            
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Request error scraping {url}: {e}")
+            self._record_failure(url, started, e)
         except Exception as e:
             self.logger.error(f"Unexpected error scraping {url}: {e}")
+            self._record_failure(url, started, e)
         
         return listings, total_results
     
+    def _build_listings(self, rows: List[Dict[str, str]], location: str) -> List[JobListing]:
+        """Convert parsed row dictionaries into JobListing objects."""
+        listings = []
+        for row_data in rows:
+            try:
+                listing = JobListing.from_row_data(row_data, location)
+                listings.append(listing)
+            except Exception as e:
+                self.logger.error(f"Error creating JobListing: {e}")
+        return listings
+    
+    def _record_failure(self, url: str, started: float, error: Exception) -> None:
+        """Remember a failed page and journal it for a later --resume."""
+        self.failed_urls.add(url)
+        if self.journal:
+            self.journal.record(
+                url, STATUS_FAILED,
+                latency_ms=(time.perf_counter() - started) * 1000,
+                error=str(error)
+            )
+    
+    def _plan(self, urls: List[str]) -> None:
+        """Add URLs to the crawl journal before fetching them."""
+        if self.journal:
+            self.journal.plan(urls)
+    
+    def _finish_metadata(self, metadata: ScrapeMetadata, page_urls: Dict[int, str]) -> None:
+        """
+        Fill in page counts from what was actually fetched.
+        
+        Args:
+            metadata: Metadata for the location
+            page_urls: Planned page number -> URL
+        """
+        failed = sorted(page for page, url in page_urls.items() if url in self.failed_urls)
+        metadata.total_pages = len(page_urls)
+        metadata.pages_scraped = len(page_urls) - len(failed)
+        metadata.failed_pages = failed
+        
+        if failed:
+            metadata.success = False
+            metadata.error_message = f"{len(failed)} of {len(page_urls)} pages failed: {failed}"
+    
     def scrape_location(
         self, 
         location: str = "London",
@@ -273,8 +242,6 @@ class ITJobsWatchTableScraper:
             List of all JobListing objects
         """
         all_listings = []
-        page = 1
-        total_pages = 1
         
         metadata = ScrapeMetadata(
             location=location,
@@ -288,33 +255,28 @@ class ITJobsWatchTableScraper:
         try:
             # First page to get total results
             url = build_table_url(location=location, page=1, query=query)
+            page_urls = {1: url}
+            self._plan([url])
             listings, total_results = self.scrape_page(url, location)
             all_listings.extend(listings)
             
             # Calculate total pages
             if total_results > 0:
-                total_pages = (total_results + RESULTS_PER_PAGE - 1) // RESULTS_PER_PAGE
-                
-                # Apply max_pages limit
-                if max_pages:
-                    total_pages = min(total_pages, max_pages)
-                
-                total_pages = min(total_pages, MAX_PAGES)  # Safety limit
+                total_pages = self._page_count(total_results, max_pages)
                 
                 self.logger.info(f"Total results: {total_results}, Total pages: {total_pages}")
                 
                 # Scrape remaining pages
                 for page in range(2, total_pages + 1):
-                    url = build_table_url(location=location, page=page, query=query)
-                    listings, _ = self.scrape_page(url, location)
+                    page_urls[page] = build_table_url(location=location, page=page, query=query)
+                urls = [page_urls[page] for page in range(2, total_pages + 1)]
+                self._plan(urls)
+                for listings in self._fetch_pages(urls, location):
                     all_listings.extend(listings)
-                    
-                    # Rate limiting
-                    time.sleep(RATE_LIMIT_DELAY)
             
             metadata.total_records = len(all_listings)
-            metadata.total_pages = page
             metadata.success = True
+            self._finish_metadata(metadata, page_urls)
             
         except Exception as e:
             self.logger.error(f"Error during location scrape: {e}")
@@ -327,6 +289,153 @@ class ITJobsWatchTableScraper:
         
         return all_listings
     
+    def scrape_locations(
+        self,
+        locations: List[str],
+        max_pages: Optional[int] = None,
+        query: Optional[str] = None
+    ) -> Dict[str, List[JobListing]]:
+        """
+        Scrape several locations through a single work queue.
+        
+        Page 1 of every location is queued first; as soon as a location's
+        total is known its remaining pages join the same queue. All requests
+        share this scraper's session and rate limiter, so the global request
+        rate stays under the configured ceiling however many locations run.
+        
+        Args:
+            locations: Locations to scrape
+            max_pages: Maximum pages to scrape per location (None for all)
+            query: Optional search query
+        
+        Returns:
+            Dictionary mapping each location to its listings in page order
+        """
+        locations = list(dict.fromkeys(locations))  # De-duplicate, keep order
+        pages: Dict[str, Dict[int, List[JobListing]]] = {loc: {} for loc in locations}
+        remaining: Dict[str, int] = {}
+        page_urls: Dict[str, Dict[int, str]] = {
+            loc: {1: build_table_url(location=loc, page=1, query=query)} for loc in locations
+        }
+        metadata = {
+            loc: ScrapeMetadata(
+                location=loc,
+                total_records=0,
+                total_pages=0,
+                scrape_start=datetime.now(),
+                scrape_end=datetime.now(),
+                success=False
+            )
+            for loc in locations
+        }
+        
+        self.logger.info(f"Starting batch scrape of {len(locations)} locations")
+        self._plan([page_urls[loc][1] for loc in locations])
+        
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            first_pages = {
+                executor.submit(self.scrape_page, page_urls[loc][1], loc): loc
+                for loc in locations
+            }
+            page_futures = {}
+            
+            for future in as_completed(first_pages):
+                loc = first_pages[future]
+                try:
+                    listings, total_results = future.result()
+                except Exception as e:
+                    self.logger.error(f"Error scraping first page for {loc}: {e}")
+                    metadata[loc].error_message = str(e)
+                    metadata[loc].scrape_end = datetime.now()
+                    continue
+                
+                pages[loc][1] = listings
+                total_pages = self._page_count(total_results, max_pages) if total_results > 0 else 1
+                metadata[loc].success = True
+                remaining[loc] = total_pages - 1
+                
+                self.logger.info(f"{loc}: total results {total_results}, total pages {total_pages}")
+                
+                if total_pages == 1:
+                    metadata[loc].scrape_end = datetime.now()
+                
+                for page in range(2, total_pages + 1):
+                    page_urls[loc][page] = build_table_url(location=loc, page=page, query=query)
+                self._plan([page_urls[loc][page] for page in range(2, total_pages + 1)])
+                
+                for page in range(2, total_pages + 1):
+                    future = executor.submit(self.scrape_page, page_urls[loc][page], loc)
+                    page_futures[future] = (loc, page)
+            
+            for future in as_completed(page_futures):
+                loc, page = page_futures[future]
+                try:
+                    pages[loc][page] = future.result()[0]
+                except Exception as e:
+                    self.logger.error(f"Error scraping {loc} page {page}: {e}")
+                
+                remaining[loc] -= 1
+                if remaining[loc] == 0:
+                    metadata[loc].scrape_end = datetime.now()
+        
+        results = {}
+        for loc in locations:
+            results[loc] = [
+                listing
+                for page in sorted(pages[loc])
+                for listing in pages[loc][page]
+            ]
+            metadata[loc].total_records = len(results[loc])
+            if metadata[loc].success:
+                self._finish_metadata(metadata[loc], page_urls[loc])
+            self._save_metadata(metadata[loc], loc)
+        
+        total = sum(len(listings) for listings in results.values())
+        self.logger.info(f"Batch scrape complete: {total} listings across {len(locations)} locations")
+        
+        return results
+    
+    def _page_count(self, total_results: int, max_pages: Optional[int] = None) -> int:
+        """
+        Work out how many pages to fetch for a result count.
+        
+        Args:
+            total_results: Total results reported on page 1
+            max_pages: Optional caller-supplied page limit
+        
+        Returns:
+            Number of pages, capped by max_pages and the MAX_PAGES safety limit
+        """
+        total_pages = (total_results + RESULTS_PER_PAGE - 1) // RESULTS_PER_PAGE
+        
+        # Apply max_pages limit
+        if max_pages:
+            total_pages = min(total_pages, max_pages)
+        
+        return min(total_pages, MAX_PAGES)  # Safety limit
+    
+    def _fetch_pages(self, urls: List[str], location: str) -> List[List[JobListing]]:
+        """
+        Fetch several pages, keeping up to `concurrency` requests in flight.
+        
+        Requests are paced by the shared rate limiter, so raising concurrency
+        only hides network latency and never exceeds the configured rps.
+        
+        Args:
+            urls: Page URLs to fetch
+            location: Location for the listings
+        
+        Returns:
+            Listings for each URL, in the same order as `urls`
+        """
+        if self.concurrency == 1 or len(urls) <= 1:
+            return [self.scrape_page(url, location)[0] for url in urls]
+        
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            # executor.map yields results in submission order
+            results = executor.map(lambda url: self.scrape_page(url, location), urls)
+            return [listings for listings, _ in results]
+    
     def _save_metadata(self, metadata: ScrapeMetadata, location: str) -> None:
         """Save scraping metadata."""
         metadata_file = self.output_dir / f"{location.replace('/', '_')}_metadata.json"
@@ -359,6 +468,52 @@ class ITJobsWatchTableScraper:
                 writer.writerow(listing.to_dict())
         
         self.logger.info(f"Saved {len(listings)} listings to {filepath}")
+    
+    def save_to_parquet(self, listings: List[JobListing], filename: str) -> None:
+        """
+        Save listings to a Parquet file (requires pandas with pyarrow or fastparquet).
+        
+        Args:
+            listings: List of JobListing objects
+            filename: Output filename
+        """
+        import pandas as pd
+        
+        filepath = self.output_dir / filename
+        
+        if not listings:
+            self.logger.warning("No listings to save")
+            return
+        
+        df = pd.DataFrame([listing.to_dict() for listing in listings])
+        df.to_parquet(filepath, index=False)
+        
+        self.logger.info(f"Saved {len(listings)} listings to {filepath}")
+    
+    def save_listings(self, listings: List[JobListing], filename: str) -> None:
+        """Save listings as Parquet or CSV depending on the filename extension."""
+        if filename.endswith('.parquet'):
+            self.save_to_parquet(listings, filename)
+        else:
+            self.save_to_csv(listings, filename)
+
+
+def read_locations_file(path: str) -> List[str]:
+    """
+    Read locations from a text file, one per line.
+    
+    Blank lines and lines starting with '#' are ignored.
+    
+    Args:
+        path: Path to the locations file
+    
+    Returns:
+        List of location names
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = [line.strip() for line in f]
+    
+    return [line for line in lines if line and not line.startswith('#')]
 
 
 def main():
@@ -367,13 +522,70 @@ def main():
     
     parser = argparse.ArgumentParser(description='IT Jobs Watch Table Data Scraper')
     parser.add_argument('--location', default='London', help='Location to scrape')
+    parser.add_argument('--locations', nargs='+',
+                        help='Batch mode: scrape several locations into one output file')
+    parser.add_argument('--locations-file',
+                        help='Batch mode: file with one location per line')
+    parser.add_argument('--all-locations', action='store_true',
+                        help='Batch mode: scrape every location in config.LOCATIONS')
     parser.add_argument('--max-pages', type=int, help='Maximum pages to scrape')
     parser.add_argument('--query', help='Search query')
-    parser.add_argument('--output', help='Output filename (default: location_jobs.csv)')
+    parser.add_argument('--output',
+                        help='Output filename, .csv or .parquet (default: location_jobs.csv)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help='Number of pages to fetch in parallel (default: 1)')
+    parser.add_argument('--rps', type=float, default=DEFAULT_RPS,
+                        help=f'Maximum requests per second (default: {DEFAULT_RPS})')
+    parser.add_argument('--parser', choices=sorted(PARSER_BACKENDS), default=DEFAULT_PARSER_BACKEND,
+                        help=f'HTML parser backend (default: {DEFAULT_PARSER_BACKEND})')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f'HTTP cache directory shared with the chart scraper (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Disable conditional-request HTTP caching')
+    parser.add_argument('--resume', action='store_true',
+                        help='Resume the previous crawl, fetching only pages still pending or failed')
     
     args = parser.parse_args()
     
-    scraper = ITJobsWatchTableScraper()
+    # Collect batch locations, if any were requested
+    batch_locations = []
+    if args.all_locations:
+        batch_locations.extend(LOCATIONS)
+    if args.locations:
+        batch_locations.extend(args.locations)
+    if args.locations_file:
+        batch_locations.extend(read_locations_file(args.locations_file))
+    
+    journal = CrawlJournal(Path(OUTPUT_DIR) / JOURNAL_FILENAME, resume=args.resume)
+    if args.resume:
+        counts = journal.counts()
+        print(f"Resuming crawl: {counts['done']} pages done, "
+              f"{counts['pending'] + counts['failed']} pending or failed")
+    
+    scraper = ITJobsWatchTableScraper(
+        concurrency=args.concurrency,
+        rps=args.rps,
+        parser_backend=args.parser,
+        cache=None if args.no_cache else HTTPCache(args.cache_dir),
+        journal=journal
+    )
+    
+    if batch_locations:
+        results = scraper.scrape_locations(
+            batch_locations,
+            max_pages=args.max_pages,
+            query=args.query
+        )
+        listings = [listing for location_listings in results.values() for listing in location_listings]
+        filename = args.output or "all_locations_jobs.csv"
+        
+        scraper.save_listings(listings, filename)
+        journal.close()
+        
+        for location, location_listings in results.items():
+            print(f"  {location}: {len(location_listings)} listings")
+        print(f"Batch scraping complete. Saved {len(listings)} listings to {filename}")
+        return
     
     # Scrape the data
     listings = scraper.scrape_location(
@@ -389,11 +601,12 @@ def main():
         location_safe = args.location.replace('/', '_').lower()
         filename = f"{location_safe}_jobs.csv"
     
-    # Save to CSV
-    scraper.save_to_csv(listings, filename)
+    # Save to CSV or Parquet
+    scraper.save_listings(listings, filename)
+    journal.close()
     
     print(f"Scraping complete. Saved {len(listings)} listings to {filename}")
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
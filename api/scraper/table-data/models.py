@@ -2,9 +2,9 @@
 Data models for ITJobsWatch table data.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 import re
 
 
@@ -144,6 +144,8 @@ class ScrapeMetadata:
     scrape_end: datetime
     success: bool
     error_message: Optional[str] = None
+    pages_scraped: int = 0
+    failed_pages: List[int] = field(default_factory=list)
     
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON export."""
@@ -151,6 +153,8 @@ class ScrapeMetadata:
             'location': self.location,
             'total_records': self.total_records,
             'total_pages': self.total_pages,
+            'pages_scraped': self.pages_scraped,
+            'failed_pages': self.failed_pages,
             'scrape_start': self.scrape_start.isoformat(),
             'scrape_end': self.scrape_end.isoformat(),
             'success': self.success,
@@ -0,0 +1,45 @@
+"""
+Token-bucket rate limiter shared by concurrent page fetches.
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """Thread-safe token bucket that caps requests per second."""
+    
+    def __init__(self, rps: float, burst: Optional[int] = None):
+        """
+        Create a rate limiter.
+        
+        Args:
+            rps: Maximum sustained requests per second
+            burst: Maximum number of requests allowed back-to-back (default 1)
+        """
+        if rps <= 0:
+            raise ValueError(f"rps must be positive, got {rps}")
+        
+        self.rps = rps
+        self.capacity = float(burst or 1)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until a request slot is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed = now - self._last_refill
+                self._tokens = min(self.capacity, self._tokens + elapsed * self.rps)
+                self._last_refill = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                wait = (1 - self._tokens) / self.rps
+            
+            time.sleep(wait)
@@ -0,0 +1,205 @@
+"""Render-time benchmark for the normalized and comparison job board charts.
+
+The real job board CSV only covers a couple of dozen keywords, so the charts
+are rendered from synthetic boards with 30 or more categories (the size of
+the scraped skill tables), in full and draft mode. The JSON report records
+the median time per chart; passing a previous report as --baseline prints
+the speedup against it and exits with status 1 if a chart got slower than
+--max-slowdown allows.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from comparison_chart_generator import create_comparison_chart
+from normalized_chart_generator import create_normalized_stacked_chart
+
+
+BENCHMARK_VERSION = 1
+
+DEFAULT_SIZES = (30, 60, 120)
+BOARDS = ('LinkedIn', 'TotalJobs', 'CWJobs')
+MODES = ('full', 'draft')
+
+# A chart's median time may grow by this factor against a baseline report
+DEFAULT_MAX_SLOWDOWN = 1.5
+
+
+def synthetic_job_boards(n_categories: int, seed: int = 0) -> Tuple[Dict[str, Dict[str, int]], Dict[str, float]]:
+    """Job board counts and ITJobsWatch shares for n keywords.
+    
+    Args:
+        n_categories: Number of keywords
+        seed: Random seed (the same seed gives the same data)
+        
+    Returns:
+        Tuple of ({board_name: {keyword: count}}, {keyword: market_share_percentage})
+    """
+    rng = np.random.default_rng(seed)
+    keywords = [f'keyword {i:03d}' for i in range(n_categories)]
+    
+    # Long-tailed counts like the real boards, with some keywords missing per board
+    data = {}
+    for board in BOARDS:
+        counts = rng.pareto(1.2, n_categories) * 40
+        present = rng.random(n_categories) > 0.1
+        data[board] = {keyword: int(count) + 1 for keyword, count, shown in zip(keywords, counts, present) if shown}
+    
+    shares = {keyword: round(float(share), 2) for keyword, share in zip(keywords, rng.uniform(0.1, 20, n_categories))}
+    return data, shares
+
+
+def time_render(chart: str, n_categories: int, mode: str, output_path: str, iterations: int = 3) -> Dict:
+    """Median render time of one chart.
+    
+    Args:
+        chart: 'normalized' or 'comparison'
+        n_categories: Number of keywords
+        mode: 'full' or 'draft'
+        output_path: PNG path to render to
+        iterations: Timed runs (the median is reported)
+        
+    Returns:
+        Dictionary with 'chart', 'categories', 'mode', 'seconds' and 'error'
+    """
+    data, shares = synthetic_job_boards(n_categories)
+    kwargs = {'draft': True} if mode == 'draft' else {}
+    if chart == 'normalized':
+        render = lambda: create_normalized_stacked_chart(data, 'Benchmark', output_path, **kwargs)
+    else:
+        render = lambda: create_comparison_chart(data, shares, 'Benchmark', output_path, **kwargs)
+    
+    times = []
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(iterations):
+                started = time.perf_counter()
+                render()
+                times.append(time.perf_counter() - started)
+    except Exception as e:
+        return {'chart': chart, 'categories': n_categories, 'mode': mode, 'seconds': None,
+                'error': f"{type(e).__name__}: {e}"}
+    
+    return {'chart': chart, 'categories': n_categories, 'mode': mode,
+            'seconds': statistics.median(times), 'error': None}
+
+
+def run_benchmark(sizes: List[int], iterations: int = 3) -> Dict:
+    """Time both charts at every size in full and draft mode.
+    
+    Args:
+        sizes: Category counts to benchmark
+        iterations: Timed runs per chart
+        
+    Returns:
+        Report with environment details and per-chart 'results'
+    """
+    started = time.perf_counter()
+    results = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        output_path = os.path.join(output_dir, 'benchmark.png')
+        for n_categories in sizes:
+            for chart in ('normalized', 'comparison'):
+                for mode in MODES:
+                    results.append(time_render(chart, n_categories, mode, output_path, iterations))
+    
+    return {
+        'version': BENCHMARK_VERSION,
+        'python': platform.python_version(),
+        'matplotlib': matplotlib.__version__,
+        'iterations': iterations,
+        'wall_clock_seconds': round(time.perf_counter() - started, 3),
+        'results': results
+    }
+
+
+def result_key(result: Dict) -> Tuple[str, int, str]:
+    """Identity of a result across reports."""
+    return result['chart'], result['categories'], result['mode']
+
+
+def compare_reports(baseline: Dict, report: Dict,
+                    max_slowdown: float = DEFAULT_MAX_SLOWDOWN) -> Tuple[Dict, List[str]]:
+    """Speedups and regressions of a report against a baseline report.
+    
+    Args:
+        baseline: Earlier report from run_benchmark
+        report: New report
+        max_slowdown: Allowed factor on a chart's median seconds
+        
+    Returns:
+        Tuple of ({result key: speedup factor}, regression descriptions)
+    """
+    before = {result_key(result): result for result in baseline['results']}
+    speedups = {}
+    regressions = []
+    for result in report['results']:
+        previous = before.get(result_key(result))
+        if not previous or not previous['seconds'] or not result['seconds']:
+            continue
+        speedups[result_key(result)] = previous['seconds'] / result['seconds']
+        if result['seconds'] > previous['seconds'] * max_slowdown:
+            regressions.append(f"{result['chart']} ({result['categories']} categories, {result['mode']}): "
+                               f"{result['seconds']:.2f}s (baseline {previous['seconds']:.2f}s)")
+    return speedups, regressions
+
+
+def main():
+    """Benchmark chart rendering and write a JSON report."""
+    parser = argparse.ArgumentParser(description='Benchmark normalized and comparison chart rendering')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help=f'Category counts (default: {" ".join(map(str, DEFAULT_SIZES))})')
+    parser.add_argument('--iterations', type=int, default=3, help='Timed runs per chart')
+    parser.add_argument('--output', default='render_benchmark.json', help='JSON report path')
+    parser.add_argument('--baseline', help='Earlier report; exit with status 1 on regressions against it')
+    parser.add_argument('--max-slowdown', type=float, default=DEFAULT_MAX_SLOWDOWN,
+                        help=f'Allowed factor on median time per chart (default: {DEFAULT_MAX_SLOWDOWN})')
+    args = parser.parse_args()
+    
+    report = run_benchmark(args.sizes, args.iterations)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    
+    baseline: Optional[Dict] = None
+    speedups = {}
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        speedups, regressions = compare_reports(baseline, report, args.max_slowdown)
+    
+    print(f"\n{'Chart':<12} {'categories':>10} {'mode':>6} {'seconds':>8} {'speedup':>8}")
+    print("-" * 48)
+    for result in report['results']:
+        seconds = f"{result['seconds']:.3f}" if result['seconds'] is not None else 'FAILED'
+        speedup = f"{speedups[result_key(result)]:.2f}x" if result_key(result) in speedups else '-'
+        print(f"{result['chart']:<12} {result['categories']:>10} {result['mode']:>6} {seconds:>8} {speedup:>8}")
+    print(f"\nReport saved to {args.output}")
+    
+    if baseline is not None:
+        for regression in regressions:
+            print(f"  REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Board x category count matrices shared by the job board chart generators.
+
+The stacked, normalized and comparison charts all turn {board: {keyword: count}}
+into a category-by-board matrix, normalize each board to 100% and stack each
+board's segments. BoardMatrix does this once, with NumPy: the matrix is
+filled from a keyword index (linear in the number of counts), percentages
+are one broadcast division and the stacking order of every board comes from
+a single argsort, with bottoms from np.cumsum.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+def all_categories(*mappings: Iterable[str]) -> List[str]:
+    """Keywords of several mappings, without duplicates, in first-seen order."""
+    return list(dict.fromkeys(keyword for mapping in mappings for keyword in mapping))
+
+
+class BoardMatrix:
+    """Category counts (rows) per board (columns) with per-board totals."""
+    
+    def __init__(self, boards: List[str], categories: List[str], values: np.ndarray, totals: List[float]):
+        """Wrap a prepared matrix (see from_counts).
+        
+        Args:
+            boards: Column names
+            categories: Row names
+            values: Counts, shape (n_categories, n_boards)
+            totals: Per-board totals the percentages are relative to (these
+                can include keywords that are not rows)
+        """
+        self.boards = boards
+        self.categories = categories
+        self.values = values
+        self.totals = totals
+    
+    @classmethod
+    def from_counts(cls, data: Dict[str, Dict[str, int]], categories: Optional[List[str]] = None) -> 'BoardMatrix':
+        """Build the matrix of job board counts.
+        
+        Args:
+            data: Dictionary {board_name: {keyword: count}}
+            categories: Rows in display order (default: every keyword, by
+                total count across boards, descending)
+                
+        Returns:
+            BoardMatrix whose totals are each board's full count
+        """
+        boards = list(data.keys())
+        ranked = categories is None
+        if ranked:
+            categories = all_categories(*data.values())
+        
+        index = {category: i for i, category in enumerate(categories)}
+        values = np.zeros((len(categories), len(boards)))
+        for j, board in enumerate(boards):
+            cells = [(index[keyword], count) for keyword, count in data[board].items() if keyword in index]
+            if cells:
+                rows, counts = zip(*cells)
+                values[list(rows), j] = counts
+        
+        matrix = cls(boards, list(categories), values, [sum(data[board].values()) for board in boards])
+        return matrix.sorted_by(values.sum(axis=1)) if ranked else matrix
+    
+    def with_column(self, board: str, shares: Dict[str, float]) -> 'BoardMatrix':
+        """Append a column of per-category values (e.g. benchmark shares).
+        
+        Args:
+            board: Column name
+            shares: Dictionary {keyword: value}; keywords that are not rows
+                are ignored
+                
+        Returns:
+            New BoardMatrix; the column's total is the sum over the rows
+        """
+        column = np.array([shares.get(category, 0) for category in self.categories], dtype=float)
+        values = np.column_stack((self.values, column))
+        total = sum(shares.get(category, 0) for category in self.categories)
+        return BoardMatrix(self.boards + [board], self.categories, values, self.totals + [total])
+    
+    def sorted_by(self, scores: np.ndarray) -> 'BoardMatrix':
+        """Reorder the rows by descending score (ties keep their order)."""
+        order = np.argsort(-np.asarray(scores), kind='stable')
+        return BoardMatrix(self.boards, [self.categories[i] for i in order], self.values[order], self.totals)
+    
+    def percentages(self) -> np.ndarray:
+        """Each count as a percentage of its board's total (0 for empty boards)."""
+        totals = np.array(self.totals, dtype=float)
+        shares = np.divide(self.values, totals, out=np.zeros_like(self.values), where=totals > 0)
+        return shares * 100
+    
+    def stacking(self, heights: Optional[np.ndarray] = None, by_value: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """Position of each segment in its board's stack.
+        
+        Args:
+            heights: Segment heights (default: the counts)
+            by_value: Stack each board's categories by count, most results at
+                the bottom (ties keep the row order); otherwise in row order
+                
+        Returns:
+            Tuple of (levels, bottoms): each segment's index from the bottom of
+            its stack (-1 where the category is absent) and its bottom edge
+        """
+        heights = self.values if heights is None else heights
+        n_categories, n_boards = self.values.shape
+        
+        if by_value:
+            # Absent (zero) categories sort after every present one
+            order = np.argsort(-self.values, axis=0, kind='stable')
+        else:
+            order = np.tile(np.arange(n_categories)[:, None], (1, n_boards))
+        
+        levels = np.empty(self.values.shape, dtype=int)
+        np.put_along_axis(levels, order, np.arange(n_categories)[:, None], axis=0)
+        
+        # Exclusive running sum up each stack, scattered back to category rows
+        stacked = np.take_along_axis(heights, order, axis=0)
+        stacked_bottoms = np.vstack((np.zeros((1, n_boards)), np.cumsum(stacked, axis=0)[:-1]))
+        bottoms = np.empty_like(stacked_bottoms)
+        np.put_along_axis(bottoms, order, stacked_bottoms, axis=0)
+        
+        levels[self.values <= 0] = -1
+        return levels, bottoms
@@ -3,7 +3,10 @@
 import matplotlib.pyplot as plt
 import numpy as np
 from typing import Dict, List, Optional
-from normalized_chart_generator import get_distinct_colors, should_use_black_text
+from board_matrix import BoardMatrix, all_categories
+from normalized_chart_generator import (
+    DRAFT_DPI, FULL_DPI, draw_segment_labels, draw_stacked_bars, get_distinct_colors
+)
 
 
 def create_comparison_chart(
@@ -11,7 +14,8 @@ def create_comparison_chart(
     itjobswatch_data: Dict[str, float],
     title: str,
     output_path: str,
-    categories_order: Optional[List[str]] = None
+    categories_order: Optional[List[str]] = None,
+    draft: bool = False
 ) -> None:
     """Create comparison chart with job boards and ITJobsWatch data.
     
@@ -21,59 +25,35 @@ def create_comparison_chart(
         title: Chart title
         output_path: Path to save the PNG file
         categories_order: Optional list of categories in display order
+        draft: Quick preview (DRAFT_DPI, no tight_layout pass)
     """
-    # Add ITJobsWatch as a synthetic 4th column
-    boards = list(job_board_data.keys()) + ['ITJobsWatch']
-    
-    # Get categories that exist in both datasets
+    # Get categories that exist in either dataset
+    present = all_categories(*job_board_data.values(), itjobswatch_data)
     if categories_order:
-        categories = [c for c in categories_order if c in itjobswatch_data or 
-                     any(c in board_data for board_data in job_board_data.values())]
+        present = set(present)
+        categories = [c for c in categories_order if c in present]
     else:
-        all_categories = set()
-        for board_data in job_board_data.values():
-            all_categories.update(board_data.keys())
-        # Add ITJobsWatch categories
-        all_categories.update(itjobswatch_data.keys())
-        
-        # Sort by total presence
-        totals = {}
-        for cat in all_categories:
-            job_board_total = sum(data.get(cat, 0) for data in job_board_data.values())
-            itjobs_value = itjobswatch_data.get(cat, 0) * 100  # Scale for comparison
-            totals[cat] = job_board_total + itjobs_value
-        categories = sorted(all_categories, key=lambda x: totals[x], reverse=True)
-    
-    # Prepare data
+        categories = present
+    
+    # Add ITJobsWatch as a synthetic 4th column - use actual percentages as "counts"
+    # These will be normalized to 100% like the other columns
+    matrix = BoardMatrix.from_counts(job_board_data, categories).with_column('ITJobsWatch', itjobswatch_data)
+    if not categories_order:
+        # Sort by total presence (ITJobsWatch shares scaled for comparison)
+        matrix = matrix.sorted_by(matrix.values[:, :-1].sum(axis=1) + matrix.values[:, -1] * 100)
+    
+    boards, categories = matrix.boards, matrix.categories
+    values, board_totals = matrix.values, matrix.totals
     n_boards = len(boards)
     n_categories = len(categories)
     
-    # Create raw values and percentages
-    values = np.zeros((n_categories, n_boards))
-    board_totals = []
-    
-    # Process job board data
-    for j, board in enumerate(boards[:-1]):  # Exclude ITJobsWatch for now
-        board_total = sum(job_board_data[board].values())
-        board_totals.append(board_total)
-        for i, cat in enumerate(categories):
-            values[i, j] = job_board_data[board].get(cat, 0)
-    
-    # Add ITJobsWatch data - use actual percentages as "counts"
-    # This will be normalized to 100% like other columns
-    itjobs_total = sum(itjobswatch_data.get(cat, 0) for cat in categories)
-    board_totals.append(itjobs_total)
     print(f"\nDEBUG: ITJobsWatch data mapping:")
-    for i, cat in enumerate(categories):
+    for cat in categories:
         if cat in itjobswatch_data:
-            values[i, -1] = itjobswatch_data[cat]  # Store original percentage
             print(f"  {cat}: {itjobswatch_data[cat]}%")
     
     # Calculate percentages
-    percentages = np.zeros_like(values)
-    for j in range(n_boards):
-        if board_totals[j] > 0:
-            percentages[:, j] = (values[:, j] / board_totals[j]) * 100
+    percentages = matrix.percentages()
     
     # Create figure (16x16 square)
     fig, ax = plt.subplots(figsize=(16, 16))
@@ -85,62 +65,28 @@ def create_comparison_chart(
     x = np.arange(n_boards)
     width = 0.6
     
-    # Reorder categories for each board (most results at bottom)
-    board_categories = []
-    for j in range(n_boards):
-        board_cats = [(cat, values[i, j]) for i, cat in enumerate(categories) if values[i, j] > 0]
-        board_cats.sort(key=lambda x: x[1], reverse=True)
-        board_categories.append([cat for cat, _ in board_cats])
-    
-    # Plot normalized stacked bars
-    bottom = np.zeros(n_boards)
-    legend_added = set()
-    legend_handles = []
-    legend_labels = []
-    
-    # Plot each level
-    max_cats = max(len(cats) for cats in board_categories)
-    
-    for level in range(max_cats):
-        for j, board in enumerate(boards):
-            if level < len(board_categories[j]):
-                cat = board_categories[j][level]
-                cat_idx = categories.index(cat)
-                color = colors[cat_idx % len(colors)]
-                
-                # Create bar
-                bar = ax.bar(x[j], percentages[cat_idx, j], width, 
-                           bottom=bottom[j], color=color,
-                           edgecolor='white', linewidth=0.5)
-                
-                # Add to legend
-                if cat not in legend_added:
-                    legend_added.add(cat)
-                    legend_handles.append(bar[0])
-                    legend_labels.append(cat)
-                
-                # Add labels
-                pct = percentages[cat_idx, j]
-                if pct > 1.5:  # Only show if >1.5%
-                    y_pos = bottom[j] + pct/2
-                    
-                    if j < len(boards) - 1:  # Job boards
-                        count = int(values[cat_idx, j])
-                        label_text = f'{count}\n({pct:.1f}%)'
-                    else:  # ITJobsWatch column
-                        # Show original market share % and normalized %
-                        original_pct = values[cat_idx, j]  # Original ITJobsWatch percentage
-                        label_text = f'({original_pct:.1f}%)\n{pct:.1f}%'
-                        print(f"DEBUG: ITJobsWatch label for {cat}: orig={original_pct:.2f}%, norm={pct:.1f}%")
-                    
-                    fontsize = 8 if pct > 3 else 7
-                    text_color = 'black' if should_use_black_text(color) else 'white'
-                    ax.text(x[j], y_pos, label_text, 
-                           ha='center', va='center', 
-                           fontsize=fontsize, fontweight='bold',
-                           color=text_color)
-                
-                bottom[j] += percentages[cat_idx, j]
+    # Stack each column's categories by value (most results at bottom)
+    levels, bottoms = matrix.stacking(percentages)
+    
+    # Plot normalized stacked bars (all segments in one collection)
+    legend_handles, legend_labels = draw_stacked_bars(
+        ax, x, percentages, bottoms, levels, categories, colors, width,
+        edgecolor='white', linewidth=0.5
+    )
+    
+    def label_text(i: int, j: int) -> str:
+        """Count and % for job boards; original and normalized % for ITJobsWatch."""
+        pct = percentages[i, j]
+        if j < len(boards) - 1:
+            return f'{int(values[i, j])}\n({pct:.1f}%)'
+        print(f"DEBUG: ITJobsWatch label for {categories[i]}: orig={values[i, j]:.2f}%, norm={pct:.1f}%")
+        return f'({values[i, j]:.1f}%)\n{pct:.1f}%'
+    
+    # Add labels (only if >1.5%)
+    draw_segment_labels(
+        ax, x, percentages, bottoms, levels, (values > 0) & (percentages > 1.5), colors,
+        label_text, fontsizes=(8, 7)
+    )
     
     # Customize chart
     ax.set_xlabel('Data Source', fontsize=14, fontweight='bold')
@@ -182,11 +128,12 @@ def create_comparison_chart(
                  loc='upper center', bbox_to_anchor=(0.5, -0.1),
                  ncol=ncol, fontsize=9, frameon=False)
     
-    # Adjust layout
-    plt.tight_layout()
+    # Adjust layout (skipped for drafts)
+    if not draft:
+        plt.tight_layout()
     
     # Save figure
-    plt.savefig(output_path, bbox_inches='tight', dpi=150)
+    plt.savefig(output_path, bbox_inches='tight', dpi=DRAFT_DPI if draft else FULL_DPI)
     plt.close()
     
     print(f"Comparison chart saved to: {output_path}")
\ No newline at end of file
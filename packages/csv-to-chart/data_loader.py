@@ -1,8 +1,84 @@
-"""Data loader module for CSV market share data."""
+"""Data loader module for CSV market share data.
+
+Every CSV under the year_market-share directory ({category}/{series}.csv) is
+parsed once into a single columnar table (category, series, year, share) with
+each series' rows contiguous. The table is persisted as an .npz file and
+rebuilt only when a CSV is added, removed or modified (by mtime), so chart
+scripts read one binary file instead of re-parsing text, and each series they
+load is a zero-copy slice of the year and share columns.
+"""
 
 import os
 import csv
-from typing import Dict, List, Tuple
+import glob
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+STORE_VERSION = 1
+
+# Default location of the persisted tables (one file per data directory)
+CACHE_DIR = Path(__file__).parent / '.cache'
+
+# Series shown by each chart script, as 'category/series' keys
+DATASET_GROUPS = {
+    'all': [
+        'themes/artificial-intelligence',
+        'themes/machine-learning',
+        'job-title/data-analytics',
+        'job-title/data-science',
+        'job-title/devops',
+        'job-title/software-engineering',
+        'job-title/web-development'
+    ],
+    'languages': [
+        'languages/csharp',
+        'languages/java',
+        'languages/javascript',
+        'languages/python',
+        'languages/typescript'
+    ],
+    'job_titles': [
+        'job-title/analyst',
+        'job-title/cyber-security',
+        'job-title/data-analytics',
+        'job-title/data-science',
+        'job-title/devops',
+        'job-title/software-engineering',
+        'job-title/web-development'
+    ],
+    'cloud_technology': [
+        # Cloud providers
+        'cloud/aws',
+        'cloud/azure',
+        'cloud/gcp',
+        # Technologies
+        'technology/docker',
+        'technology/kubernetes',
+        'technology/terraform'
+    ],
+    'themes_sectors': [
+        # Themes
+        'themes/artificial-intelligence',
+        'themes/business-intelligence',
+        'themes/machine-learning',
+        'themes/risk-management',
+        # Sectors
+        'sectors/customer-service',
+        'sectors/finance',
+        'sectors/law',
+        'sectors/marketing'
+    ]
+}
+
+# Display names that differ from the title-cased series name
+DISPLAY_NAMES = {
+    'languages/csharp': 'C#',
+    'languages/typescript': 'TypeScript'
+}
 
 
 def load_csv_data(file_path: str) -> Tuple[List[float], List[float]]:
@@ -44,74 +120,227 @@ def load_csv_data(file_path: str) -> Tuple[List[float], List[float]]:
     return years, market_shares
 
 
-def load_all_datasets(data_dir: str) -> Dict[str, Tuple[List[float], List[float]]]:
-    """Load all CSV files from the data directory.
+def scan_sources(data_dir: str) -> Dict[str, int]:
+    """Find the CSV files of a data directory with their modification times.
     
     Args:
-        data_dir: Directory containing CSV files
+        data_dir: Directory containing {category}/{series}.csv files
         
     Returns:
-        Dictionary mapping technology names to (years, market_share) tuples
+        Dictionary mapping 'category/series' keys to mtimes in nanoseconds
     """
-    datasets = {}
+    sources = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, '*', '*.csv'))):
+        category = os.path.basename(os.path.dirname(path))
+        series = os.path.splitext(os.path.basename(path))[0]
+        sources[f"{category}/{series}"] = os.stat(path).st_mtime_ns
+    return sources
+
+
+def default_store_path(data_dir: str) -> str:
+    """Persisted table path for a data directory."""
+    digest = hashlib.sha1(os.path.abspath(data_dir).encode('utf-8')).hexdigest()[:8]
+    return str(CACHE_DIR / f"year_market-share-{digest}.npz")
+
+
+class TimeSeriesStore:
+    """Year/share rows of every series, grouped by series into contiguous slices."""
     
-    # Load from themes subdirectory
-    themes_files = [
-        ('themes/artificial-intelligence.csv', 'Artificial Intelligence'),
-        ('themes/machine-learning.csv', 'Machine Learning')
-    ]
+    # Arrays making up a table (see build)
+    ARRAYS = ('year', 'share', 'category_codes', 'series_codes', 'categories',
+              'keys', 'starts', 'stops', 'mtimes')
     
-    # Load from job-title subdirectory
-    job_title_files = [
-        ('job-title/data-analytics.csv', 'Data Analytics'),
-        ('job-title/data-science.csv', 'Data Science'),
-        ('job-title/devops.csv', 'Devops'),
-        ('job-title/software-engineering.csv', 'Software Engineering'),
-        ('job-title/web-development.csv', 'Web Development')
-    ]
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        """Wrap a table's arrays.
+        
+        Args:
+            arrays: Row columns (year, share, category_codes, series_codes),
+                category names, and per-series keys, row ranges and mtimes
+        """
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+        
+        # Slices handed to chart scripts must not modify the shared columns
+        self.year.flags.writeable = False
+        self.share.flags.writeable = False
+        
+        self._index = {key: i for i, key in enumerate(self.keys.tolist())}
     
-    # Combine all files
-    all_files = themes_files + job_title_files
+    @classmethod
+    def build(cls, data_dir: str, sources: Optional[Dict[str, int]] = None) -> 'TimeSeriesStore':
+        """Parse every CSV of a data directory into a new table.
+        
+        Args:
+            data_dir: Directory containing {category}/{series}.csv files
+            sources: Result of scan_sources (scanned if not given)
+            
+        Returns:
+            Store with rows ordered by series key, then file order
+        """
+        sources = scan_sources(data_dir) if sources is None else sources
+        keys = list(sources)
+        categories = sorted({key.split('/')[0] for key in keys})
+        
+        years, shares, lengths = [], [], []
+        for key in keys:
+            series_years, series_shares = load_csv_data(os.path.join(data_dir, f"{key}.csv"))
+            years.extend(series_years)
+            shares.extend(series_shares)
+            lengths.append(len(series_years))
+        
+        lengths = np.array(lengths, dtype=np.int64)
+        stops = np.cumsum(lengths)
+        series_codes = np.repeat(np.arange(len(keys), dtype=np.int32), lengths)
+        key_categories = np.array([categories.index(key.split('/')[0]) for key in keys], dtype=np.int32)
+        
+        return cls({
+            'year': np.array(years, dtype=np.float64),
+            'share': np.array(shares, dtype=np.float64),
+            'category_codes': key_categories[series_codes],
+            'series_codes': series_codes,
+            'categories': np.array(categories, dtype=str),
+            'keys': np.array(keys, dtype=str),
+            'starts': stops - lengths,
+            'stops': stops,
+            'mtimes': np.array([sources[key] for key in keys], dtype=np.int64)
+        })
     
-    for csv_file, display_name in all_files:
-        file_path = os.path.join(data_dir, csv_file)
-        if os.path.exists(file_path):
-            datasets[display_name] = load_csv_data(file_path)
-        else:
-            print(f"Warning: {csv_file} not found at {file_path}")
+    @classmethod
+    def read(cls, path: str) -> Optional['TimeSeriesStore']:
+        """Load a persisted table, or None if it is missing or unreadable."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data['version']) != STORE_VERSION:
+                    return None
+                return cls({name: data[name] for name in cls.ARRAYS})
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def save(self, path: str) -> None:
+        """Persist the table, replacing the file atomically."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, version=STORE_VERSION, **{name: getattr(self, name) for name in self.ARRAYS})
+        os.replace(tmp_path, path)
+    
+    def is_current(self, sources: Dict[str, int]) -> bool:
+        """Whether the table was built from exactly these files and mtimes."""
+        return dict(zip(self.keys.tolist(), self.mtimes.tolist())) == sources
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+    
+    def __len__(self) -> int:
+        return len(self.year)
+    
+    def series(self, key: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Get one series as read-only views into the table.
+        
+        Args:
+            key: Series key, 'category/series' (e.g. 'themes/artificial-intelligence')
             
-    return datasets
+        Returns:
+            Tuple of (years, market_share_percentages)
+        """
+        i = self._index[key]
+        rows = slice(int(self.starts[i]), int(self.stops[i]))
+        return self.year[rows], self.share[rows]
+    
+    def category(self, category: str) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Get every series of a category, keyed by series name."""
+        prefix = f"{category}/"
+        return {
+            key[len(prefix):]: self.series(key)
+            for key in self._index if key.startswith(prefix)
+        }
 
 
-def load_language_datasets(data_dir: str) -> Dict[str, Tuple[List[float], List[float]]]:
-    """Load programming language CSV files from the data directory.
+# Stores already loaded by this process, by data directory
+_stores: Dict[str, TimeSeriesStore] = {}
+
+
+def load_store(data_dir: str, store_path: Optional[str] = None) -> TimeSeriesStore:
+    """Load the table of every series in a data directory.
+    
+    The persisted table is reused while its recorded files and mtimes match
+    the directory; otherwise the CSVs are parsed again and the table rewritten.
+    
+    Args:
+        data_dir: Directory containing {category}/{series}.csv files
+        store_path: Persisted table path (default: .cache/ next to this module)
+        
+    Returns:
+        Current store for the directory
+    """
+    sources = scan_sources(data_dir)
+    
+    store = _stores.get(data_dir)
+    if store is None or not store.is_current(sources):
+        store_path = store_path or default_store_path(data_dir)
+        store = TimeSeriesStore.read(store_path)
+        if store is None or not store.is_current(sources):
+            store = TimeSeriesStore.build(data_dir, sources)
+            store.save(store_path)
+        _stores[data_dir] = store
+    
+    return store
+
+
+def display_name(key: str) -> str:
+    """Chart label for a series key (e.g. 'themes/machine-learning' -> 'Machine Learning')."""
+    return DISPLAY_NAMES.get(key, key.split('/', 1)[1].replace('-', ' ').title())
+
+
+def load_datasets(data_dir: str, group: str) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Load a group of series from the data directory's store.
     
     Args:
         data_dir: Directory containing CSV files
+        group: Key of DATASET_GROUPS
         
     Returns:
-        Dictionary mapping language names to (years, market_share) tuples
+        Dictionary mapping display names to (years, market_share) tuples
     """
-    datasets = {}
-    language_files = [
-        ('languages/csharp.csv', 'C#'),
-        ('languages/java.csv', 'Java'),
-        ('languages/javascript.csv', 'Javascript'),
-        ('languages/python.csv', 'Python'),
-        ('languages/typescript.csv', 'TypeScript')
-    ]
+    store = load_store(data_dir)
     
-    for csv_file, display_name in language_files:
-        file_path = os.path.join(data_dir, csv_file)
-        if os.path.exists(file_path):
-            datasets[display_name] = load_csv_data(file_path)
+    datasets = {}
+    for key in DATASET_GROUPS[group]:
+        if key in store:
+            datasets[display_name(key)] = store.series(key)
         else:
-            print(f"Warning: {csv_file} not found at {file_path}")
+            print(f"Warning: {key}.csv not found at {os.path.join(data_dir, key + '.csv')}")
             
     return datasets
 
 
-def load_job_titles_datasets(data_dir: str) -> Dict[str, Tuple[List[float], List[float]]]:
+def load_all_datasets(data_dir: str) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Load the themes and job title CSV files from the data directory.
+    
+    Args:
+        data_dir: Directory containing CSV files
+        
+    Returns:
+        Dictionary mapping technology names to (years, market_share) tuples
+    """
+    return load_datasets(data_dir, 'all')
+
+
+def load_language_datasets(data_dir: str) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Load programming language CSV files from the data directory.
+    
+    Args:
+        data_dir: Directory containing CSV files
+        
+    Returns:
+        Dictionary mapping language names to (years, market_share) tuples
+    """
+    return load_datasets(data_dir, 'languages')
+
+
+def load_job_titles_datasets(data_dir: str) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
     """Load job title CSV files from the data directory.
     
     Args:
@@ -120,28 +349,10 @@ def load_job_titles_datasets(data_dir: str) -> Dict[str, Tuple[List[float], List
     Returns:
         Dictionary mapping job title names to (years, market_share) tuples
     """
-    datasets = {}
-    job_files = [
-        ('job-title/analyst.csv', 'Analyst'),
-        ('job-title/cyber-security.csv', 'Cyber Security'),
-        ('job-title/data-analytics.csv', 'Data Analytics'),
-        ('job-title/data-science.csv', 'Data Science'),
-        ('job-title/devops.csv', 'Devops'),
-        ('job-title/software-engineering.csv', 'Software Engineering'),
-        ('job-title/web-development.csv', 'Web Development')
-    ]
-    
-    for csv_file, display_name in job_files:
-        file_path = os.path.join(data_dir, csv_file)
-        if os.path.exists(file_path):
-            datasets[display_name] = load_csv_data(file_path)
-        else:
-            print(f"Warning: {csv_file} not found at {file_path}")
-            
-    return datasets
+    return load_datasets(data_dir, 'job_titles')
 
 
-def load_cloud_technology_datasets(data_dir: str) -> Dict[str, Tuple[List[float], List[float]]]:
+def load_cloud_technology_datasets(data_dir: str) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
     """Load cloud and technology CSV files from the data directory.
     
     Args:
@@ -150,29 +361,10 @@ def load_cloud_technology_datasets(data_dir: str) -> Dict[str, Tuple[List[float]
     Returns:
         Dictionary mapping cloud/tech names to (years, market_share) tuples
     """
-    datasets = {}
-    cloud_tech_files = [
-        # Cloud providers
-        ('cloud/aws.csv', 'Aws'),
-        ('cloud/azure.csv', 'Azure'),
-        ('cloud/gcp.csv', 'Gcp'),
-        # Technologies
-        ('technology/docker.csv', 'Docker'),
-        ('technology/kubernetes.csv', 'Kubernetes'),
-        ('technology/terraform.csv', 'Terraform')
-    ]
-    
-    for csv_file, display_name in cloud_tech_files:
-        file_path = os.path.join(data_dir, csv_file)
-        if os.path.exists(file_path):
-            datasets[display_name] = load_csv_data(file_path)
-        else:
-            print(f"Warning: {csv_file} not found at {file_path}")
-            
-    return datasets
+    return load_datasets(data_dir, 'cloud_technology')
 
 
-def load_themes_sectors_datasets(data_dir: str) -> Dict[str, Tuple[List[float], List[float]]]:
+def load_themes_sectors_datasets(data_dir: str) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
     """Load themes and sectors CSV files from the data directory.
     
     Args:
@@ -181,25 +373,4 @@ def load_themes_sectors_datasets(data_dir: str) -> Dict[str, Tuple[List[float],
     Returns:
         Dictionary mapping theme/sector names to (years, market_share) tuples
     """
-    datasets = {}
-    themes_sectors_files = [
-        # Themes
-        ('themes/artificial-intelligence.csv', 'Artificial Intelligence'),
-        ('themes/business-intelligence.csv', 'Business Intelligence'),
-        ('themes/machine-learning.csv', 'Machine Learning'),
-        ('themes/risk-management.csv', 'Risk Management'),
-        # Sectors
-        ('sectors/customer-service.csv', 'Customer Service'),
-        ('sectors/finance.csv', 'Finance'),
-        ('sectors/law.csv', 'Law'),
-        ('sectors/marketing.csv', 'Marketing')
-    ]
-    
-    for csv_file, display_name in themes_sectors_files:
-        file_path = os.path.join(data_dir, csv_file)
-        if os.path.exists(file_path):
-            datasets[display_name] = load_csv_data(file_path)
-        else:
-            print(f"Warning: {csv_file} not found at {file_path}")
-            
-    return datasets
\ No newline at end of file
+    return load_datasets(data_dir, 'themes_sectors')
\ No newline at end of file
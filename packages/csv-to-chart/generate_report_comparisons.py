@@ -14,6 +14,29 @@ from itjobswatch_benchmarks import (
 )
 
 
+# Map job board keywords to ITJobsWatch categories - keeping software developer separate
+TITLE_MAPPING = {
+    'devops': 'devops',
+    'software engineer': 'software engineer',
+    'software developer': 'software developer',
+    'data analyst': 'data analyst',
+    'data scientist': 'data scientist',
+    'web developer': 'web developer',
+    'cyber security': 'cyber security'
+}
+
+# ITJobsWatch data with unique keys - including software developer
+TITLE_BENCHMARKS = {
+    'devops': 11.45,
+    'software engineer': 8.35,
+    'software developer': 0.59,  # Current ITJobsWatch market share
+    'cyber security': 7.47,
+    'data analyst': 2.58,  # Updated from CSV
+    'data scientist': 3.74,  # Updated from CSV
+    'web developer': 0.64  # Updated from CSV
+}
+
+
 def filter_data_by_categories(data, valid_categories):
     """Filter job board data to only include specified categories."""
     filtered = {}
@@ -29,6 +52,23 @@ def filter_data_by_categories(data, valid_categories):
     return filtered
 
 
+def map_data_by_keywords(data, mapping):
+    """Map job board keywords to categories, summing keywords that share one."""
+    mapped = {}
+    for board, keywords in data.items():
+        mapped[board] = {}
+        for keyword, count in keywords.items():
+            keyword_lower = keyword.lower().strip()
+            if keyword_lower in mapping:
+                mapped_key = mapping[keyword_lower]
+                # Aggregate if already exists
+                if mapped_key in mapped[board]:
+                    mapped[board][mapped_key] += count
+                else:
+                    mapped[board][mapped_key] = count
+    return mapped
+
+
 def main():
     """Generate all 5 report comparison charts."""
     # Setup paths
@@ -68,41 +108,9 @@ def main():
     
     # Report 3: Job Titles
     print("\n=== Report 3: Job Titles ===")
-    # Map job board keywords to ITJobsWatch categories - keeping software developer separate
-    title_mapping = {
-        'devops': 'devops',
-        'software engineer': 'software engineer',
-        'software developer': 'software developer',
-        'data analyst': 'data analyst',
-        'data scientist': 'data scientist',
-        'web developer': 'web developer',
-        'cyber security': 'cyber security'
-    }
-    
     # Create filtered data with proper mapping
-    title_data = {}
-    for board, keywords in raw_data.items():
-        title_data[board] = {}
-        for keyword, count in keywords.items():
-            keyword_lower = keyword.lower().strip()
-            if keyword_lower in title_mapping:
-                mapped_key = title_mapping[keyword_lower]
-                # Aggregate if already exists
-                if mapped_key in title_data[board]:
-                    title_data[board][mapped_key] += count
-                else:
-                    title_data[board][mapped_key] = count
-    
-    # Create ITJobsWatch data with unique keys - including software developer
-    title_benchmarks = {
-        'devops': 11.45,
-        'software engineer': 8.35,
-        'software developer': 0.59,  # Current ITJobsWatch market share
-        'cyber security': 7.47,
-        'data analyst': 2.58,  # Updated from CSV
-        'data scientist': 3.74,  # Updated from CSV
-        'web developer': 0.64  # Updated from CSV
-    }
+    title_data = map_data_by_keywords(raw_data, TITLE_MAPPING)
+    title_benchmarks = TITLE_BENCHMARKS
     
     # Debug output
     print("\nDEBUG: ITJobsWatch benchmarks being passed to chart:")
@@ -37,12 +37,12 @@ def create_themes_sectors_6year_chart(datasets, output_path):
             continue  # Skip finance
         
         # Filter data for last 6 years (2019-2025)
-        filtered_data = [(y, ms) for y, ms in zip(years, market_shares) if y >= 2019]
-        if not filtered_data:
+        recent = years >= 2019
+        if not recent.any():
             continue
             
-        filtered_years = [d[0] for d in filtered_data]
-        filtered_shares = [d[1] for d in filtered_data]
+        filtered_years = years[recent]
+        filtered_shares = market_shares[recent]
         
         color = colors.get(name, '#666666')
         ax.plot(
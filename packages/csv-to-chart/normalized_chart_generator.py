@@ -2,7 +2,15 @@
 
 import matplotlib.pyplot as plt
 import numpy as np
-from typing import Dict, List, Optional
+from matplotlib.collections import PolyCollection
+from matplotlib.patches import Rectangle
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from board_matrix import BoardMatrix
+
+
+# Output resolution of full renders and of draft (preview) renders
+FULL_DPI = 150
+DRAFT_DPI = 72
 
 
 def get_distinct_colors(n: int) -> List[str]:
@@ -58,11 +66,109 @@ def should_use_black_text(color_hex: str) -> bool:
     return luminance > 0.5 or color_hex.upper() in [c.lstrip('#') for c in light_colors]
 
 
+def draw_stacked_bars(
+    ax,
+    x: np.ndarray,
+    heights: np.ndarray,
+    bottoms: np.ndarray,
+    levels: np.ndarray,
+    categories: List[str],
+    colors: List[str],
+    width: float,
+    **bar_kwargs
+) -> Tuple[List[Rectangle], List[str]]:
+    """Draw every stacked segment as one PolyCollection.
+    
+    A separate ax.bar call per segment creates a BarContainer and a Rectangle
+    artist each; a single collection is built and drawn in one go. Segments
+    are added level by level, left to right, the order the bars used to be
+    drawn in, so overlapping edges come out the same.
+    
+    Args:
+        ax: Axes to draw on
+        x: Board positions
+        heights: Segment heights, shape (n_categories, n_boards)
+        bottoms: Segment bottom edges, same shape
+        levels: Segment levels from BoardMatrix.stacking (-1 where absent)
+        categories: Category names, one per row
+        colors: Category colors, one per row
+        width: Bar width
+        **bar_kwargs: Segment edge style ('edgecolor', 'linewidth')
+        
+    Returns:
+        Tuple of (legend_handles, legend_labels), ordered by where each
+        category first appears going up the stacks, left to right
+    """
+    rows, cols = np.nonzero(levels >= 0)
+    order = np.lexsort((cols, levels[rows, cols]))
+    rows, cols = rows[order], cols[order]
+    
+    left = x[cols] - width/2
+    right = left + width
+    bottom = bottoms[rows, cols]
+    top = bottom + heights[rows, cols]
+    verts = np.stack([
+        np.column_stack((left, bottom)), np.column_stack((left, top)),
+        np.column_stack((right, top)), np.column_stack((right, bottom))
+    ], axis=1)
+    
+    # Edges as ax.bar draws them (Rectangle patches use mitred joins)
+    edge_style = {
+        'edgecolors': bar_kwargs.get('edgecolor', 'none'),
+        'linewidths': bar_kwargs.get('linewidth', 0),
+        'joinstyle': 'miter'
+    }
+    ax.add_collection(PolyCollection(verts, facecolors=[colors[i] for i in rows], **edge_style))
+    ax.autoscale_view()
+    
+    # Legend entries in order of first appearance (rows are already sorted that way)
+    _, first = np.unique(rows, return_index=True)
+    shown = rows[np.sort(first)]
+    handles = [Rectangle((0, 0), 1, 1, facecolor=colors[i], **bar_kwargs) for i in shown]
+    return handles, [categories[i] for i in shown]
+
+
+def draw_segment_labels(
+    ax,
+    x: np.ndarray,
+    heights: np.ndarray,
+    bottoms: np.ndarray,
+    levels: np.ndarray,
+    labelled: np.ndarray,
+    colors: List[str],
+    label_text: Callable[[int, int], str],
+    fontsizes: Sequence[int]
+) -> None:
+    """Write labels centred in the chosen segments.
+    
+    Args:
+        ax: Axes to draw on
+        x: Board positions
+        heights: Segment heights, shape (n_categories, n_boards)
+        bottoms: Segment bottom edges, same shape
+        levels: Segment levels from BoardMatrix.stacking
+        labelled: Boolean mask of the segments to label
+        colors: Category colors, one per row
+        label_text: Builds the label of segment (category index, board index)
+        fontsizes: Font sizes for segments above and below 3%
+    """
+    text_colors = ['black' if should_use_black_text(color) else 'white' for color in colors]
+    
+    rows, cols = np.nonzero(labelled)
+    for k in np.lexsort((cols, levels[rows, cols])):
+        i, j = rows[k], cols[k]
+        ax.text(x[j], bottoms[i, j] + heights[i, j]/2, label_text(i, j),
+               ha='center', va='center',
+               fontsize=fontsizes[0] if heights[i, j] > 3 else fontsizes[1], fontweight='bold',
+               color=text_colors[i])
+
+
 def create_normalized_stacked_chart(
     data: Dict[str, Dict[str, int]],
     title: str,
     output_path: str,
-    categories_order: Optional[List[str]] = None
+    categories_order: Optional[List[str]] = None,
+    draft: bool = False
 ) -> None:
     """Create normalized stacked bar chart with percentages and count labels.
     
@@ -71,40 +177,17 @@ def create_normalized_stacked_chart(
         title: Chart title
         output_path: Path to save the PNG file
         categories_order: Optional list of categories in display order
+        draft: Quick preview (DRAFT_DPI, no tight_layout pass)
     """
-    boards = list(data.keys())
-    
-    # Get categories
-    if categories_order:
-        categories = categories_order
-    else:
-        all_categories = set()
-        for board_data in data.values():
-            all_categories.update(board_data.keys())
-        totals = {}
-        for cat in all_categories:
-            totals[cat] = sum(data[board].get(cat, 0) for board in boards)
-        categories = sorted(all_categories, key=lambda x: totals[x], reverse=True)
-    
-    # Prepare data
+    # Category x board counts (categories by total count unless ordered)
+    matrix = BoardMatrix.from_counts(data, categories_order or None)
+    boards, categories = matrix.boards, matrix.categories
+    values, board_totals = matrix.values, matrix.totals
     n_boards = len(boards)
     n_categories = len(categories)
     
-    # Create raw values and percentages
-    values = np.zeros((n_categories, n_boards))
-    board_totals = []
-    
-    for j, board in enumerate(boards):
-        board_total = sum(data[board].values())
-        board_totals.append(board_total)
-        for i, cat in enumerate(categories):
-            values[i, j] = data[board].get(cat, 0)
-    
     # Calculate percentages
-    percentages = np.zeros_like(values)
-    for j in range(n_boards):
-        if board_totals[j] > 0:
-            percentages[:, j] = (values[:, j] / board_totals[j]) * 100
+    percentages = matrix.percentages()
     
     # Create figure (16x16 square)
     fig, ax = plt.subplots(figsize=(16, 16))
@@ -116,58 +199,20 @@ def create_normalized_stacked_chart(
     x = np.arange(n_boards)
     width = 0.6
     
-    # Reorder categories for each board (most results at bottom)
-    board_categories = []
-    for j, board in enumerate(boards):
-        # Get categories for this board sorted by count (descending)
-        board_cats = [(cat, values[i, j]) for i, cat in enumerate(categories) if values[i, j] > 0]
-        board_cats.sort(key=lambda x: x[1], reverse=True)
-        board_categories.append([cat for cat, _ in board_cats])
-    
-    # Plot normalized stacked bars
-    bottom = np.zeros(n_boards)
-    
-    # Track which categories we've added to legend
-    legend_added = set()
-    legend_handles = []
-    legend_labels = []
-    
-    # For each board, plot its categories in order (largest at bottom)
-    max_cats = max(len(cats) for cats in board_categories)
-    
-    for level in range(max_cats):
-        for j, board in enumerate(boards):
-            if level < len(board_categories[j]):
-                cat = board_categories[j][level]
-                cat_idx = categories.index(cat)
-                color = colors[cat_idx % len(colors)]
-                
-                # Create bar
-                bar = ax.bar(x[j], percentages[cat_idx, j], width, 
-                            bottom=bottom[j], color=color)
-                
-                # Add to legend if not already added
-                if cat not in legend_added:
-                    legend_added.add(cat)
-                    legend_handles.append(bar[0])
-                    legend_labels.append(cat)
-                
-                # Add count labels inside bars
-                count = int(values[cat_idx, j])
-                pct = percentages[cat_idx, j]
-                if count > 0 and pct > 1.5:  # Only show if >1.5% to avoid clutter
-                    y_pos = bottom[j] + pct/2
-                    # Show both count and percentage
-                    label_text = f'{count}\n({pct:.1f}%)'
-                    fontsize = 9 if pct > 3 else 8
-                    # Determine text color based on background color
-                    text_color = 'black' if should_use_black_text(color) else 'white'
-                    ax.text(x[j], y_pos, label_text, 
-                           ha='center', va='center', 
-                           fontsize=fontsize, fontweight='bold',
-                           color=text_color)
-                
-                bottom[j] += percentages[cat_idx, j]
+    # Stack each board's categories by count (most results at bottom)
+    levels, bottoms = matrix.stacking(percentages)
+    
+    # Plot normalized stacked bars (all segments in one collection)
+    legend_handles, legend_labels = draw_stacked_bars(
+        ax, x, percentages, bottoms, levels, categories, colors, width
+    )
+    
+    # Add count and percentage labels inside bars (only if >1.5% to avoid clutter)
+    draw_segment_labels(
+        ax, x, percentages, bottoms, levels, (values > 0) & (percentages > 1.5), colors,
+        lambda i, j: f'{int(values[i, j])}\n({percentages[i, j]:.1f}%)',
+        fontsizes=(9, 8)
+    )
     
     # Customize chart
     ax.set_xlabel('Job Board', fontsize=14, fontweight='bold')
@@ -201,11 +246,12 @@ def create_normalized_stacked_chart(
                  loc='upper center', bbox_to_anchor=(0.5, -0.08),
                  ncol=ncol, fontsize=9, frameon=False)
     
-    # Adjust layout
-    plt.tight_layout()
+    # Adjust layout (skipped for drafts)
+    if not draft:
+        plt.tight_layout()
     
     # Save figure
-    plt.savefig(output_path, bbox_inches='tight', dpi=150)
+    plt.savefig(output_path, bbox_inches='tight', dpi=DRAFT_DPI if draft else FULL_DPI)
     plt.close()
     
     print(f"Normalized chart saved to: {output_path}")
\ No newline at end of file
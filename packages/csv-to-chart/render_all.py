@@ -0,0 +1,483 @@
+"""Render every report chart declared in chart_specs.json in one run.
+
+The generate_*.py scripts each pay for their own Python, matplotlib and
+seaborn start-up and re-read their own CSVs. Here matplotlib is imported once,
+the market-share store and the job board CSV are loaded once, and each chart
+spec is turned into a call of its existing renderer. Independent figures are
+rendered in parallel worker processes (forked after the imports where the
+platform allows, so workers start with matplotlib already loaded).
+
+Rebuilds are incremental: a build graph records, for each output PNG, the
+content hashes of its input CSVs, the data planned for its renderer, the
+chart_styles configuration, the benchmark values it shows, its spec entry,
+and the code of its renderer, of the modules preparing its data and of the
+planner itself. Charts
+whose fingerprint is unchanged and whose PNG still exists are skipped
+(--force renders everything).
+"""
+
+import argparse
+import contextlib
+import hashlib
+import importlib
+import inspect
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: F401 - imported once, before workers fork
+import numpy as np
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+import chart_styles
+from data_loader import DATASET_GROUPS, load_datasets
+from job_board_parser import parse_job_board_csv, categorize_keywords, get_sorted_categories
+
+
+BASE_DIR = Path(__file__).parent.parent.parent
+DEFAULT_SPEC_PATH = Path(__file__).parent / 'chart_specs.json'
+
+# Fingerprints of the last successful render of each output
+BUILD_GRAPH_PATH = Path(__file__).parent / '.cache' / 'build_graph.json'
+BUILD_GRAPH_VERSION = 2
+
+# Job board subsets, in the order categorize_keywords returns them
+JOB_BOARD_SUBSETS = ('all', 'job_titles', 'tech_lang')
+
+
+def resolve(reference: str) -> Any:
+    """Look up a 'module:attribute' reference (e.g. 'itjobswatch_benchmarks:JOB_TITLES')."""
+    module, attribute = reference.split(':')
+    return getattr(importlib.import_module(module), attribute)
+
+
+def file_digest(path: str) -> Optional[str]:
+    """SHA-256 of a file's contents, or None if it does not exist."""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def value_digest(value: Any) -> str:
+    """SHA-256 of a JSON-serializable value."""
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def data_digest(value: Any) -> str:
+    """SHA-256 of planned chart data (dicts, sequences, NumPy arrays and scalars).
+    
+    Dictionary order is part of the digest, since it sets the order boards
+    and series are drawn in.
+    """
+    digest = hashlib.sha256()
+    
+    def feed(item: Any) -> None:
+        if isinstance(item, np.ndarray):
+            digest.update(f"ndarray:{item.dtype.str}:{item.shape}:".encode('utf-8'))
+            digest.update(np.ascontiguousarray(item).tobytes())
+        elif isinstance(item, dict):
+            digest.update(f"dict:{len(item)}:".encode('utf-8'))
+            for key, entry in item.items():
+                feed(key)
+                feed(entry)
+        elif isinstance(item, (list, tuple)):
+            digest.update(f"{type(item).__name__}:{len(item)}:".encode('utf-8'))
+            for entry in item:
+                feed(entry)
+        else:
+            digest.update(f"{type(item).__name__}:{item!r};".encode('utf-8'))
+    
+    feed(value)
+    return digest.hexdigest()
+
+
+def style_digest() -> str:
+    """Fingerprint of the chart_styles configuration.
+    
+    Argument-free getters contribute their returned values (so comments and
+    formatting do not count); functions that style an axes contribute their
+    source.
+    """
+    styles = {}
+    for name, function in inspect.getmembers(chart_styles, inspect.isfunction):
+        if function.__module__ != chart_styles.__name__:
+            continue
+        if inspect.signature(function).parameters:
+            styles[name] = inspect.getsource(function)
+        else:
+            styles[name] = function()
+    return value_digest(styles)
+
+
+def module_files(names: List[str]) -> Dict[str, str]:
+    """Source files of imported modules of this package.
+    
+    Args:
+        names: Module names
+        
+    Returns:
+        Dictionary mapping the names of modules in this directory to file paths
+    """
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    modules = {}
+    for name in sorted(filter(None, names)):
+        path = getattr(sys.modules.get(name), '__file__', None)
+        if path and os.path.dirname(os.path.abspath(path)) == package_dir:
+            modules[name] = path
+    return modules
+
+
+def renderer_modules(renderer: str) -> Dict[str, str]:
+    """Source files of a renderer's module and the modules of this package it uses.
+    
+    Args:
+        renderer: 'module:function' reference
+        
+    Returns:
+        Dictionary mapping module names to file paths
+    """
+    module = importlib.import_module(renderer.split(':')[0])
+    
+    names = {module.__name__}
+    for value in vars(module).values():
+        names.add(value.__name__ if inspect.ismodule(value) else getattr(value, '__module__', None))
+    return module_files(list(names))
+
+
+def load_spec(spec_path: str) -> Dict:
+    """Load a chart spec file.
+    
+    Args:
+        spec_path: JSON spec with input paths and a list of charts
+        
+    Returns:
+        Spec dictionary
+    """
+    with open(spec_path, 'r') as f:
+        return json.load(f)
+
+
+class ChartInputs:
+    """Data shared by the charts of a spec, each input loaded on first use."""
+    
+    def __init__(self, spec: Dict, base_dir: Path = BASE_DIR):
+        """Initialize with the spec's input paths.
+        
+        Args:
+            spec: Chart spec (see load_spec)
+            base_dir: Directory the spec's paths are relative to
+        """
+        self.trend_data_dir = str(base_dir / spec['trend_data_dir'])
+        self.job_board_csv = str(base_dir / spec['job_board_csv'])
+        self._job_boards = None
+        self._subsets = None
+    
+    def trends(self, group: str) -> Dict:
+        """Market share datasets of a data_loader.DATASET_GROUPS group."""
+        return load_datasets(self.trend_data_dir, group)
+    
+    def job_boards(self) -> Dict[str, Dict[str, int]]:
+        """Raw job board keyword counts."""
+        if self._job_boards is None:
+            self._job_boards = parse_job_board_csv(self.job_board_csv)
+        return self._job_boards
+    
+    def job_board_subset(self, subset: str) -> Dict[str, Dict[str, int]]:
+        """Categorized job board counts for one of JOB_BOARD_SUBSETS."""
+        if self._subsets is None:
+            self._subsets = dict(zip(JOB_BOARD_SUBSETS, categorize_keywords(self.job_boards())))
+        return self._subsets[subset]
+
+
+def plan_chart(chart: Dict, inputs: ChartInputs, base_dir: Path = BASE_DIR, draft: bool = False) -> Dict:
+    """Turn a chart spec into a renderer call.
+    
+    Args:
+        chart: One entry of the spec's 'charts'
+        inputs: Shared chart inputs
+        base_dir: Directory the output path is relative to
+        draft: Ask renderers that support it for a quick preview
+        
+    Returns:
+        Dictionary with 'name', 'renderer', 'output', 'args' and 'kwargs',
+        plus the 'inputs' (files), 'benchmarks' and data-preparing
+        'prep_modules' the chart depends on
+    """
+    output = str(base_dir / chart['output'])
+    kwargs = {}
+    benchmarks = None
+    
+    if chart['kind'] == 'trend':
+        args = (inputs.trends(chart['datasets']), output)
+        files = [os.path.join(inputs.trend_data_dir, f"{key}.csv") for key in DATASET_GROUPS[chart['datasets']]]
+        prep_modules = [load_datasets.__module__]
+    elif chart['kind'] == 'job_board':
+        data = inputs.job_board_subset(chart['subset'])
+        args = (data, chart['title'], output)
+        kwargs['categories_order'] = get_sorted_categories(data)
+        files = [inputs.job_board_csv]
+        prep_modules = [categorize_keywords.__module__]
+    elif chart['kind'] == 'comparison':
+        from generate_report_comparisons import filter_data_by_categories, map_data_by_keywords
+        benchmarks = resolve(chart['benchmarks'])
+        if 'mapping' in chart:
+            data = map_data_by_keywords(inputs.job_boards(), resolve(chart['mapping']))
+        else:
+            data = filter_data_by_categories(inputs.job_boards(), list(benchmarks.keys()))
+        args = (data, benchmarks, chart['title'], output)
+        files = [inputs.job_board_csv]
+        prep_modules = [parse_job_board_csv.__module__, map_data_by_keywords.__module__] + [
+            chart[key].split(':')[0] for key in ('benchmarks', 'mapping') if key in chart
+        ]
+    else:
+        raise ValueError(f"Unknown chart kind '{chart['kind']}' for {chart['name']}")
+    
+    if draft and 'draft' in inspect.signature(resolve(chart['renderer'])).parameters:
+        kwargs['draft'] = True
+    
+    return {'name': chart['name'], 'renderer': chart['renderer'], 'output': output,
+            'args': args, 'kwargs': kwargs, 'spec': chart, 'inputs': files, 'benchmarks': benchmarks,
+            'prep_modules': prep_modules}
+
+
+def chart_fingerprint(job: Dict, styles: str, base_dir: Path = BASE_DIR) -> Dict:
+    """Everything a planned chart's PNG depends on.
+    
+    Args:
+        job: Result of plan_chart
+        styles: Result of style_digest (used if the renderer uses chart_styles)
+        base_dir: Directory input paths are recorded relative to
+        
+    Returns:
+        Dictionary of component digests plus their combined 'digest'
+    """
+    modules = {**renderer_modules(job['renderer']), **module_files(job['prep_modules'])}
+    fingerprint = {
+        'inputs': {os.path.relpath(path, base_dir): file_digest(path) for path in job['inputs']},
+        # What the renderer is called with, so changes to the data preparation
+        # show up even where no file changed (the output path is not data)
+        'data': data_digest((
+            [arg for arg in job['args'] if not (isinstance(arg, str) and arg == job['output'])],
+            job['kwargs']
+        )),
+        'styles': styles if chart_styles.__name__ in modules else None,
+        'benchmarks': value_digest(job['benchmarks']) if job['benchmarks'] is not None else None,
+        'spec': value_digest(job['spec']),
+        # A draft preview never counts as an up-to-date full render
+        'draft': job['kwargs'].get('draft', False),
+        # chart_styles is covered by its configuration values above
+        'code': value_digest({
+            name: file_digest(path) for name, path in modules.items() if name != chart_styles.__name__
+        }),
+        'planner': value_digest([inspect.getsource(plan_chart), inspect.getsource(ChartInputs)])
+    }
+    fingerprint['digest'] = value_digest(fingerprint)
+    return fingerprint
+
+
+class BuildGraph:
+    """Fingerprints of rendered outputs, persisted as JSON."""
+    
+    def __init__(self, path: str = str(BUILD_GRAPH_PATH), base_dir: Path = BASE_DIR):
+        """Open a build graph (created on first save).
+        
+        Args:
+            path: Build graph JSON path
+            base_dir: Directory the recorded output paths are relative to
+        """
+        self.path = path
+        self.base_dir = base_dir
+        self.outputs = self._read()
+    
+    def _read(self) -> Dict[str, Dict]:
+        """Load the recorded fingerprints."""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        
+        if data.get('version') != BUILD_GRAPH_VERSION:
+            return {}
+        return data['outputs']
+    
+    def save(self) -> None:
+        """Write the build graph, replacing the file atomically."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': BUILD_GRAPH_VERSION, 'outputs': self.outputs}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+    
+    def is_current(self, output: str, fingerprint: Dict) -> bool:
+        """Whether an output (relative to base_dir) exists and was rendered from this fingerprint."""
+        record = self.outputs.get(output)
+        return (record is not None and record['digest'] == fingerprint['digest']
+                and os.path.exists(os.path.join(self.base_dir, output)))
+    
+    def record(self, output: str, fingerprint: Dict) -> None:
+        """Remember the fingerprint an output was rendered from."""
+        self.outputs[output] = {**fingerprint, 'rendered_at': time.time()}
+
+
+def render_chart(job: Dict, quiet: bool = True) -> Dict:
+    """Render one planned chart.
+    
+    Args:
+        job: Result of plan_chart
+        quiet: Hide the renderer's progress output
+        
+    Returns:
+        Dictionary with 'name', 'output', 'seconds' and 'error' (None on success)
+    """
+    started = time.perf_counter()
+    error = None
+    try:
+        os.makedirs(os.path.dirname(job['output']), exist_ok=True)
+        output = contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext()
+        with output:
+            resolve(job['renderer'])(*job['args'], **job['kwargs'])
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    
+    return {'name': job['name'], 'output': job['output'],
+            'seconds': time.perf_counter() - started, 'error': error}
+
+
+def render_all(spec: Dict, names: Optional[List[str]] = None, workers: Optional[int] = None,
+               base_dir: Path = BASE_DIR, quiet: bool = True, force: bool = False,
+               graph_path: str = str(BUILD_GRAPH_PATH), draft: bool = False) -> Dict:
+    """Render the charts of a spec whose inputs changed, in parallel when more than one worker is used.
+    
+    Args:
+        spec: Chart spec (see load_spec)
+        names: Chart names to render (default: all)
+        workers: Worker processes (default: CPU count, capped at the chart count;
+            1 renders in this process)
+        base_dir: Directory the spec's paths are relative to
+        quiet: Hide the renderers' progress output
+        force: Render every chart, even if it is up to date
+        graph_path: Build graph JSON path
+        draft: Render quick previews where the renderer supports it
+        
+    Returns:
+        Report with per-chart 'results' in spec order ('skipped' for
+        up-to-date charts) and timings
+    """
+    started = time.perf_counter()
+    charts = [chart for chart in spec['charts'] if not names or chart['name'] in names]
+    
+    inputs = ChartInputs(spec, base_dir)
+    jobs = [plan_chart(chart, inputs, base_dir, draft) for chart in charts]
+    
+    # Only charts whose fingerprint changed (or whose PNG is missing) are rendered
+    graph = BuildGraph(graph_path, base_dir)
+    styles = style_digest()
+    fingerprints = {job['name']: chart_fingerprint(job, styles, base_dir) for job in jobs}
+    stale = [
+        job for job in jobs
+        if force or not graph.is_current(os.path.relpath(job['output'], base_dir), fingerprints[job['name']])
+    ]
+    load_seconds = time.perf_counter() - started
+    
+    workers = min(workers or os.cpu_count() or 1, len(stale)) or 1
+    if workers == 1:
+        results = [render_chart(job, quiet) for job in stale]
+    else:
+        # Fork where available so workers inherit the loaded modules
+        context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            futures = [executor.submit(render_chart, job, quiet) for job in stale]
+            by_name = {}
+            for future in as_completed(futures):
+                result = future.result()
+                by_name[result['name']] = result
+        results = [by_name[job['name']] for job in stale]
+    
+    rendered = {result['name']: result for result in results}
+    for job in stale:
+        if not rendered[job['name']]['error']:
+            graph.record(os.path.relpath(job['output'], base_dir), fingerprints[job['name']])
+    if stale:
+        graph.save()
+    
+    results = [
+        {**rendered[job['name']], 'skipped': False} if job['name'] in rendered else
+        {'name': job['name'], 'output': job['output'], 'seconds': 0.0, 'error': None, 'skipped': True}
+        for job in jobs
+    ]
+    
+    return {
+        'charts': len(results),
+        'rendered': len(stale),
+        'skipped': len(jobs) - len(stale),
+        'failed': sum(1 for result in results if result['error']),
+        'workers': workers,
+        'load_seconds': round(load_seconds, 3),
+        'render_seconds': round(sum(result['seconds'] for result in results), 3),
+        'wall_clock_seconds': round(time.perf_counter() - started, 3),
+        'results': results
+    }
+
+
+def main():
+    """Render every chart of the spec and report per-chart and total times."""
+    parser = argparse.ArgumentParser(description='Render all report charts from a declarative spec')
+    parser.add_argument('--spec', default=str(DEFAULT_SPEC_PATH), help='Chart spec JSON')
+    parser.add_argument('--only', nargs='+', metavar='NAME', help='Render only these charts')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--report', help='Write the timing report as JSON to this path')
+    parser.add_argument('--verbose', action='store_true', help="Show the renderers' own output")
+    parser.add_argument('--force', action='store_true', help='Render every chart, even if up to date')
+    parser.add_argument('--draft', action='store_true',
+                        help='Quick low-resolution previews (normalized and comparison charts)')
+    parser.add_argument('--build-graph', default=str(BUILD_GRAPH_PATH), help='Build graph JSON path')
+    args = parser.parse_args()
+    
+    spec = load_spec(args.spec)
+    unknown = set(args.only or []) - {chart['name'] for chart in spec['charts']}
+    if unknown:
+        print(f"Error: unknown chart(s): {', '.join(sorted(unknown))}")
+        sys.exit(1)
+    
+    report = render_all(spec, args.only, args.workers, quiet=not args.verbose, force=args.force,
+                        graph_path=args.build_graph, draft=args.draft)
+    
+    print(f"\n{'Chart':<38} {'seconds':>8}")
+    print("-" * 47)
+    for result in report['results']:
+        if result['skipped']:
+            print(f"{result['name']:<38} {'-':>8}  up to date")
+            continue
+        status = f"FAILED {result['error']}" if result['error'] else ''
+        print(f"{result['name']:<38} {result['seconds']:>8.2f}  {status}")
+    print(f"\nRendered {report['rendered'] - report['failed']}/{report['rendered']} charts with "
+          f"{report['workers']} workers: {report['render_seconds']:.2f}s of rendering, "
+          f"{report['wall_clock_seconds']:.2f}s wall time (data loaded in {report['load_seconds']:.2f}s)")
+    print(f"Skipped {report['skipped']}/{report['charts']} unchanged charts (renders avoided)")
+    
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to {args.report}")
+    
+    if report['failed']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@
 import matplotlib.pyplot as plt
 import numpy as np
 from typing import Dict, List, Optional
+from board_matrix import BoardMatrix
 
 
 def get_distinct_colors(n: int) -> List[str]:
@@ -53,31 +54,15 @@ def create_stacked_bar_chart(
         output_path: Path to save the PNG file
         categories_order: Optional list of categories in display order
     """
-    # Get boards and categories
-    boards = list(data.keys())
-    
-    # Get all unique categories
-    if categories_order:
-        categories = categories_order
-    else:
-        all_categories = set()
-        for board_data in data.values():
-            all_categories.update(board_data.keys())
-        # Sort by total count
-        totals = {}
-        for cat in all_categories:
-            totals[cat] = sum(data[board].get(cat, 0) for board in boards)
-        categories = sorted(all_categories, key=lambda x: totals[x], reverse=True)
-    
-    # Prepare data matrix
+    # Category x board counts (categories by total count unless ordered)
+    matrix = BoardMatrix.from_counts(data, categories_order or None)
+    boards, categories, values = matrix.boards, matrix.categories, matrix.values
     n_boards = len(boards)
     n_categories = len(categories)
     
-    # Create data matrix
-    values = np.zeros((n_categories, n_boards))
-    for i, cat in enumerate(categories):
-        for j, board in enumerate(boards):
-            values[i, j] = data[board].get(cat, 0)
+    # Stack the categories in order; the top of each stack is its board's total
+    _, bottoms = matrix.stacking(by_value=False)
+    stack_tops = bottoms[-1] + values[-1]
     
     # Create figure (16x16 square)
     fig, ax = plt.subplots(figsize=(16, 16))
@@ -90,11 +75,9 @@ def create_stacked_bar_chart(
     width = 0.6
     
     # Plot stacked bars
-    bottom = np.zeros(n_boards)
     for i, cat in enumerate(categories):
-        ax.bar(x, values[i], width, bottom=bottom, 
+        ax.bar(x, values[i], width, bottom=bottoms[i], 
                label=cat, color=colors[i % len(colors)])
-        bottom += values[i]
     
     # Customize chart
     ax.set_xlabel('Job Board', fontsize=14, fontweight='bold')
@@ -122,7 +105,7 @@ def create_stacked_bar_chart(
         for j, board in enumerate(boards):
             val = values[i, j]
             if val > 0:
-                y_pos = bottom[j] - values[i, j]/2
+                y_pos = stack_tops[j] - values[i, j]/2
                 ax.text(x[j], y_pos, f'{int(val)}', 
                        ha='center', va='center', fontsize=9, fontweight='bold')
     